@@ -1,17 +1,21 @@
 """Streamlit UI. Run with: streamlit run app.py"""
 
 import asyncio
-import concurrent.futures
 import os
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 
 import streamlit as st
 
 _project_root = Path(__file__).resolve().parent
 sys.path.insert(0, str(_project_root))
-from src import run, get_predictive_scores
-from src.app import PATTERNS, create_app
+from src import run_stream, get_current_models, get_predictive_scores
+from src.app import FACTUALITY_FACTORS, PATTERNS, create_app
+from src.batch import BatchJob, read_articles
+from src.concurrency import AIMDLimiter, ModelGuard
 
 PATTERN_LABELS = {
     "simple_prompt": "Simple prompt",
@@ -25,6 +29,63 @@ PATTERN_LABELS = {
 
 st.set_page_config(page_title="Factuality Evaluator", layout="wide")
 
+
+# Server-wide singletons: built once per Streamlit process and shared by all
+# sessions, so a click only pays for the model calls. Predictive models are
+# cached in src.models itself (get_current_models) so registry promotions are
+# picked up without restarting the server.
+@st.cache_resource(show_spinner=False)
+def get_app(pattern: str):
+    return create_app(pattern=pattern)
+
+
+@st.cache_resource(show_spinner=False)
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """One long-lived event loop on a daemon thread; evaluations are submitted to it."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="factuality-event-loop", daemon=True).start()
+    return loop
+
+
+def submit(coro):
+    """Schedule a coroutine on the shared loop and return its concurrent Future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def stream_events(**run_kwargs):
+    """Yield run_stream() items in this script thread as the shared loop produces them."""
+    events: "queue.Queue" = queue.Queue()
+
+    async def _pump():
+        try:
+            async for item in run_stream(**run_kwargs):
+                events.put(item)
+        except Exception as e:
+            events.put(e)
+        finally:
+            events.put(None)
+
+    submit(_pump())
+    while True:
+        item = events.get()
+        if item is None:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+@st.cache_resource(show_spinner="Warming up models...")
+def warm_up() -> bool:
+    get_event_loop()
+    get_current_models()
+    for pattern in PATTERNS:
+        get_app(pattern)
+    return True
+
+
+warm_up()
+
 # Evaluator UI only (overview lives on GitHub Pages)
 st.title("Factuality Evaluator")
 st.markdown("Six factors → combiner → combined prediction (ADK pipeline).")
@@ -44,57 +105,136 @@ evaluation_style = st.selectbox(
     format_func=lambda p: PATTERN_LABELS.get(p, p),
     index=PATTERNS.index("cot") if "cot" in PATTERNS else 0,
 )
-article_title = st.text_input("Article Title", placeholder="Enter title...")
-article_content = st.text_area("Article Content", height=300, placeholder="Paste article text...")
-article_url = st.text_input("Article URL (optional)", placeholder="https://...")
+single_tab, batch_tab = st.tabs(["Single article", "Batch"])
 
-if st.button("Evaluate", type="primary") and article_title and article_content:
-    if not api_key or not api_key.strip():
-        st.error("Please enter your Gemini API key above to run the evaluation.")
-    else:
-        os.environ["GOOGLE_API_KEY"] = api_key.strip()
-        os.environ["GEMINI_API_KEY"] = api_key.strip()
-        with st.spinner("Running pipeline..."):
+with single_tab:
+    article_title = st.text_input("Article Title", placeholder="Enter title...")
+    article_content = st.text_area("Article Content", height=300, placeholder="Paste article text...")
+    article_url = st.text_input("Article URL (optional)", placeholder="https://...")
+
+    if st.button("Evaluate", type="primary") and article_title and article_content:
+        if not api_key or not api_key.strip():
+            st.error("Please enter your Gemini API key above to run the evaluation.")
+        else:
+            os.environ["GOOGLE_API_KEY"] = api_key.strip()
+            os.environ["GEMINI_API_KEY"] = api_key.strip()
             predictive_scores = get_predictive_scores(
-                article_title, article_content, article_url or ""
+                article_title, article_content, article_url or "", models=get_current_models()
             )
+
+            # Placeholders fill in as each agent finishes; the combined score comes last.
+            st.subheader("Factor scores")
+            cards = {}
+            columns = st.columns(3)
+            for i, (name, _key, output_key) in enumerate(FACTUALITY_FACTORS):
+                cards[output_key] = (name, columns[i % 3].empty())
+                cards[output_key][1].metric(name, "…", help="Waiting for agent")
+            st.subheader("Combined veracity score")
+            combined_slot = st.empty()
+            combined_slot.info("Waiting for factor agents...")
+            assessment_slot = st.empty()
+
+            result = None
             try:
-                app_instance = create_app(pattern=evaluation_style)
-                try:
-                    result = asyncio.run(
-                        run(
-                            article_title=article_title,
-                            article_content=article_content,
-                            article_url=article_url or "",
-                            predictive_scores=predictive_scores or None,
-                            app_instance=app_instance,
-                        )
-                    )
-                except RuntimeError:
-                    def _run_async():
-                        return asyncio.run(
-                            run(
-                                article_title=article_title,
-                                article_content=article_content,
-                                article_url=article_url or "",
-                                predictive_scores=predictive_scores or None,
-                                app_instance=app_instance,
-                            )
-                        )
-                    with concurrent.futures.ThreadPoolExecutor() as ex:
-                        result = ex.submit(_run_async).result()
+                with st.spinner("Running pipeline..."):
+                    for item in stream_events(
+                        article_title=article_title,
+                        article_content=article_content,
+                        article_url=article_url or "",
+                        predictive_scores=predictive_scores or None,
+                        app_instance=get_app(evaluation_style),
+                    ):
+                        if item["type"] == "factor" and item["key"] in cards:
+                            name, slot = cards[item["key"]]
+                            score = item.get("score")
+                            with slot.container():
+                                st.metric(name, score if score is not None else "N/A")
+                                st.caption(f"{item['elapsed_seconds']:.1f}s")
+                        elif item["type"] == "combined":
+                            combined_slot.info("Combining factor scores...")
+                        elif item["type"] == "result":
+                            result = item
             except Exception as e:
                 st.error(f"Pipeline error: {e}")
-                result = None
             if result is None:
+                combined_slot.empty()
                 st.warning("Evaluation did not complete. Check that your API key is valid and has Gemini API access.")
             else:
                 combined = result.get("combined_veracity_score")
-                st.subheader("Combined veracity score")
-                st.metric("Score (0–10, lower = more reliable)", combined if combined is not None else "N/A")
-                st.subheader("Overall assessment")
-                st.write(result.get("overall_assessment") or "No assessment returned.")
-                st.subheader("Factor scores")
-                st.json(result.get("factor_scores", {}))
+                combined_slot.metric("Score (0–10, lower = more reliable)", combined if combined is not None else "N/A")
+                with assessment_slot.container():
+                    st.subheader("Overall assessment")
+                    st.write(result.get("overall_assessment") or "No assessment returned.")
                 with st.expander("Explanations"):
                     st.json(result.get("explanations", {}))
+
+with batch_tab:
+    st.caption("Upload a CSV or JSONL with the same columns as data/articles.csv (url, title, body_text).")
+    uploaded = st.file_uploader("Articles file", type=["csv", "jsonl"])
+    concurrency = st.slider("Max articles in flight", min_value=1, max_value=16, value=4)
+    job = st.session_state.get("batch_job")
+    running = job is not None and job.running
+    col_run, col_cancel, col_retry = st.columns(3)
+    start_clicked = col_run.button("Run batch", type="primary", disabled=uploaded is None or running)
+    cancel_clicked = col_cancel.button("Cancel", disabled=not running)
+    retry_clicked = col_retry.button(
+        "Retry failed rows", disabled=job is None or running or not job.failed_indices()
+    )
+
+    if (start_clicked or retry_clicked) and not (api_key or "").strip():
+        st.error("Please enter your Gemini API key above to run the evaluation.")
+    elif start_clicked:
+        try:
+            rows = read_articles(uploaded)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            os.environ["GOOGLE_API_KEY"] = api_key.strip()
+            os.environ["GEMINI_API_KEY"] = api_key.strip()
+            job = BatchJob(
+                rows,
+                get_app(evaluation_style),
+                concurrency=concurrency,
+                predictive_models=get_current_models(),
+                guard=ModelGuard(AIMDLimiter(initial=min(2, concurrency), max_limit=concurrency)),
+            )
+            st.session_state["batch_job"] = job
+            job.started_at = time.monotonic()  # mark running before the loop picks it up
+            submit(job.run())
+            st.rerun()
+    elif retry_clicked:
+        os.environ["GOOGLE_API_KEY"] = api_key.strip()
+        os.environ["GEMINI_API_KEY"] = api_key.strip()
+        failed = job.failed_indices()
+        job.started_at, job.finished_at = time.monotonic(), None
+        submit(job.run(failed))
+        st.rerun()
+    if cancel_clicked and job is not None:
+        job.cancel()
+
+    if job is not None:
+        done, total = job.completed, max(job.total, 1)
+        st.progress(min(done / total, 1.0), text=f"{done}/{job.total} articles")
+        st.caption(f"{job.throughput:.2f} articles/s · {len(job.failed_indices())} failed or incomplete")
+        if job.guard is not None:
+            m = job.guard.metrics()
+            st.caption(
+                f"Adaptive limit {m['concurrency']['limit']}/{concurrency} in flight · "
+                f"circuit {m['circuit']['state']} · {m['concurrency']['decreases']} backoffs"
+            )
+        results = job.to_frame()
+        st.dataframe(results, use_container_width=True)
+        if job.running:
+            # Poll until the shared loop finishes; the rerun redraws progress and rows.
+            time.sleep(0.5)
+            st.rerun()
+        col_csv, col_jsonl = st.columns(2)
+        col_csv.download_button(
+            "Download CSV", results.to_csv(index=False), file_name="factuality_results.csv", mime="text/csv"
+        )
+        col_jsonl.download_button(
+            "Download JSONL",
+            results.to_json(orient="records", lines=True, force_ascii=False),
+            file_name="factuality_results.jsonl",
+            mime="application/json",
+        )
@@ -6,6 +6,23 @@ Uses the current agents from src.app: create_app(pattern) builds the pipeline
 with factor agents and combiner from src/app.py. Full CoT and Full FCoT use
 src/cot_prompt.py and src/fcot_prompt.py respectively. Re-run this script after
 changing prompts or app logic to refresh data/generative_human_eval_table.csv.
+
+With --sequential, articles are drawn in a source-stratified order and each
+pattern is run batch by batch. After every batch, bootstrap confidence
+intervals are computed for MAE and human_eval_pct per factor; a pattern stops
+once every interval is narrower than --target-width or once it is clearly
+dominated by another pattern, so comparative results need far fewer LLM calls.
+Results go to data/generative_human_eval_sequential_{results,table}.csv.
+
+With --replay, no model is called: factor scores are streamed from existing
+run logs (logs/experiments.jsonl by default) and joined to the labeled CSV by
+the article content hash that run() records, then scored the same way.
+
+With --cassette DIR, model calls go through src.cassette (one cassette per
+pattern, DIR/<pattern>.jsonl.gz): --cassette-mode record captures the raw
+responses of a normal run, and replay re-runs the full pipeline (prompts,
+Runner, parsing) on them with no model calls, with zero or the original
+latency (--cassette-latency).
 """
 
 import argparse
@@ -13,6 +30,7 @@ import asyncio
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 _project_root = Path(__file__).resolve().parent.parent
@@ -23,8 +41,10 @@ try:
 except ImportError:
     pass
 
+from src import datasets
 from src.app import create_app, PATTERNS
-from src.run import run
+from src.human_eval import FACTOR_MAP, compute_metrics, iter_run_logs
+from src.run import article_hash, run
 
 PATTERN_DISPLAY = {
     "simple_prompt": "Simple Prompt",
@@ -36,15 +56,6 @@ PATTERN_DISPLAY = {
     "complex_prompt": "Complex Prompt",
 }
 
-FACTOR_MAP = [
-    ("toxicity", "toxicity_level"),
-    ("title_vs_body", "title_body_alignment"),
-    ("clickbait", "clickbait_level"),
-    ("political_affiliation", "political_affiliation_bias"),
-    ("sentiment", "sentiment_bias"),
-    ("sensationalism", "sensationalism"),
-]
-
 FACTOR_DISPLAY = {
     "toxicity": "Toxicity",
     "title_vs_body": "Title vs. Body",
@@ -57,25 +68,66 @@ FACTOR_DISPLAY = {
 
 def load_labeled_articles(csv_path: Path, sample=None) -> pd.DataFrame:
     """Load articles with human labels. Truncate body_text if needed to avoid token limits."""
-    df = pd.read_csv(csv_path)
+    df = datasets.load(csv_path, kind="articles").to_frame()
     label_cols = [c for c, _ in FACTOR_MAP]
     for col in label_cols:
         df[col] = pd.to_numeric(df[col], errors="coerce")
     df = df.dropna(subset=label_cols)
     if sample:
         df = df.head(sample)
-    if "body_text" in df.columns:
-        df["body_text"] = df["body_text"].fillna("").astype(str).str.slice(0, 8000)
     if "title" not in df.columns:
         df["title"] = ""
+    if "body_text" in df.columns:
+        body = df["body_text"].fillna("").astype(str)
+        # Runs logged by the service, batch tab or score_corpus.py hash the full body.
+        df["full_article_hash"] = [article_hash(str(t), b) for t, b in zip(df["title"], body)]
+        df["body_text"] = body.str.slice(0, 8000)
     if "url" not in df.columns:
         df["url"] = ""
     return df.reset_index(drop=True)
 
 
+def stratified_order(df: pd.DataFrame, by: str = "source", seed: int = 0) -> pd.DataFrame:
+    """Reorder rows so every prefix is roughly proportional across strata of `by`.
+
+    Rows are shuffled within each stratum and then interleaved by their
+    fractional rank, so the first batch already mixes sources.
+    """
+    if by not in df.columns or df.empty:
+        return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    strata = df[by].fillna("").astype(str).to_numpy()
+    keys = np.empty(len(df), dtype=float)
+    for value in np.unique(strata):
+        idx = np.flatnonzero(strata == value)
+        rng.shuffle(idx)
+        # Fractional rank in (0, 1); the jitter breaks ties between strata.
+        keys[idx] = (np.arange(len(idx)) + rng.uniform(0.25, 0.75)) / len(idx)
+    return df.iloc[np.argsort(keys, kind="stable")].reset_index(drop=True)
+
+
+# Set from --cassette: {"dir", "mode", "latency"}; one CassetteLlm per pattern, kept across articles.
+CASSETTE_OPTIONS: dict = {}
+_cassettes: dict = {}
+
+
+def _cassette_for(pattern: str):
+    if not CASSETTE_OPTIONS or not pattern:
+        return None
+    if pattern not in _cassettes:
+        from src.cassette import cassette_model
+
+        _cassettes[pattern] = cassette_model(
+            CASSETTE_OPTIONS["dir"] / f"{pattern}.jsonl.gz",
+            mode=CASSETTE_OPTIONS["mode"],
+            latency=CASSETTE_OPTIONS["latency"],
+        )
+    return _cassettes[pattern]
+
+
 def _run_sync(article: dict, pattern: str = None) -> dict:
     """Run the async pipeline in a fresh event loop (for use in scripts)."""
-    app_instance = create_app(pattern=pattern) if pattern else None
+    app_instance = create_app(pattern=pattern, model=_cassette_for(pattern)) if pattern else None
     return asyncio.run(
         run(
             article_title=article["title"],
@@ -87,37 +139,105 @@ def _run_sync(article: dict, pattern: str = None) -> dict:
     )
 
 
-def compute_metrics(pred: list[float], truth: list[float]) -> dict:
-    """Compute Pearson correlation, MAE, % within ±2, and 100 - normalized_MAE."""
-    import numpy as np
+def _pattern_from_app(app_name: str):
+    """Recover the pattern from an app name built by create_app(pattern)."""
+    prefix = "factuality_evaluator_"
+    if app_name and app_name.startswith(prefix) and app_name[len(prefix):] in PATTERNS:
+        return app_name[len(prefix):]
+    return None
 
-    pred = np.array(pred, dtype=float)
-    truth = np.array(truth, dtype=float)
-    valid = np.isfinite(pred) & np.isfinite(truth)
-    pred = pred[valid]
-    truth = truth[valid]
-    n = len(pred)
-    if n == 0:
-        return {"pearson": None, "mae": None, "pct_within_2": None, "human_eval_pct": None}
 
-    if n > 1 and pred.std() > 0 and truth.std() > 0:
-        pearson = float(np.corrcoef(pred, truth)[0, 1])
-    else:
-        pearson = None
+def replay_predictions(
+    df: pd.DataFrame, log_paths: list[Path], patterns: list[str]
+) -> tuple[dict[str, dict[str, list[float]]], int]:
+    """Rebuild per-pattern predictions for `df` from logged runs, without calling the LLM.
 
-    mae = float(np.abs(pred - truth).mean())
-    within_2 = np.sum(np.abs(pred - truth) <= 2) / n * 100
-    human_eval_pct = 100 - (mae / 10) * 100
-    human_eval_pct = max(0, min(100, human_eval_pct))
+    Rows are matched on article_hash(title, body_text) of the truncated body
+    this script passes to run(), or of the full body (full_article_hash) that
+    other callers log; the latest logged run wins when an article was
+    evaluated more than once. Articles with no logged run for a pattern are
+    NaN and drop out of metrics. Also returns the number of logged runs of
+    `patterns` that matched no row.
+    """
+    row_by_hash = {}
+    for column in ("full_article_hash", None):
+        if column is None:
+            hashes = [article_hash(str(t), str(b)) for t, b in zip(df["title"], df["body_text"])]
+        elif column in df.columns:
+            hashes = list(df[column])
+        else:
+            continue
+        row_by_hash.update((h, i) for i, h in enumerate(hashes))
+    wanted = set(patterns)
+    predictions = {p: {csv_col: [float("nan")] * len(df) for csv_col, _ in FACTOR_MAP} for p in patterns}
+    unmatched = 0
+    for record in iter_run_logs(log_paths):
+        pattern = _pattern_from_app(record.get("app"))
+        if pattern not in wanted:
+            continue
+        row = row_by_hash.get(record.get("article_hash"))
+        if row is None:
+            unmatched += 1
+            continue
+        fs = record.get("factor_scores") or {}
+        for csv_col, model_key in FACTOR_MAP:
+            try:
+                predictions[pattern][csv_col][row] = float(fs.get(model_key))
+            except (TypeError, ValueError):
+                predictions[pattern][csv_col][row] = float("nan")
+    return predictions, unmatched
 
+
+def _human_eval_pct(mae):
+    """Map MAE on the 0-10 scale to the Generative (human eval %) score."""
+    return np.clip(100 - np.asarray(mae, dtype=float) * 10, 0, 100)
+
+
+def bootstrap_intervals(
+    pred: list[float],
+    truth: list[float],
+    n_boot: int = 2000,
+    alpha: float = 0.05,
+    rng: np.random.Generator = None,
+) -> dict:
+    """Vectorized percentile bootstrap for MAE and human_eval_pct.
+
+    All resamples are drawn at once as an (n_boot, n) index matrix, so the
+    cost is a single gather and mean rather than a Python loop.
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    err = np.abs(np.asarray(pred, dtype=float) - np.asarray(truth, dtype=float))
+    err = err[np.isfinite(err)]
+    n = len(err)
+    if n == 0:
+        return {"n": 0, "mae_ci": (None, None), "human_eval_pct_ci": (None, None)}
+    maes = err[rng.integers(0, n, size=(n_boot, n))].mean(axis=1)
+    lo, hi = np.quantile(maes, [alpha / 2, 1 - alpha / 2])
     return {
-        "pearson": pearson,
-        "mae": mae,
-        "pct_within_2": within_2,
-        "human_eval_pct": round(human_eval_pct, 1),
+        "n": n,
+        "mae_ci": (float(lo), float(hi)),
+        # human_eval_pct decreases with MAE, so the bounds swap.
+        "human_eval_pct_ci": (float(_human_eval_pct(hi)), float(_human_eval_pct(lo))),
     }
 
 
+def _overall_interval(predictions: dict, truth_df: pd.DataFrame, n_boot: int, alpha: float, rng) -> tuple:
+    """Bootstrap CI of human_eval_pct averaged over factors, resampling whole articles."""
+    errs = np.column_stack([
+        np.abs(np.asarray(predictions[csv_col], dtype=float) - truth_df[csv_col].to_numpy(dtype=float))
+        for csv_col, _ in FACTOR_MAP
+    ])
+    errs = errs[np.isfinite(errs).any(axis=1)]
+    n = len(errs)
+    if n == 0:
+        return (None, None)
+    resampled = errs[rng.integers(0, n, size=(n_boot, n))]
+    with np.errstate(invalid="ignore"):
+        pct = _human_eval_pct(np.nanmean(resampled, axis=1)).mean(axis=1)
+    lo, hi = np.nanquantile(pct, [alpha / 2, 1 - alpha / 2])
+    return (float(lo), float(hi))
+
+
 def run_pattern_on_articles(df: pd.DataFrame, pattern: str) -> dict[str, list[float]]:
     """Run one pattern on all articles; return predictions per factor."""
     predictions = {csv_col: [] for csv_col, _ in FACTOR_MAP}
@@ -141,12 +261,117 @@ def run_pattern_on_articles(df: pd.DataFrame, pattern: str) -> dict[str, list[fl
     return predictions
 
 
+def run_sequential(
+    df: pd.DataFrame,
+    patterns: list[str],
+    batch_size: int = 4,
+    target_width: float = 10.0,
+    min_articles: int = 8,
+    n_boot: int = 2000,
+    alpha: float = 0.05,
+    seed: int = 0,
+) -> dict[str, dict]:
+    """Run patterns in rounds of `batch_size` articles until each one stops.
+
+    `df` should already be in sampling order (see stratified_order). A pattern
+    stops when every factor's human_eval_pct interval is at most
+    `target_width` points wide ("converged"), when its overall interval lies
+    entirely below another pattern's ("dominated"), or when articles run out
+    ("exhausted"). Dominance compares two patterns only on the articles both
+    have scored (a shared prefix of `df`), since patterns that stopped early
+    have seen fewer. Returns per-pattern predictions, articles used and reason.
+    """
+    rng = np.random.default_rng(seed)
+    state = {
+        p: {"predictions": {csv_col: [] for csv_col, _ in FACTOR_MAP}, "n": 0, "stop": None}
+        for p in patterns
+    }
+    while True:
+        active = [p for p in patterns if state[p]["stop"] is None]
+        if not active:
+            break
+        for pattern in active:
+            st = state[pattern]
+            batch = df.iloc[st["n"] : st["n"] + batch_size]
+            batch_preds = run_pattern_on_articles(batch, pattern)
+            for csv_col, _ in FACTOR_MAP:
+                st["predictions"][csv_col].extend(batch_preds[csv_col])
+            st["n"] += len(batch)
+            seen = df.iloc[: st["n"]]
+            widths = []
+            for csv_col, _ in FACTOR_MAP:
+                lo, hi = bootstrap_intervals(
+                    st["predictions"][csv_col], seen[csv_col].astype(float).tolist(), n_boot, alpha, rng
+                )["human_eval_pct_ci"]
+                widths.append(float("inf") if lo is None else hi - lo)
+            print(
+                f"    {PATTERN_DISPLAY.get(pattern, pattern)}: n={st['n']}  max CI width={max(widths):.1f}",
+                flush=True,
+            )
+            if st["n"] >= len(df):
+                st["stop"] = "exhausted"
+            elif st["n"] >= min_articles and max(widths) <= target_width:
+                st["stop"] = "converged"
+        # Dominance is checked after the round, pairwise on the articles both patterns have scored.
+        for pattern in patterns:
+            st = state[pattern]
+            if st["stop"] is not None:
+                continue
+            for other in patterns:
+                common = min(st["n"], state[other]["n"])
+                if other == pattern or common < min_articles:
+                    continue
+                seen = df.iloc[:common]
+                hi = _overall_interval(_head(st["predictions"], common), seen, n_boot, alpha, rng)[1]
+                lo_other = _overall_interval(_head(state[other]["predictions"], common), seen, n_boot, alpha, rng)[0]
+                if hi is not None and lo_other is not None and hi < lo_other:
+                    st["stop"] = "dominated"
+                    break
+    return state
+
+
+def _head(predictions: dict, n: int) -> dict:
+    """Predictions for the first `n` articles."""
+    return {csv_col: values[:n] for csv_col, values in predictions.items()}
+
+
 def main():
     parser = argparse.ArgumentParser(description="Compute Generative (human eval %) vs human labels per pattern")
-    parser.add_argument("--sample", type=int, default=10, help="Number of articles to evaluate per pattern (default: 10)")
+    parser.add_argument("--sample", type=int, default=None, help="Number of articles to evaluate per pattern (default: 10; all with --sequential)")
     parser.add_argument("--csv", type=Path, default=None, help="Path to labeled CSV")
     parser.add_argument("--pattern", type=str, default=None, help="Run single pattern only (default: all)")
+    parser.add_argument("--sequential", action="store_true", help="Sample in stratified batches and stop each pattern early")
+    parser.add_argument("--batch-size", type=int, default=4, help="Articles per pattern per round with --sequential (default: 4)")
+    parser.add_argument("--target-width", type=float, default=10.0, help="Stop once every factor's human eval %% CI is this narrow (default: 10)")
+    parser.add_argument("--min-articles", type=int, default=8, help="Articles required before a pattern may stop early (default: 8)")
+    parser.add_argument("--n-boot", type=int, default=2000, help="Bootstrap resamples (default: 2000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for sampling order and bootstrap (default: 0)")
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        nargs="*",
+        default=None,
+        help="Recompute metrics from run logs instead of calling the LLM (default log: logs/experiments.jsonl)",
+    )
+    parser.add_argument("--cassette", type=Path, default=None, help="Record/replay model calls in this directory")
+    parser.add_argument(
+        "--cassette-mode", choices=["record", "replay", "auto"], default="replay", help="With --cassette (default: replay)"
+    )
+    parser.add_argument(
+        "--cassette-latency",
+        choices=["zero", "original"],
+        default="zero",
+        help="Replay delay per call: none or as recorded (default: zero)",
+    )
     args = parser.parse_args()
+    if args.sequential and args.replay is not None:
+        parser.error("--sequential and --replay are exclusive (replay scores every logged article)")
+    if args.cassette is not None:
+        if args.replay is not None:
+            parser.error("--cassette and --replay are exclusive")
+        CASSETTE_OPTIONS.update(
+            dir=args.cassette, mode=args.cassette_mode, latency=1.0 if args.cassette_latency == "original" else 0.0
+        )
 
     csv_path = args.csv or (_project_root / "data" / "articles_labeled_human_scored_v2.csv")
     if not csv_path.exists():
@@ -158,33 +383,91 @@ def main():
         print(f"Error: pattern must be one of {PATTERNS}", flush=True)
         sys.exit(1)
 
-    df = load_labeled_articles(csv_path, sample=args.sample)
-    print("Using create_app() from src.app (current CoT/FCoT from cot_prompt.py and fcot_prompt.py).", flush=True)
+    if args.replay is not None:
+        df = load_labeled_articles(csv_path, sample=args.sample)
+    elif args.sequential:
+        df = stratified_order(load_labeled_articles(csv_path, sample=None), seed=args.seed)
+        if args.sample:
+            df = df.head(args.sample)
+    else:
+        df = load_labeled_articles(csv_path, sample=args.sample or 10)
+    if args.replay is not None:
+        print("Replaying logged runs (no LLM calls).", flush=True)
+    else:
+        print("Using create_app() from src.app (current CoT/FCoT from cot_prompt.py and fcot_prompt.py).", flush=True)
+        if CASSETTE_OPTIONS:
+            print(f"Cassettes: {args.cassette_mode} in {args.cassette}", flush=True)
     print(f"Loaded {len(df)} articles. Running {len(patterns_to_run)} patterns...", flush=True)
 
     compact_rows = []
     all_metrics = []
 
-    for pattern in patterns_to_run:
+    if args.replay is not None:
+        log_paths = args.replay or [_project_root / "logs" / "experiments.jsonl"]
+        missing = [p for p in log_paths if not p.exists()]
+        if missing:
+            print(f"Error: {missing[0]} not found", flush=True)
+            sys.exit(1)
+        replayed, unmatched = replay_predictions(df, log_paths, patterns_to_run)
+        if unmatched:
+            print(f"  {unmatched} logged runs of these patterns matched none of the {len(df)} articles", flush=True)
+        runs = []
+        for pattern in patterns_to_run:
+            covered = int(np.isfinite(np.array(replayed[pattern][FACTOR_MAP[0][0]], dtype=float)).sum())
+            print(f"  {PATTERN_DISPLAY.get(pattern, pattern)}: {covered}/{len(df)} articles found in logs", flush=True)
+            runs.append((pattern, replayed[pattern], len(df), None))
+    elif args.sequential:
+        state = run_sequential(
+            df,
+            patterns_to_run,
+            batch_size=args.batch_size,
+            target_width=args.target_width,
+            min_articles=args.min_articles,
+            n_boot=args.n_boot,
+            seed=args.seed,
+        )
+        runs = [(p, state[p]["predictions"], state[p]["n"], state[p]["stop"]) for p in patterns_to_run]
+        n_articles = sum(n for _, _, n, _ in runs)
+        print(f"Sequential sampling used {n_articles} article runs (vs {len(df) * len(runs)} for a full sweep).", flush=True)
+    else:
+        runs = []
+        for pattern in patterns_to_run:
+            print(f"  Running {PATTERN_DISPLAY.get(pattern, pattern)}...", flush=True)
+            runs.append((pattern, run_pattern_on_articles(df, pattern), len(df), None))
+
+    rng = np.random.default_rng(args.seed)
+    for pattern, predictions, n_used, stop in runs:
         display = PATTERN_DISPLAY.get(pattern, pattern)
-        print(f"  Running {display}...", flush=True)
-        predictions = run_pattern_on_articles(df, pattern)
         row_pct = {"Pattern": display}
         for csv_col, _ in FACTOR_MAP:
             pred = predictions[csv_col]
-            truth = df[csv_col].astype(float).tolist()
+            truth = df[csv_col].astype(float).tolist()[:n_used]
             m = compute_metrics(pred, truth)
             row_pct[FACTOR_DISPLAY[csv_col]] = m["human_eval_pct"]
-            all_metrics.append({
+            record = {
                 "Pattern": display,
                 "Factor": FACTOR_DISPLAY[csv_col],
                 "Pearson": m["pearson"],
                 "MAE": m["mae"],
                 "% within ±2": m["pct_within_2"],
                 "Generative (human eval %)": m["human_eval_pct"],
-            })
+            }
+            if args.sequential:
+                ci = bootstrap_intervals(pred, truth, n_boot=args.n_boot, rng=rng)
+                record.update({
+                    "N": n_used,
+                    "Stop reason": stop,
+                    "MAE CI low": ci["mae_ci"][0],
+                    "MAE CI high": ci["mae_ci"][1],
+                    "Human eval % CI low": ci["human_eval_pct_ci"][0],
+                    "Human eval % CI high": ci["human_eval_pct_ci"][1],
+                })
+            all_metrics.append(record)
         compact_rows.append(row_pct)
 
+    for pattern, cassette in _cassettes.items():
+        print(f"  Cassette {pattern}: {cassette.hits} replayed, {cassette.misses} recorded or missing, {cassette.size} stored", flush=True)
+
     print("\n" + "=" * 80, flush=True)
     print("Table format (Pattern × Factor → Generative human eval %):", flush=True)
     print("=" * 80, flush=True)
@@ -193,8 +476,10 @@ def main():
     compact_df = compact_df[["Pattern"] + compact_cols]
     print(compact_df.to_string(index=False), flush=True)
 
-    metrics_path = _project_root / "data" / "generative_human_eval_results.csv"
-    compact_path = _project_root / "data" / "generative_human_eval_table.csv"
+    # Sequential runs cover fewer articles per pattern; keep them apart from the full-sweep tables.
+    suffix = "_sequential" if args.sequential else ""
+    metrics_path = _project_root / "data" / f"generative_human_eval{suffix}_results.csv"
+    compact_path = _project_root / "data" / f"generative_human_eval{suffix}_table.csv"
     pd.DataFrame(all_metrics).to_csv(metrics_path, index=False)
     compact_df.to_csv(compact_path, index=False)
     print(f"\nDetailed results saved to {metrics_path}", flush=True)
@@ -8,8 +8,13 @@ the prompt.
 """
 
 from src.app import FACTUALITY_FACTORS, SCORING_RECIPES, app, create_app
-from src.models import get_predictive_scores
-from src.run import build_prompt, run
+from src.models import (
+    get_current_models,
+    get_distilled_scores,
+    get_predictive_scores,
+    load_models,
+)
+from src.run import build_prompt, run, run_stream
 
 try:
     from importlib.metadata import version
@@ -21,8 +26,12 @@ __all__ = [
     "app",
     "create_app",
     "run",
+    "run_stream",
     "build_prompt",
     "get_predictive_scores",
+    "get_distilled_scores",
+    "load_models",
+    "get_current_models",
     "FACTUALITY_FACTORS",
     "SCORING_RECIPES",
     "__version__",
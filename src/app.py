@@ -2,6 +2,10 @@
 All agents in one place: scoring recipes, factor agents, parallel agent, combiner, pipeline, app.
 """
 
+import inspect
+import re
+import weakref
+
 from google.adk.agents import LlmAgent
 from google.adk.agents.parallel_agent import ParallelAgent
 from google.adk.agents.sequential_agent import SequentialAgent
@@ -10,6 +14,7 @@ from google.adk.tools import google_search
 
 from src.cot_prompt import get_cot_combiner_instruction, get_cot_factor_instruction
 from src.fcot_prompt import get_fcot_combiner_instruction, get_fcot_factor_instruction
+from src.tracing import TRACE_HOOK
 
 MODEL = "gemini-2.5-flash"
 
@@ -24,12 +29,17 @@ COMBINER_STATE_KEYS = [
 ]
 
 
-def _combiner_instruction_provider(template: str):
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}|\{\{|\}\}")
+
+
+def _combiner_instruction_provider(template: str, keys=COMBINER_STATE_KEYS):
     """Return a callable that fills the combiner template from context.state.
 
     ADK may not inject parallel-agent state into the combiner's context when
     using pattern-built apps; filling from context.state() avoids
-    'Context variable not found' errors.
+    'Context variable not found' errors. The CoT/FCoT templates write state
+    placeholders as {{key}} and literal braces as {{ }}; both are resolved in
+    one pass, so factor outputs containing braces are inserted verbatim.
     """
 
     def provider(context) -> str:
@@ -38,11 +48,29 @@ def _combiner_instruction_provider(template: str):
             state = state()
         if not isinstance(state, dict):
             state = dict(state) if state is not None else {}
-        data = {k: (state.get(k) or "") for k in COMBINER_STATE_KEYS}
-        return template.format(**data)
+        data = {k: str(state.get(k) or "") for k in keys}
+
+        def fill(match) -> str:
+            key = match.group(1)
+            if key is None:
+                return match.group(0)[0]
+            return data[key] if key in data else "{" + key + "}"
+
+        return _PLACEHOLDER.sub(fill, template)
 
     return provider
 
+
+def _read_order(keys) -> str:
+    return "Read " + ", then ".join(keys) + "."
+
+
+def _limit_combiner_template(template: str, keys) -> str:
+    """Drop the template lines that reference factor keys outside `keys`."""
+    dropped = [k for k in COMBINER_STATE_KEYS if k not in keys]
+    lines = [line for line in template.split("\n") if not any("{" + k + "}" in line for k in dropped)]
+    return "\n".join(lines).replace(_read_order(COMBINER_STATE_KEYS), _read_order(keys))
+
 # Tool for fact-checking: agents can query the web when verifying claims.
 GOOGLE_SEARCH_TOOL = [google_search]
 
@@ -113,6 +141,31 @@ FACTUALITY_FACTORS = [
     ("Toxicity Level", "toxicity", "toxicity_level"),
 ]
 
+
+def select_factors(factors) -> list:
+    """
+    FACTUALITY_FACTORS entries for `factors` (recipe keys such as "toxicity"
+    or output keys such as "toxicity_level"), in pipeline order.
+    """
+    wanted = set(factors or [])
+    selected = [f for f in FACTUALITY_FACTORS if f[1] in wanted or f[2] in wanted]
+    unknown = wanted - {k for f in selected for k in f[1:]}
+    if unknown or not selected:
+        known = [f[1] for f in FACTUALITY_FACTORS]
+        raise ValueError(f"unknown or no factors {sorted(unknown)}; choose from {known}")
+    return selected
+
+
+def app_factors(app_instance) -> list:
+    """FACTUALITY_FACTORS entries that have an agent in `app_instance` (all six for a full pipeline)."""
+    output_keys = set()
+    agents = [app_instance.root_agent]
+    while agents:
+        agent = agents.pop()
+        output_keys.add(getattr(agent, "output_key", None))
+        agents.extend(getattr(agent, "sub_agents", None) or [])
+    return [f for f in FACTUALITY_FACTORS if f[2] in output_keys]
+
 # -----------------------------------------------------------------------------
 # Factor agents (each writes score + explanation to session state)
 # -----------------------------------------------------------------------------
@@ -218,11 +271,7 @@ parallel_agent = ParallelAgent(
 # Combiner agent (reads factor outputs from state, writes combined prediction)
 # -----------------------------------------------------------------------------
 
-combiner_agent = LlmAgent(
-    name="combiner_agent",
-    model=MODEL,
-    description="Produces combined veracity score and overall assessment from factor evaluations and optional predictive outputs.",
-    instruction="""You are the final step in a factuality pipeline. Use chain-of-thought reasoning before giving your combined prediction. Follow these steps in order:
+DEFAULT_COMBINER_INSTRUCTION = """You are the final step in a factuality pipeline. Use chain-of-thought reasoning before giving your combined prediction. Follow these steps in order:
 
 1. Consider each factor in turn: Read political_affiliation_bias, then clickbait_level, then sensationalism, then title_body_alignment, then sentiment_bias, then toxicity_level. For each, note the score and key points from the explanation.
 2. Weigh and reconcile: Identify where factors agree or conflict (e.g. high toxicity but low sensationalism). Decide which factors should influence the overall veracity most for this article.
@@ -240,11 +289,17 @@ toxicity_level: {toxicity_level}
 Each value above is a JSON string with "score" (0-10) and "explanation".
 
 Output ONLY valid JSON in this exact format:
-{"combined_veracity_score": <number 0-10>, "overall_assessment": "<string: 1-3 sentence assessment that reflects your step-wise synthesis of the six factors>"}
+{"combined_veracity_score": <number 0-10>, "overall_assessment": "<string: 1-3 sentence assessment that reflects your step-wise synthesis of the factors>"}
 - combined_veracity_score: single number 0-10 (lower = more reliable).
 - overall_assessment: brief summary of reliability and main concerns, informed by your step-by-step reasoning.
 
-Return ONLY the JSON object. No markdown or extra text.""",
+Return ONLY the JSON object. No markdown or extra text."""
+
+combiner_agent = LlmAgent(
+    name="combiner_agent",
+    model=MODEL,
+    description="Produces combined veracity score and overall assessment from factor evaluations and optional predictive outputs.",
+    instruction=DEFAULT_COMBINER_INSTRUCTION,
     output_key="combined_prediction",
 )
 
@@ -272,6 +327,9 @@ PATTERNS = [
     "complex_prompt",
 ]
 
+# Model backends for create_app(): Gemini through ADK, or any OpenAI-compatible server.
+BACKENDS = ("gemini", "openai")
+
 
 def _instruction_simple(factor_name: str, factor_key: str) -> str:
     recipe = SCORING_RECIPES.get(factor_key, "")
@@ -331,9 +389,67 @@ def _instruction_fcot(factor_name: str, factor_key: str) -> str:
     return get_fcot_factor_instruction(factor_name, factor_key, recipe)
 
 
-def _build_factor_agents(pattern: str):
+def _supports_google_search(model) -> bool:
+    """google_search is a Gemini built-in tool; other backends must run without it."""
+    name = model if isinstance(model, str) else getattr(model, "model", "")
+    return str(name).startswith("gemini")
+
+
+# LlmAgent callback parameter -> (hook method, ADK keyword arguments).
+_HOOK_CALLBACKS = {
+    "before_agent_callback": ("before_agent", ("callback_context",)),
+    "after_agent_callback": ("after_agent", ("callback_context",)),
+    "before_model_callback": ("before_model", ("callback_context", "llm_request")),
+    "after_model_callback": ("after_model", ("callback_context", "llm_response")),
+    "before_tool_callback": ("before_tool", ("tool", "args", "tool_context")),
+    "after_tool_callback": ("after_tool", ("tool", "args", "tool_context", "tool_response")),
+    "on_model_error_callback": ("on_model_error", ("callback_context", "llm_request", "error")),
+    "on_tool_error_callback": ("on_tool_error", ("tool", "args", "tool_context", "error")),
+}
+
+
+def _hook_callbacks(hooks) -> dict:
+    """
+    Compose hook objects into LlmAgent callbacks. A hook has any of the
+    optional (async or sync) methods before_agent/after_agent(callback_context),
+    before_model(callback_context, llm_request),
+    after_model(callback_context, llm_response),
+    before_tool(tool, args, tool_context) and
+    after_tool(tool, args, tool_context, tool_response) and
+    on_model_error(callback_context, llm_request, error) and
+    on_tool_error(tool, args, tool_context, error); they run in order and the
+    first non-None return value short-circuits the rest, as in ADK. Callbacks
+    this ADK release does not have (the on_*_error callbacks are recent) are
+    skipped.
+    """
+    hooks = list(hooks or [])
+    callbacks = {}
+    for param, (method, arg_names) in _HOOK_CALLBACKS.items():
+        if param not in LlmAgent.model_fields:
+            continue
+        fns = [getattr(hook, method) for hook in hooks if getattr(hook, method, None) is not None]
+        if fns:
+            callbacks[param] = _compose(fns, arg_names)
+    return callbacks
+
+
+def _compose(fns, arg_names):
+    async def callback(*args, **kwargs):
+        args = [*args, *(kwargs.get(name) for name in arg_names[len(args):])]
+        for fn in fns:
+            result = fn(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            if result is not None:
+                return result
+        return None
+
+    return callback
+
+
+def _build_factor_agents(pattern: str, model=MODEL, callbacks=None, factors=FACTUALITY_FACTORS):
     use_tools = pattern in ("function_calling", "simple_plus_function", "cot", "fcot")
-    tools = GOOGLE_SEARCH_TOOL if use_tools else []
+    tools = GOOGLE_SEARCH_TOOL if use_tools and _supports_google_search(model) else []
     if pattern == "simple_prompt":
         instr = _instruction_simple
     elif pattern in ("function_calling", "simple_plus_function"):
@@ -349,51 +465,145 @@ def _build_factor_agents(pattern: str):
     else:
         instr = _instruction_simple
     agents = []
-    for name, key, output_key in FACTUALITY_FACTORS:
+    for name, key, output_key in factors:
         agents.append(
             LlmAgent(
                 name=f"{key}_evaluator",
-                model=MODEL,
+                model=model,
                 description=f"Evaluates {name}. Returns score 0-10.",
                 instruction=instr(name, key),
                 output_key=output_key,
                 tools=tools,
+                **(callbacks or {}),
             )
         )
     return agents
 
 
-def create_app(pattern: str = None) -> App:
-    """Create app. If pattern is None, returns the default full pipeline (all patterns)."""
+def create_app(pattern: str = None, model=None, model_hooks=None, backend: str = "gemini", factors=None) -> App:
+    """Create app. If pattern is None, returns the default full pipeline (all patterns).
+
+    `model` overrides MODEL for every agent: a model name or an ADK BaseLlm
+    instance (e.g. src.stub_model.StubLlm for local runs without an API key).
+    Google Search is only attached for Gemini models. `model_hooks` wrap every
+    factor and combiner model call (e.g. src.ratelimit.RateLimiter). Both
+    require a pattern. Pattern apps always carry src.tracing.TRACE_HOOK,
+    which records agent, model and tool spans when tracing is configured.
+
+    backend="openai" sends every call to an OpenAI-compatible server
+    (src.openai_llm; OPENAI_BASE_URL, OPENAI_API_KEY) with `model` as the
+    served model name; all agents share one pooled client.
+
+    `factors` (see select_factors) builds only those factor agents and a
+    combiner that reads only their keys, so a run makes len(factors) + 1
+    model calls instead of seven. run(..., factors=...) does this through
+    factor_subset_app(), which caches the graphs.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}")
+    selected = select_factors(factors) if factors is not None else FACTUALITY_FACTORS
+    if len(selected) == len(FACTUALITY_FACTORS):
+        factors = None
+    keys = [output_key for _name, _key, output_key in selected]
     if pattern is None:
-        return App(name="factuality_evaluator", root_agent=root_agent)
-    if pattern not in PATTERNS:
-        raise ValueError(f"pattern must be one of {PATTERNS}")
-    if pattern == "cot":
-        combiner_instr = _combiner_instruction_provider(get_cot_combiner_instruction())
-    elif pattern == "fcot":
-        combiner_instr = _combiner_instruction_provider(get_fcot_combiner_instruction())
+        if model is not None or model_hooks or backend != "gemini":
+            raise ValueError("model, model_hooks and backend can only be set for a pattern app")
+        if factors is None:
+            return _register(App(name="factuality_evaluator", root_agent=root_agent), None, None, None)
+        factor_agents = [
+            LlmAgent(
+                name=f"{key}_evaluator",
+                model=MODEL,
+                description=f"Evaluates {name}. Returns score 0-10 and explanation. Can use Google Search to verify claims.",
+                instruction=_factor_instruction(name, key),
+                output_key=output_key,
+                tools=GOOGLE_SEARCH_TOOL,
+            )
+            for name, key, output_key in selected
+        ]
+        combiner_instr = _limit_combiner_template(DEFAULT_COMBINER_INSTRUCTION, keys)
+        callbacks = {}
+        app_name = "factuality_evaluator"
     else:
-        combiner_instr = _combiner_simple()
-    factor_agents = _build_factor_agents(pattern)
+        if backend == "openai":
+            if model is not None and not isinstance(model, str):
+                raise ValueError("backend='openai' takes a served model name, not a model instance")
+            from src.openai_llm import OpenAICompatibleLlm
+
+            model = OpenAICompatibleLlm.from_env(model)
+        # Not `model or MODEL`: a BaseLlm may define __len__ (e.g. an empty cassette) and be falsy.
+        model = model if model is not None else MODEL
+        if pattern not in PATTERNS:
+            raise ValueError(f"pattern must be one of {PATTERNS}")
+        if pattern == "cot":
+            combiner_instr = _combiner_instruction_provider(
+                _limit_combiner_template(get_cot_combiner_instruction(), keys), keys
+            )
+        elif pattern == "fcot":
+            combiner_instr = _combiner_instruction_provider(
+                _limit_combiner_template(get_fcot_combiner_instruction(), keys), keys
+            )
+        else:
+            combiner_instr = _limit_combiner_template(_combiner_simple(), keys)
+        callbacks = _hook_callbacks([TRACE_HOOK, *(model_hooks or [])])
+        factor_agents = _build_factor_agents(pattern, model, callbacks, selected)
+        app_name = f"factuality_evaluator_{pattern}"
+    if factors is not None:
+        # Distinct name so runs and logs of a subset are not mistaken for the full pattern.
+        app_name += "__" + "_".join(key for _name, key, _output_key in selected)
     parallel = ParallelAgent(
         name="factuality_parallel",
         sub_agents=factor_agents,
-        description="Evaluates six factuality factors.",
+        description=f"Evaluates {len(selected)} factuality factors.",
     )
     combiner = LlmAgent(
         name="combiner_agent",
-        model=MODEL,
+        model=model if pattern else MODEL,
         description="Produces combined score from factor evaluations.",
         instruction=combiner_instr,
         output_key="combined_prediction",
+        **callbacks,
     )
     root = SequentialAgent(
         name="factuality_pipeline",
         sub_agents=[parallel, combiner],
         description="Factor evaluation then combine.",
     )
-    return App(name=f"factuality_evaluator_{pattern}", root_agent=root)
+    return _register(App(name=app_name, root_agent=root), pattern, model, model_hooks)
+
+
+# id(app) -> (weakref to app, pattern, model, model_hooks, {factor keys: subset app})
+# for every live create_app() result, so factor_subset_app() can rebuild an app
+# with the same settings (and the same model instance, e.g. one pooled OpenAI
+# client). Apps are not hashable, hence id() keys; entries only hold a weak
+# reference and are dropped when their app is garbage collected.
+_APP_SPECS: dict = {}
+
+
+def _register(app_instance: App, pattern, model, model_hooks) -> App:
+    key = id(app_instance)
+    _APP_SPECS[key] = (weakref.ref(app_instance), pattern, model, model_hooks, {})
+    weakref.finalize(app_instance, _APP_SPECS.pop, key, None)
+    return app_instance
+
+
+def factor_subset_app(app_instance: App, factors) -> App:
+    """
+    App like `app_instance` (built by create_app) with only `factors`, built
+    on first use and cached for as long as `app_instance` lives. Returns
+    `app_instance` itself if it already has exactly those factors.
+    """
+    selected = select_factors(factors)
+    keys = tuple(output_key for _name, _key, output_key in selected)
+    if keys == tuple(f[2] for f in app_factors(app_instance)):
+        return app_instance
+    spec = _APP_SPECS.get(id(app_instance))
+    if spec is None or spec[0]() is not app_instance:
+        raise ValueError("factors can only be selected for apps built by create_app()")
+    _ref, pattern, model, model_hooks, subsets = spec
+    if keys not in subsets:
+        subsets[keys] = create_app(pattern, model=model, model_hooks=model_hooks, factors=keys)
+    return subsets[keys]
 
 
 app = create_app()
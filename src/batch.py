@@ -0,0 +1,191 @@
+"""
+Batch evaluation: read an articles file and run one pattern over every row concurrently.
+"""
+
+import asyncio
+import io
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+from google.adk.apps import App
+
+from src.app import FACTUALITY_FACTORS, app_factors
+from src.concurrency import CircuitOpen, ModelGuard, degraded_result
+from src.models import get_predictive_scores
+from src.run import run
+
+# Same columns as data/articles.csv; only title and body_text are required.
+ARTICLE_COLUMNS = ["url", "title", "body_text"]
+
+
+def read_articles(source: Union[str, Path, io.IOBase], fmt: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Read a CSV or JSONL file of articles into [{"url", "title", "body_text"}, ...].
+    `fmt` is "csv" or "jsonl"; inferred from the file name when omitted.
+    Raises ValueError if the format is unknown or title/body_text are missing.
+    """
+    name = str(getattr(source, "name", source))
+    fmt = (fmt or Path(name).suffix.lstrip(".")).lower()
+    if fmt == "csv":
+        df = pd.read_csv(source)
+    elif fmt in ("jsonl", "json"):
+        if isinstance(source, (str, Path)):
+            with open(source, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        else:
+            raw = source.read()
+            lines = (raw.decode("utf-8") if isinstance(raw, bytes) else raw).splitlines()
+        df = pd.DataFrame([json.loads(line) for line in lines if line.strip()])
+    else:
+        raise ValueError(f"Unsupported articles format {fmt!r}; expected csv or jsonl")
+    missing = [c for c in ("title", "body_text") if c not in df.columns]
+    if missing:
+        raise ValueError(f"Articles file is missing columns: {', '.join(missing)}")
+    if "url" not in df.columns:
+        df["url"] = ""
+    df = df[ARTICLE_COLUMNS].fillna("").astype(str)
+    return df.to_dict(orient="records")
+
+
+class BatchJob:
+    """
+    One batch of articles evaluated with a single app.
+
+    run() is a coroutine meant for a long-lived event loop; progress, cancel()
+    and failed_indices() are safe to call from another thread (e.g. a UI).
+    Rows that raised, were cancelled, or came back with missing scores can be
+    re-run with run(job.failed_indices()) without touching the others.
+    With a ModelGuard, `concurrency` is the upper bound and the guard adapts
+    the actual limit; rows refused by an open circuit get a degraded result
+    and count as failed.
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Dict[str, str]],
+        app_instance: App,
+        concurrency: int = 4,
+        predictive_models: Optional[Dict[str, Any]] = None,
+        guard: Optional[ModelGuard] = None,
+    ):
+        self.rows = list(rows)
+        self.app_instance = app_instance
+        self.concurrency = max(1, int(concurrency))
+        self.predictive_models = predictive_models
+        self.guard = guard
+        self.results: List[Optional[Dict[str, Any]]] = [None] * len(self.rows)
+        self.errors: List[Optional[str]] = [None] * len(self.rows)
+        self.completed = 0
+        self.total = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self.started_at is not None and self.finished_at is None
+
+    @property
+    def throughput(self) -> float:
+        """Articles completed per second in the current (or last) run."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def cancel(self) -> None:
+        """Stop scheduling new rows and cancel rows in flight."""
+        self._cancel.set()
+        if self._loop is not None:
+            for task in list(self._tasks):
+                self._loop.call_soon_threadsafe(task.cancel)
+
+    def failed_indices(self) -> List[int]:
+        """Rows with an error, no result, or any missing factor/combined score."""
+        failed = []
+        for i, result in enumerate(self.results):
+            if self.errors[i] is not None or result is None:
+                failed.append(i)
+            elif result.get("combined_veracity_score") is None or any(
+                v is None for v in (result.get("factor_scores") or {}).values()
+            ):
+                failed.append(i)
+        return failed
+
+    async def _run_row(self, i: int, semaphore: asyncio.Semaphore) -> None:
+        # Waiting for the semaphore happens inside the try, so a row cancelled
+        # before it started still gets an error and counts as completed.
+        try:
+            async with semaphore:
+                if self._cancel.is_set():
+                    self.errors[i] = "cancelled"
+                    return
+                row = self.rows[i]
+                predictive_scores = None
+                if self.predictive_models is not None:
+                    loop = asyncio.get_running_loop()
+                    predictive_scores = await loop.run_in_executor(
+                        None,
+                        lambda: get_predictive_scores(
+                            row["title"], row["body_text"], row.get("url", ""), models=self.predictive_models
+                        ),
+                    )
+
+                def score():
+                    return run(
+                        article_title=row["title"],
+                        article_content=row["body_text"],
+                        article_url=row.get("url", ""),
+                        predictive_scores=predictive_scores,
+                        app_instance=self.app_instance,
+                    )
+
+                self.results[i] = await (self.guard.run(score) if self.guard is not None else score())
+                self.errors[i] = None
+        except CircuitOpen as e:
+            self.results[i] = degraded_result(str(e), [f[2] for f in app_factors(self.app_instance)])
+            self.errors[i] = "circuit open"
+        except asyncio.CancelledError:
+            self.errors[i] = "cancelled"
+        except Exception as e:
+            self.errors[i] = f"{type(e).__name__}: {e}"
+        finally:
+            self.completed += 1
+
+    async def run(self, indices: Optional[Sequence[int]] = None) -> None:
+        """Evaluate `indices` (default: every row) with at most `concurrency` in flight."""
+        indices = list(range(len(self.rows))) if indices is None else list(indices)
+        self._loop = asyncio.get_running_loop()
+        self._cancel.clear()
+        self.completed = 0
+        self.total = len(indices)
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self._tasks = [asyncio.ensure_future(self._run_row(i, semaphore)) for i in indices]
+        try:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            self._tasks = []
+            self.finished_at = time.monotonic()
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per article: input columns, factor scores, combined score, assessment, error."""
+        records = []
+        for row, result, error in zip(self.rows, self.results, self.errors):
+            result = result or {}
+            scores = result.get("factor_scores") or {}
+            record = {c: row.get(c, "") for c in ARTICLE_COLUMNS}
+            for _name, _key, output_key in FACTUALITY_FACTORS:
+                record[output_key] = scores.get(output_key)
+            record["combined_veracity_score"] = result.get("combined_veracity_score")
+            record["overall_assessment"] = result.get("overall_assessment", "")
+            record["error"] = error or ""
+            records.append(record)
+        return pd.DataFrame(records)
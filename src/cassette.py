@@ -0,0 +1,171 @@
+"""
+Record/replay cassettes for model calls.
+
+CassetteLlm wraps a model. In "record" mode every call goes to the wrapped
+model and the response is appended to the cassette; in "replay" mode calls
+are answered from the cassette without touching the model (a request that
+was never recorded raises CassetteMiss); "auto" replays what it has and
+records the rest. Replay waits `latency` times the recorded call duration:
+0 (default) for no delay, 1 for the original timing.
+
+Requests are matched on a fingerprint of the model name, system instruction,
+conversation text and tool names, so the same article through the same
+pattern and prompts replays exactly, while any prompt change is a miss. A
+cassette is one gzip JSON-lines file (one record per distinct request) that
+is appended to as calls complete; only one process should record into a
+file at a time.
+
+Use through create_app(pattern, model=cassette_model(path, mode)), or with
+--cassette in scripts/compute_generative_human_eval.py, which keeps one
+cassette per pattern.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from pydantic import PrivateAttr
+
+from src.llm_text import content_text
+
+MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """Replay mode got a request the cassette does not contain."""
+
+
+def _part(part: Any) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    if getattr(part, "text", None):
+        out["text"] = part.text
+    call = getattr(part, "function_call", None)
+    if call is not None:
+        # Call ids are random per run; only name and arguments identify the request.
+        out["function_call"] = {"name": call.name, "args": call.args}
+    response = getattr(part, "function_response", None)
+    if response is not None:
+        out["function_response"] = {"name": response.name, "response": response.response}
+    return out
+
+
+def fingerprint(llm_request: LlmRequest, model: str = "") -> str:
+    """Stable key for a model request (see module docstring)."""
+    config = getattr(llm_request, "config", None)
+    tools = []
+    for tool in getattr(config, "tools", None) or []:
+        for decl in getattr(tool, "function_declarations", None) or []:
+            tools.append(decl.name)
+        if getattr(tool, "google_search", None) is not None:
+            tools.append("google_search")
+    body = {
+        "model": model or getattr(llm_request, "model", "") or "",
+        "system": content_text(getattr(config, "system_instruction", None)),
+        "contents": [
+            {"role": c.role, "parts": [_part(p) for p in c.parts or []]} for c in llm_request.contents or []
+        ],
+        "tools": sorted(tools),
+    }
+    raw = json.dumps(body, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class CassetteLlm(BaseLlm):
+    """BaseLlm that records responses of `inner` to `path` or replays them (see module docstring)."""
+
+    model: str = "cassette"
+    path: str
+    mode: str = "replay"
+    latency: float = 0.0
+    inner: Optional[BaseLlm] = None
+    hits: int = 0
+    misses: int = 0
+
+    _records: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if self.mode != "replay" and self.inner is None:
+            raise ValueError(f"mode {self.mode!r} needs an inner model to record from")
+        path = Path(self.path)
+        if path.exists():
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._records.setdefault(record["key"], record)
+
+    @property
+    def size(self) -> int:
+        """Number of recorded requests."""
+        return len(self._records)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if record["key"] in self._records:
+                return
+            self._records[record["key"]] = record
+            path = Path(self.path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Each append is a complete gzip member; gzip.open reads them back as one stream.
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key = fingerprint(llm_request, self.model)
+        record = self._records.get(key) if self.mode != "record" else None
+        if record is not None:
+            self.hits += 1
+            if self.latency:
+                await asyncio.sleep(record["seconds"] * self.latency)
+            for data in record["responses"]:
+                yield LlmResponse.model_validate(data)
+            return
+        if self.mode == "replay":
+            self.misses += 1
+            raise CassetteMiss(f"no recorded response for request {key} in {self.path}")
+        self.misses += 1
+        t0 = time.perf_counter()
+        responses: List[LlmResponse] = []
+        async for response in self.inner.generate_content_async(llm_request, stream=stream):
+            responses.append(response)
+            yield response
+        self._append({
+            "key": key,
+            "model": self.model,
+            "seconds": round(time.perf_counter() - t0, 3),
+            "responses": [r.model_dump(mode="json", exclude_none=True) for r in responses],
+        })
+
+
+def cassette_model(path: Path, mode: str = "replay", model: Any = None, latency: float = 0.0) -> CassetteLlm:
+    """
+    CassetteLlm around `model` (a BaseLlm or a model name; default src.app.MODEL).
+    The cassette reports the inner model's name, so create_app() attaches the
+    same tools as it would for the real model.
+    """
+    from src.app import MODEL
+
+    model = model if model is not None else MODEL
+    inner = None
+    if mode != "replay" or not isinstance(model, str):
+        if isinstance(model, str):
+            from google.adk.models.registry import LLMRegistry
+
+            inner = LLMRegistry.new_llm(model)
+        else:
+            inner = model
+    name = model if isinstance(model, str) else getattr(model, "model", "cassette")
+    return CassetteLlm(model=name, path=str(path), mode=mode, latency=latency, inner=inner)
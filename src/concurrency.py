@@ -0,0 +1,236 @@
+"""
+Adaptive concurrency and fail-fast for pipeline runs.
+
+AIMDLimiter caps the number of articles in flight. The cap grows additively
+(about +1 per `limit` healthy completions) and is cut multiplicatively when a
+run fails with a throttling or server error (429/5xx) or takes much longer
+than the recent baseline. CircuitBreaker opens after consecutive failures so
+callers return a degraded result at once instead of queueing behind a
+backend that is down, and lets one probe through after `reset_timeout`.
+ModelGuard combines the two and is what BatchJob and the HTTP service use;
+metrics() on each is exported for monitoring (e.g. GET /healthz).
+
+The guard wraps whole runs: one article is seven model calls, and ADK
+surfaces a failed call as an exception from the run.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, TypeVar
+
+from src.app import FACTUALITY_FACTORS
+
+T = TypeVar("T")
+
+_OVERLOAD_MARKERS = ("429", "RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "rate limit", "overloaded")
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling the backend while the breaker is open."""
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """True for throttling, server errors and timeouts (429, 5xx, RESOURCE_EXHAUSTED, ...)."""
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if isinstance(code, int) and (code == 429 or 500 <= code < 600):
+        return True
+    text = str(exc)
+    return any(marker in text for marker in _OVERLOAD_MARKERS)
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease limit on concurrent runs."""
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+    ):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.baseline: Optional[float] = None
+        self.successes = 0
+        self.errors = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._cond: Optional[asyncio.Condition] = None
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for room under the current limit; hold it for the body of the block."""
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def _notify(self) -> None:
+        # The limit may have grown; wake waiters (no-op if nobody waits).
+        if self._cond is not None:
+            cond = self._cond
+
+            async def _wake():
+                async with cond:
+                    cond.notify_all()
+
+            try:
+                asyncio.get_running_loop().create_task(_wake())
+            except RuntimeError:
+                pass
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        # One cut per round trip: failures from the same burst should not collapse the limit to min.
+        if now - self._last_decrease < (self.latency_ewma or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        self.decreases += 1
+
+    def on_success(self, latency: float) -> None:
+        self.successes += 1
+        a = self.smoothing
+        self.latency_ewma = latency if self.latency_ewma is None else (1 - a) * self.latency_ewma + a * latency
+        # Baseline follows the best recent latency and drifts up slowly so it can adapt.
+        self.baseline = self.latency_ewma if self.baseline is None else min(self.baseline * 1.01, self.latency_ewma)
+        if latency > self.latency_tolerance * self.baseline:
+            self._decrease()
+            return
+        previous = int(self.limit)
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        if int(self.limit) > previous:
+            self._notify()
+
+    def on_error(self, overload: bool) -> None:
+        self.errors += 1
+        if overload:
+            self._decrease()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "latency_baseline": round(self.baseline, 3) if self.baseline is not None else None,
+            "successes": self.successes,
+            "errors": self.errors,
+            "decreases": self.decreases,
+        }
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures -> half_open after `reset_timeout`."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now (half-open lets one probe through)."""
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "half_open":
+            if self._probing:
+                self.rejected += 1
+                return False
+            self._probing = True
+        return True
+
+    def release_probe(self) -> None:
+        """Forget a half-open probe that ended without an outcome (e.g. cancelled)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class ModelGuard:
+    """Run coroutines under an AIMD limit and a circuit breaker."""
+
+    def __init__(self, limiter: Optional[AIMDLimiter] = None, breaker: Optional[CircuitBreaker] = None):
+        self.limiter = limiter or AIMDLimiter()
+        self.breaker = breaker or CircuitBreaker()
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn() when admitted; raises CircuitOpen without calling it while the breaker is open."""
+        if not self.breaker.allow():
+            raise CircuitOpen("model backend circuit is open")
+        probe = self.breaker.state == "half_open"
+        # Cancellation while waiting for a slot or inside fn() reports no
+        # outcome, so a half-open probe must be handed back or the breaker
+        # would reject everything from then on.
+        try:
+            async with self.limiter.slot():
+                t0 = time.monotonic()
+                try:
+                    result = await fn()
+                except Exception as e:
+                    self.limiter.on_error(is_overload_error(e))
+                    self.breaker.record_failure()
+                    raise
+                self.limiter.on_success(time.monotonic() - t0)
+                self.breaker.record_success()
+                return result
+        except asyncio.CancelledError:
+            if probe:
+                self.breaker.release_probe()
+            raise
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"concurrency": self.limiter.metrics(), "circuit": self.breaker.metrics()}
+
+
+def degraded_result(reason: str, output_keys: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    run()-shaped result with no scores, returned while the backend is unavailable.
+    `output_keys` are the app's factors (see app.app_factors); default: all of them.
+    """
+    if output_keys is None:
+        output_keys = [output_key for _name, _key, output_key in FACTUALITY_FACTORS]
+    return {
+        "factor_scores": {output_key: None for output_key in output_keys},
+        "explanations": {output_key: "" for output_key in output_keys},
+        "combined_veracity_score": None,
+        "overall_assessment": f"Not scored: {reason}",
+        "degraded": True,
+    }
@@ -145,11 +145,11 @@ Return ONLY the JSON object. No markdown, no extra text."""
 # -----------------------------------------------------------------------------
 # FULL CoT COMBINER INSTRUCTION (one place)
 # Placeholders: {{political_affiliation_bias}}, {{clickbait_level}}, etc.
-# (filled by ADK from state)
+# (filled from session state by the combiner instruction provider in app.py)
 # -----------------------------------------------------------------------------
 
 COT_COMBINER_INSTRUCTION = """You are the final step in a factuality pipeline. \
-The six factor agents have produced evidence-level evaluations. Use \
+The factor agents have produced evidence-level evaluations. Use \
 chain-of-thought before giving your combined prediction.
 
 ## Your reasoning structure (Identify → Evaluate → Synthesize)
@@ -209,6 +209,6 @@ def get_cot_factor_instruction(factor_name: str, factor_key: str, recipe: str) -
 def get_cot_combiner_instruction() -> str:
     """Return the full CoT combiner prompt.
 
-    ADK will fill {{political_affiliation_bias}}, etc. from session state.
+    app.py fills {{political_affiliation_bias}}, etc. from session state.
     """
     return COT_COMBINER_INSTRUCTION
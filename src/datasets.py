@@ -0,0 +1,438 @@
+"""
+Dataset loaders for everything under data/, with a normalized schema and an on-disk columnar cache.
+
+Each format has a chunked generator reader that yields pandas DataFrames with
+the normalized columns for its kind:
+
+- "liar":      data/tsv/*.tsv and data/jsonl/*.jsonl (LIAR-PLUS statements)
+- "political": data/pol-new/*.txt (label<TAB>text lines)
+- "clickbait": data/clickbait/*.csv (text, label)
+- "toxicity":  data/tox-new/*.csv (text, label)
+- "articles":  data/articles*.csv (url, title, body_text, ... plus any label columns)
+- "sentences": data/article.csv, data/sentences_labeled.csv (url, title, sentence, ... plus any label columns)
+
+load() parses a file once, stores every column as .npy arrays under
+data/.cache/<name>-<content hash>/ and memory-maps them on later calls, so
+repeated training and eval runs skip parsing entirely. Text columns are stored
+as one UTF-8 byte buffer plus offsets so they can be memory-mapped as well.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = _REPO_ROOT / "data" / ".cache"
+
+# Bump when normalization changes so stale caches are not reused.
+SCHEMA_VERSION = 1
+DEFAULT_CHUNKSIZE = 50_000
+
+# Raw LIAR-PLUS TSV columns after the leading row-index column.
+LIAR_TSV_COLUMNS = [
+    "id", "label", "statement", "subjects", "speaker", "speaker_job_title",
+    "state_info", "party_affiliation", "barely_true_counts", "false_counts",
+    "half_true_counts", "mostly_true_counts", "pants_on_fire_counts",
+    "context", "justification", "json_file_id",
+]
+
+SCHEMAS: Dict[str, List[str]] = {
+    "liar": [
+        "id", "label", "statement", "subjects", "speaker", "speaker_job_title",
+        "state_info", "party_affiliation", "context", "justification",
+    ],
+    "political": ["label", "text"],
+    "clickbait": ["text", "label"],
+    "toxicity": ["text", "label"],
+    "articles": ["url", "source", "title", "author", "published", "body_text"],
+    "sentences": ["url", "title", "sentence"],
+}
+
+# Optional per-factor label columns kept for "articles" and "sentences" when present.
+ARTICLE_LABEL_COLUMNS = [
+    "political_affiliation", "clickbait", "sensationalism", "title_vs_body", "sentiment", "toxicity",
+]
+
+
+# -----------------------------------------------------------------------------
+# Normalization (one function per kind; input and output are DataFrame chunks)
+# -----------------------------------------------------------------------------
+
+
+def _text(series: pd.Series) -> pd.Series:
+    return series.fillna("").astype(str).str.strip()
+
+
+def _normalize_liar_tsv(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.drop(df.columns[0], axis=1)
+    df.columns = LIAR_TSV_COLUMNS[: len(df.columns)]
+    out = pd.DataFrame({c: _text(df[c]) if c in df.columns else "" for c in SCHEMAS["liar"]}, index=df.index)
+    out["label"] = out["label"].str.lower()
+    return out[out["statement"] != ""].reset_index(drop=True)
+
+
+def _normalize_liar_jsonl(df: pd.DataFrame) -> pd.DataFrame:
+    # The JSONL export renames fields; "title" is the speaker's job and "party" holds the state.
+    def col(name: str) -> pd.Series:
+        return df[name] if name in df.columns else pd.Series([""] * len(df), index=df.index)
+
+    topics = col("topics").map(lambda v: ",".join(v) if isinstance(v, list) else (v or ""))
+    out = pd.DataFrame({
+        "id": _text(col("json_file_id")),
+        "label": _text(col("label")).str.lower(),
+        "statement": _text(col("claim")),
+        "subjects": _text(topics),
+        "speaker": _text(col("originator")),
+        "speaker_job_title": _text(col("title")),
+        "state_info": _text(col("party")),
+        "party_affiliation": "",
+        "context": "",
+        "justification": _text(col("justification")),
+    })
+    return out[out["statement"] != ""].reset_index(drop=True)
+
+
+def _normalize_clickbait(df: pd.DataFrame) -> pd.DataFrame:
+    text_col = "headline" if "headline" in df.columns else df.columns[0]
+    label_col = "clickbait" if "clickbait" in df.columns else df.columns[1]
+    return pd.DataFrame({"text": _text(df[text_col]), "label": df[label_col].astype(int)}).reset_index(drop=True)
+
+
+def _normalize_toxicity(df: pd.DataFrame) -> pd.DataFrame:
+    missing = [c for c in ("comment_text", "toxic") if c not in df.columns]
+    if missing:
+        raise ValueError(f"toxicity data is missing columns: {', '.join(missing)}")
+    return pd.DataFrame({"text": _text(df["comment_text"]), "label": df["toxic"].astype(int)}).reset_index(drop=True)
+
+
+def _normalize_labeled(kind: str):
+    def normalize(df: pd.DataFrame) -> pd.DataFrame:
+        out = pd.DataFrame({c: _text(df[c]) if c in df.columns else "" for c in SCHEMAS[kind]}, index=df.index)
+        for c in ARTICLE_LABEL_COLUMNS:
+            if c in df.columns:
+                out[c] = pd.to_numeric(df[c], errors="coerce").astype(float)
+        return out.reset_index(drop=True)
+
+    return normalize
+
+
+# -----------------------------------------------------------------------------
+# Chunked readers
+# -----------------------------------------------------------------------------
+
+
+def iter_liar_tsv(path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    for chunk in pd.read_csv(path, sep="\t", header=None, on_bad_lines="skip", chunksize=chunksize, dtype=str):
+        yield _normalize_liar_tsv(chunk)
+
+
+def iter_liar_jsonl(path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    records: List[dict] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+            if len(records) >= chunksize:
+                yield _normalize_liar_jsonl(pd.DataFrame(records))
+                records = []
+    if records:
+        yield _normalize_liar_jsonl(pd.DataFrame(records))
+
+
+def iter_political_txt(path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    labels: List[int] = []
+    texts: List[str] = []
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t", 1)
+            if len(parts) != 2:
+                continue
+            try:
+                label = int(parts[0].strip())
+            except ValueError:
+                continue
+            labels.append(label)
+            texts.append(parts[1].strip())
+            if len(labels) >= chunksize:
+                yield pd.DataFrame({"label": labels, "text": texts})
+                labels, texts = [], []
+    if labels:
+        yield pd.DataFrame({"label": labels, "text": texts})
+
+
+def _iter_csv(normalize):
+    def reader(path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            yield normalize(chunk)
+
+    return reader
+
+
+iter_clickbait_csv = _iter_csv(_normalize_clickbait)
+iter_toxicity_csv = _iter_csv(_normalize_toxicity)
+iter_articles_csv = _iter_csv(_normalize_labeled("articles"))
+iter_sentences_csv = _iter_csv(_normalize_labeled("sentences"))
+
+_READERS = {
+    ("liar", ".tsv"): iter_liar_tsv,
+    ("liar", ".jsonl"): iter_liar_jsonl,
+    ("political", ".txt"): iter_political_txt,
+    ("clickbait", ".csv"): iter_clickbait_csv,
+    ("toxicity", ".csv"): iter_toxicity_csv,
+    ("articles", ".csv"): iter_articles_csv,
+    ("sentences", ".csv"): iter_sentences_csv,
+}
+
+
+def infer_kind(path: Path) -> str:
+    """Guess the dataset kind from the path under data/."""
+    path = Path(path)
+    parent = path.parent.name
+    if parent in ("tsv", "jsonl"):
+        return "liar"
+    if parent.startswith("pol"):
+        return "political"
+    if parent.startswith("tox"):
+        return "toxicity"
+    if parent == "clickbait":
+        return "clickbait"
+    if path.name == "article.csv" or path.name.startswith("sentences"):
+        return "sentences"
+    if path.name.startswith("article"):
+        return "articles"
+    raise ValueError(f"Cannot infer dataset kind for {path}; pass kind= explicitly")
+
+
+def iter_chunks(path: Union[str, Path], kind: Optional[str] = None, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Stream a dataset file as normalized DataFrame chunks of at most `chunksize` rows."""
+    path = Path(path)
+    kind = kind or infer_kind(path)
+    reader = _READERS.get((kind, path.suffix.lower()))
+    if reader is None:
+        raise ValueError(f"No reader for kind={kind!r} with suffix {path.suffix!r}")
+    return reader(path, chunksize=chunksize)
+
+
+# -----------------------------------------------------------------------------
+# Columnar cache
+# -----------------------------------------------------------------------------
+
+
+class StringColumn:
+    """Read-only text column backed by a UTF-8 byte buffer and row offsets (both memory-mappable)."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values: Sequence[str]) -> "StringColumn":
+        encoded = [str(v).encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return bytes(self._data[start:end]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        buf = memoryview(self._data)
+        offsets = self._offsets.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            yield bytes(buf[start:end]).decode("utf-8")
+
+    def tolist(self) -> List[str]:
+        return list(self)
+
+
+class Table:
+    """Columns of a cached dataset: numpy arrays for numbers, StringColumn for text."""
+
+    def __init__(self, columns: Dict[str, Union[np.ndarray, StringColumn]], n_rows: int):
+        self.columns = columns
+        self.n_rows = n_rows
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __getitem__(self, name: str) -> Union[np.ndarray, StringColumn]:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            name: col.tolist() if isinstance(col, StringColumn) else np.asarray(col)
+            for name, col in self.columns.items()
+        })
+
+
+def file_digest(path: Path, block_size: int = 1 << 20) -> str:
+    """SHA-256 of the file contents (streamed)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cached_digest(path: Path, cache_dir: Optional[Path] = None) -> str:
+    """file_digest, memoized on (path, size, mtime) so unchanged files are not re-hashed."""
+    path = Path(path)
+    cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    stat = path.stat()
+    memo_path = cache_dir / "digests.json"
+    key = f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    try:
+        memo = json.loads(memo_path.read_text())
+    except (OSError, ValueError):
+        memo = {}
+    if key in memo:
+        return memo[key]
+    digest = file_digest(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Re-read just before writing to keep entries other processes added while we
+    # hashed, then replace atomically from a uniquely named temp file. A write
+    # that still races only drops a memo entry, which costs one re-hash later.
+    try:
+        memo = json.loads(memo_path.read_text())
+    except (OSError, ValueError):
+        memo = {}
+    memo[key] = digest
+    fd, tmp = tempfile.mkstemp(prefix=".digests-", suffix=".tmp", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(memo, f)
+        os.replace(tmp, memo_path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return digest
+
+
+def _is_text(values: pd.Series) -> bool:
+    # pandas 3 stores text as the "str" dtype rather than object; both go to StringColumn.
+    return pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)
+
+
+def _write_columns(chunks: Iterator[pd.DataFrame], out_dir: Path) -> dict:
+    """Append chunks column by column into out_dir; return the meta dict."""
+    text_files: Dict[str, object] = {}
+    text_offsets: Dict[str, List[int]] = {}
+    numeric: Dict[str, List[np.ndarray]] = {}
+    order: List[str] = []
+    n_rows = 0
+    try:
+        for chunk in chunks:
+            for name in chunk.columns:
+                if name not in order:
+                    order.append(name)
+                values = chunk[name]
+                if _is_text(values):
+                    if name not in text_files:
+                        text_files[name] = open(out_dir / f"{name}.data.bin", "wb")
+                        text_offsets[name] = [0]
+                    f, offsets = text_files[name], text_offsets[name]
+                    for v in values.tolist():
+                        encoded = str(v).encode("utf-8")
+                        f.write(encoded)
+                        offsets.append(offsets[-1] + len(encoded))
+                else:
+                    numeric.setdefault(name, []).append(values.to_numpy())
+            n_rows += len(chunk)
+    finally:
+        for f in text_files.values():
+            f.close()
+    for name in text_files:
+        raw = np.fromfile(out_dir / f"{name}.data.bin", dtype=np.uint8)
+        np.save(out_dir / f"{name}.data.npy", raw)
+        (out_dir / f"{name}.data.bin").unlink()
+        np.save(out_dir / f"{name}.offsets.npy", np.asarray(text_offsets[name], dtype=np.int64))
+    for name, parts in numeric.items():
+        np.save(out_dir / f"{name}.npy", np.concatenate(parts))
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "n_rows": n_rows,
+        "columns": [{"name": n, "type": "text" if n in text_files else "numeric"} for n in order],
+    }
+
+
+def _read_columns(cache_path: Path) -> Table:
+    meta = json.loads((cache_path / "meta.json").read_text())
+    columns: Dict[str, Union[np.ndarray, StringColumn]] = {}
+    for col in meta["columns"]:
+        name = col["name"]
+        if col["type"] == "text":
+            columns[name] = StringColumn(
+                np.load(cache_path / f"{name}.data.npy", mmap_mode="r"),
+                np.load(cache_path / f"{name}.offsets.npy", mmap_mode="r"),
+            )
+        else:
+            columns[name] = np.load(cache_path / f"{name}.npy", mmap_mode="r")
+    return Table(columns, meta["n_rows"])
+
+
+def load(
+    path: Union[str, Path],
+    kind: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Table:
+    """
+    Load a dataset file as a Table of normalized columns.
+
+    The first call parses the file and writes the columnar cache (keyed by the
+    file's content hash, kind and SCHEMA_VERSION); later calls memory-map it.
+    With use_cache=False the file is parsed into memory and nothing is written.
+    """
+    path = Path(path)
+    kind = kind or infer_kind(path)
+    if not use_cache:
+        frames = list(iter_chunks(path, kind=kind, chunksize=chunksize))
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=SCHEMAS[kind])
+        return Table(
+            {
+                c: StringColumn.from_strings(df[c].tolist()) if _is_text(df[c]) else df[c].to_numpy()
+                for c in df.columns
+            },
+            len(df),
+        )
+    cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    digest = cached_digest(path, cache_dir)
+    cache_path = cache_dir / f"{path.stem}-{kind}-v{SCHEMA_VERSION}-{digest[:16]}"
+    if not (cache_path / "meta.json").exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{path.stem}-", dir=cache_dir))
+        try:
+            meta = _write_columns(iter_chunks(path, kind=kind, chunksize=chunksize), tmp_dir)
+            meta.update({"source": str(path), "kind": kind, "sha256": digest})
+            (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+            try:
+                os.replace(tmp_dir, cache_path)
+            except OSError:
+                # Another process finished the same cache first; use theirs.
+                if not (cache_path / "meta.json").exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return _read_columns(cache_path)
@@ -0,0 +1,124 @@
+"""Sentence-level evidence selection for the factor agents.
+
+A sentence scorer trained on data/sentences_labeled.csv (see
+src/scripts/train_predictive_models.py) is stored with the other predictive
+models. At inference, the article is split into sentences, all sentences are
+vectorized together and scored for every factor with one sparse matrix product
+(X @ W + b), and the top-k sentences per factor form a compact evidence pack
+that can replace the full body in the prompt (run(..., evidence_k=k)).
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models import get_current_models
+
+# Column order of the scorer's outputs; keys match FACTUALITY_FACTORS.
+SENTENCE_FACTORS = [
+    "political_affiliation",
+    "clickbait",
+    "sensationalism",
+    "title_vs_body",
+    "sentiment",
+    "toxicity",
+]
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n+")
+
+
+def split_sentences(text: str, min_chars: int = 20) -> List[Tuple[int, int]]:
+    """(start, end) character spans of the sentences in text, skipping fragments shorter than min_chars."""
+    spans = []
+    start = 0
+    for m in _SENTENCE_END.finditer(text):
+        spans.append((start, m.start()))
+        start = m.end()
+    spans.append((start, len(text)))
+    out = []
+    for a, b in spans:
+        while a < b and text[a].isspace():
+            a += 1
+        while b > a and text[b - 1].isspace():
+            b -= 1
+        if b - a >= min_chars:
+            out.append((a, b))
+    return out
+
+
+class SentenceScorer:
+    """Linear per-factor sentence scores computed as one sparse matmul."""
+
+    def __init__(self, vectorizer: Any, weights: np.ndarray, intercept: np.ndarray, factors: List[str]):
+        self.vectorizer = vectorizer
+        self.weights = weights
+        self.intercept = intercept
+        self.factors = factors
+
+    @classmethod
+    def from_artifact(cls, artifact: Dict[str, Any]) -> "SentenceScorer":
+        """Flatten a TF-IDF + MultiOutputClassifier(LogisticRegression) pipeline into W and b."""
+        pipeline = artifact["pipeline"]
+        estimators = pipeline.named_steps["clf"].estimators_
+        weights = np.column_stack([e.coef_.ravel() for e in estimators]).astype(np.float32)
+        intercept = np.array([e.intercept_[0] for e in estimators], dtype=np.float32)
+        return cls(pipeline.named_steps["tfidf"], weights, intercept, artifact.get("factors", SENTENCE_FACTORS))
+
+    def score(self, sentences: List[str]) -> np.ndarray:
+        """(n_sentences, n_factors) probabilities that each sentence is evidence for each factor."""
+        if not sentences:
+            return np.zeros((0, len(self.factors)), dtype=np.float32)
+        X = self.vectorizer.transform([s.lower() for s in sentences])
+        logits = np.asarray(X @ self.weights) + self.intercept
+        return 1.0 / (1.0 + np.exp(-logits))
+
+
+# id(artifact) -> SentenceScorer, so W is built once per loaded model version.
+_SCORERS: Dict[int, SentenceScorer] = {}
+
+
+def get_sentence_scorer(
+    models_dir: Optional[Path] = None,
+    models: Optional[Dict[str, Any]] = None,
+) -> Optional[SentenceScorer]:
+    """The scorer from the current model set, or None if it has not been trained."""
+    if models is None:
+        models = get_current_models(models_dir)
+    artifact = models.get("sentence_scorer")
+    if not artifact or artifact.get("pipeline") is None:
+        return None
+    key = id(artifact)
+    if key not in _SCORERS:
+        _SCORERS.clear()
+        _SCORERS[key] = SentenceScorer.from_artifact(artifact)
+    return _SCORERS[key]
+
+
+def select_evidence(
+    article_content: str,
+    k: int = 3,
+    scorer: Optional[SentenceScorer] = None,
+    models_dir: Optional[Path] = None,
+) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Top-k evidence sentences per factor.
+    Returns {factor_key: [{"sentence", "score", "start", "end"}, ...]} in
+    descending score order, or None if no sentence scorer is available.
+    """
+    scorer = scorer or get_sentence_scorer(models_dir)
+    if scorer is None:
+        return None
+    content = str(article_content or "")
+    spans = split_sentences(content)
+    sentences = [content[a:b] for a, b in spans]
+    scores = scorer.score(sentences)
+    evidence: Dict[str, List[Dict[str, Any]]] = {}
+    for j, factor in enumerate(scorer.factors):
+        top = np.argsort(-scores[:, j], kind="stable")[:k] if len(sentences) else []
+        evidence[factor] = [
+            {"sentence": sentences[i], "score": float(scores[i, j]), "start": spans[i][0], "end": spans[i][1]}
+            for i in top
+        ]
+    return evidence
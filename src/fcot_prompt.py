@@ -219,18 +219,18 @@ Return ONLY the JSON object. No markdown, no extra text."""
 # -----------------------------------------------------------------------------
 # FULL FCoT COMBINER INSTRUCTION (one place)
 # Placeholders: {{political_affiliation_bias}}, {{clickbait_level}}, etc.
-# (filled by ADK from state)
+# (filled from session state by the combiner instruction provider in app.py)
 # -----------------------------------------------------------------------------
 
 FCOT_COMBINER_INSTRUCTION = """You are the final step in a Fractal Chain of Thought (FCoT) \
-factuality pipeline. You operate at document scale; the six factor agents have \
+factuality pipeline. You operate at document scale; the factor agents have \
 already produced evidence-level evaluations. Use the same fractal reasoning \
 structure: Problem → Solution → Verification → Justification.
 
 ## Your reasoning structure (fractal: same four steps as factor level)
 
 1. **Problem** — Goal for this level: produce a combined veracity score. What do
-   the six factor evaluations say, and where do they agree or conflict? Consider
+   the factor evaluations say, and where do they agree or conflict? Consider
    each in turn:
    - political_affiliation_bias: {{political_affiliation_bias}}
    - clickbait_level: {{clickbait_level}}
@@ -248,10 +248,10 @@ structure: Problem → Solution → Verification → Justification.
 
 2. **Solution** — Propose a combined_veracity_score (0–10, lower = more reliable)
    and a draft overall_assessment. Apply recursive self-correction: maximize
-   coherence and epistemic consistency across the six factors while minimizing
+   coherence and epistemic consistency across the factors while minimizing
    redundancy and contradictory weighting. If factor outputs conflict, re-ground:
    decide which factors should dominate for this article and why (inter-agent
-   reflectivity: you are reflecting on and reconciling the six agents'
+   reflectivity: you are reflecting on and reconciling the factor agents'
    reasoning).
 
 3. **Verification** — Check: Is your combined score consistent with the factor
@@ -279,7 +279,7 @@ Justification synthesis>"}}
 
 - combined_veracity_score: single number 0–10 (lower = more reliable).
 - overall_assessment: brief summary of reliability and main concerns, informed
-  by your step-wise reasoning and reconciliation of the six factors.
+  by your step-wise reasoning and reconciliation of the factors.
 
 Return ONLY the JSON object. No markdown or extra text."""
 
@@ -306,6 +306,6 @@ def get_fcot_factor_instruction(factor_name: str, factor_key: str, recipe: str)
 def get_fcot_combiner_instruction() -> str:
     """Return the full FCoT combiner prompt.
 
-    ADK will fill {{political_affiliation_bias}}, etc. from session state.
+    app.py fills {{political_affiliation_bias}}, etc. from session state.
     """
     return FCOT_COMBINER_INSTRUCTION
@@ -0,0 +1,66 @@
+"""
+Shared pieces of the human-eval comparison: the label-to-factor mapping,
+agreement metrics against human labels, and a reader for run logs.
+
+Used by scripts/compute_generative_human_eval.py and
+src/scripts/distill_llm_scores.py.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+import numpy as np
+
+# (human label column in the labeled CSV, factor output_key in run results)
+FACTOR_MAP = [
+    ("toxicity", "toxicity_level"),
+    ("title_vs_body", "title_body_alignment"),
+    ("clickbait", "clickbait_level"),
+    ("political_affiliation", "political_affiliation_bias"),
+    ("sentiment", "sentiment_bias"),
+    ("sensationalism", "sensationalism"),
+]
+
+
+def compute_metrics(pred: List[float], truth: List[float]) -> Dict[str, Any]:
+    """Compute Pearson correlation, MAE, % within ±2, and 100 - normalized_MAE."""
+    pred = np.array(pred, dtype=float)
+    truth = np.array(truth, dtype=float)
+    valid = np.isfinite(pred) & np.isfinite(truth)
+    pred = pred[valid]
+    truth = truth[valid]
+    n = len(pred)
+    if n == 0:
+        return {"pearson": None, "mae": None, "pct_within_2": None, "human_eval_pct": None}
+
+    if n > 1 and pred.std() > 0 and truth.std() > 0:
+        pearson = float(np.corrcoef(pred, truth)[0, 1])
+    else:
+        pearson = None
+
+    mae = float(np.abs(pred - truth).mean())
+    within_2 = np.sum(np.abs(pred - truth) <= 2) / n * 100
+    human_eval_pct = 100 - (mae / 10) * 100
+    human_eval_pct = max(0, min(100, human_eval_pct))
+
+    return {
+        "pearson": pearson,
+        "mae": mae,
+        "pct_within_2": within_2,
+        "human_eval_pct": round(human_eval_pct, 1),
+    }
+
+
+def iter_run_logs(paths: Iterable[Path]) -> Iterator[Dict[str, Any]]:
+    """Stream run records from JSON-lines logs, skipping malformed lines."""
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
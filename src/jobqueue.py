@@ -0,0 +1,197 @@
+"""
+Durable SQLite job queue for scoring article corpora.
+
+One row per (corpus, pattern, article). Workers lease jobs for a fixed time
+and renew the lease while they work; a lease that expires (worker killed or
+hung) makes the job available again. Every lease bumps `attempts`, and
+results are only accepted from the current lease holder (same owner and
+attempt), so a late write from a worker that lost its lease is dropped. Each
+article therefore ends up done or failed exactly once and is never lost.
+
+The database runs in WAL mode, so several worker processes on one host can
+share it; lease changes happen in BEGIN IMMEDIATE transactions.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.run import article_hash
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    corpus TEXT NOT NULL,
+    pattern TEXT NOT NULL,
+    article_hash TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL,
+    body_text TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    UNIQUE (corpus, pattern, article_hash)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+"""
+
+STATUSES = ("pending", "leased", "done", "failed")
+
+
+def worker_id() -> str:
+    """Lease owner name: host, pid and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class JobQueue:
+    """Connection to the queue database; one per process (sqlite3 connections are not shared)."""
+
+    def __init__(self, path: Path, max_attempts: int = 3):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _write(self, sql: str, params: Iterable[Any] = ()) -> int:
+        cur = self.conn.execute(sql, tuple(params))
+        return cur.rowcount
+
+    def enqueue(self, rows: Iterable[Dict[str, str]], pattern: str, corpus: str = "default") -> int:
+        """Add articles; ones already queued for this corpus and pattern are skipped. Returns rows added."""
+        now = time.time()
+        records = [
+            (corpus, pattern, article_hash(r["title"], r["body_text"]), r.get("url", ""), r["title"], r["body_text"], now)
+            for r in rows
+        ]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (corpus, pattern, article_hash, url, title, body_text, enqueued_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def lease(self, owner: str, n: int = 1, lease_seconds: float = 300.0) -> List[Dict[str, Any]]:
+        """
+        Claim up to n jobs: pending ones, or leased ones whose lease expired.
+        Expired jobs that already used max_attempts are marked failed instead.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = COALESCE(error, 'lease expired'), finished_at = ?,"
+                " lease_owner = NULL WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            rows = self.conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)"
+                " ORDER BY id LIMIT ?",
+                (now, n),
+            ).fetchall()
+            jobs = []
+            for row in rows:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1,"
+                    " started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (owner, now + lease_seconds, now, row["id"]),
+                )
+                job = dict(row)
+                job["attempts"] += 1
+                jobs.append(job)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return jobs
+
+    def renew(self, job: Dict[str, Any], owner: str, lease_seconds: float = 300.0) -> bool:
+        """Extend a lease; False if this worker no longer holds it."""
+        return self._write(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ? AND attempts = ?",
+            (time.time() + lease_seconds, job["id"], owner, job["attempts"]),
+        ) == 1
+
+    def complete(self, job: Dict[str, Any], owner: str, result: Dict[str, Any]) -> bool:
+        """Store the result; False (and nothing written) if the lease was lost."""
+        return self._write(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?, lease_owner = NULL"
+            " WHERE id = ? AND status = 'leased' AND lease_owner = ? AND attempts = ?",
+            (json.dumps(result, default=str), time.time(), job["id"], owner, job["attempts"]),
+        ) == 1
+
+    def fail(self, job: Dict[str, Any], owner: str, error: str) -> bool:
+        """Record an error; the job goes back to pending until max_attempts is used up."""
+        final = job["attempts"] >= self.max_attempts
+        return self._write(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL, lease_expires = NULL"
+            " WHERE id = ? AND status = 'leased' AND lease_owner = ? AND attempts = ?",
+            ("failed" if final else "pending", error, time.time() if final else None, job["id"], owner, job["attempts"]),
+        ) == 1
+
+    def retry_failed(self, corpus: Optional[str] = None) -> int:
+        """Reset failed jobs to pending with a fresh attempt budget."""
+        sql = "UPDATE jobs SET status = 'pending', attempts = 0, finished_at = NULL WHERE status = 'failed'"
+        return self._write(sql + (" AND corpus = ?" if corpus else ""), (corpus,) if corpus else ())
+
+    def stats(self, corpus: Optional[str] = None, window: float = 60.0) -> Dict[str, Any]:
+        """Counts per status, retries, and throughput (done per second) overall and over the last `window` seconds."""
+        where, params = (" WHERE corpus = ?", (corpus,)) if corpus else ("", ())
+        counts = {s: 0 for s in STATUSES}
+        for row in self.conn.execute(f"SELECT status, COUNT(*) AS n FROM jobs{where} GROUP BY status", params):
+            counts[row["status"]] = row["n"]
+        row = self.conn.execute(
+            f"SELECT MIN(started_at) AS t0, MAX(finished_at) AS t1, SUM(MAX(attempts - 1, 0)) AS retries"
+            f" FROM jobs{where}",
+            params,
+        ).fetchone()
+        now = time.time()
+        recent = self.conn.execute(
+            f"SELECT COUNT(*) FROM jobs{where or ' WHERE 1'} AND status = 'done' AND finished_at >= ?",
+            (*params, now - window),
+        ).fetchone()[0]
+        elapsed = (row["t1"] - row["t0"]) if row["t0"] and row["t1"] else 0.0
+        return {
+            **counts,
+            "total": sum(counts.values()),
+            "retries": row["retries"] or 0,
+            "throughput": counts["done"] / elapsed if elapsed > 0 else 0.0,
+            "recent_throughput": recent / window,
+        }
+
+    def results(self, corpus: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Finished jobs (done or failed) with the parsed run() result."""
+        where, params = (" AND corpus = ?", (corpus,)) if corpus else ("", ())
+        out = []
+        for row in self.conn.execute(
+            f"SELECT * FROM jobs WHERE status IN ('done', 'failed'){where} ORDER BY id", params
+        ):
+            job = dict(row)
+            job["result"] = json.loads(job["result"]) if job["result"] else None
+            out.append(job)
+        return out
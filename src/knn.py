@@ -0,0 +1,173 @@
+"""
+Nearest-neighbor scoring tier over the human-labeled articles.
+
+Articles are embedded as TF-IDF reduced with TruncatedSVD to dense,
+L2-normalized float32 vectors, so cosine similarity is one matrix product.
+A query's 0-10 factor scores are the similarity-weighted mean of its k
+nearest labeled neighbors' human scores, and the neighbors are returned as
+evidence. Search is brute force by default; with n_lists > 0 the vectors are
+clustered (k-means) and only the n_probe closest lists are scanned (IVF).
+No LLM call is involved, so this tier can triage thousands of articles per
+second on CPU.
+
+Built by src/scripts/build_knn_index.py and stored in the model registry as
+the "knn_index" artifact; use knn_scores() or get_knn_index().query().
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.models import get_current_models
+
+# Human label column -> pipeline output key (same scale as the LLM factor scores).
+LABEL_TO_OUTPUT_KEY = {
+    "political_affiliation": "political_affiliation_bias",
+    "clickbait": "clickbait_level",
+    "sensationalism": "sensationalism",
+    "title_vs_body": "title_body_alignment",
+    "sentiment": "sentiment_bias",
+    "toxicity": "toxicity_level",
+}
+
+
+def _normalize(X: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return (X / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+class KNNIndex:
+    """Dense cosine kNN over labeled articles; see module docstring."""
+
+    def __init__(self, vectorizer, svd, vectors, labels, titles, urls, centroids=None, lists=None):
+        self.vectorizer = vectorizer
+        self.svd = svd
+        self.vectors = vectors  # (n, d) float32, unit rows
+        self.labels = labels  # (n, n_factors) float32, NaN where unlabeled
+        self.titles = list(titles)
+        self.urls = list(urls)
+        self.centroids = centroids  # (n_lists, d) float32 or None
+        self.lists = lists  # list of int arrays, one per centroid
+        self.output_keys = list(LABEL_TO_OUTPUT_KEY.values())
+
+    @classmethod
+    def build(
+        cls,
+        titles: Sequence[str],
+        bodies: Sequence[str],
+        labels: np.ndarray,
+        urls: Optional[Sequence[str]] = None,
+        n_components: int = 128,
+        n_lists: int = 0,
+        random_state: int = 42,
+    ) -> "KNNIndex":
+        """Fit TF-IDF + SVD on the articles and index them; labels are (n, 6) in LABEL_TO_OUTPUT_KEY order."""
+        from sklearn.cluster import KMeans
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        docs = [f"{t} {b}" for t, b in zip(titles, bodies)]
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=1, max_df=0.95, max_features=50_000, sublinear_tf=True)
+        X = vectorizer.fit_transform(docs)
+        n_components = max(1, min(n_components, X.shape[0] - 1, X.shape[1] - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=random_state)
+        vectors = _normalize(svd.fit_transform(X))
+        centroids = lists = None
+        if n_lists and n_lists < len(docs):
+            km = KMeans(n_clusters=n_lists, n_init=4, random_state=random_state).fit(vectors)
+            centroids = _normalize(km.cluster_centers_)
+            lists = [np.flatnonzero(km.labels_ == c) for c in range(n_lists)]
+        return cls(
+            vectorizer,
+            svd,
+            vectors,
+            np.asarray(labels, dtype=np.float32),
+            titles,
+            urls if urls is not None else [""] * len(docs),
+            centroids,
+            lists,
+        )
+
+    def embed(self, titles: Sequence[str], bodies: Sequence[str]) -> np.ndarray:
+        X = self.vectorizer.transform([f"{t} {b}" for t, b in zip(titles, bodies)])
+        return _normalize(self.svd.transform(X))
+
+    def _neighbors(self, Q: np.ndarray, k: int, n_probe: int, exclude_self: bool = False):
+        """(indices, similarities), each (n_queries, k), most similar first."""
+        n = len(self.vectors)
+        k = min(k, n - 1 if exclude_self else n)
+        if self.centroids is None:
+            sims = Q @ self.vectors.T
+        else:
+            # IVF: scan only the lists of the n_probe closest centroids.
+            sims = np.full((len(Q), n), -np.inf, dtype=np.float32)
+            probes = np.argsort(-(Q @ self.centroids.T), axis=1)[:, :n_probe]
+            for qi, lists in enumerate(probes):
+                idx = np.concatenate([self.lists[c] for c in lists])
+                sims[qi, idx] = self.vectors[idx] @ Q[qi]
+        if exclude_self:
+            np.fill_diagonal(sims, -np.inf)
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_sims, order, axis=1)
+
+    def _scores(self, idx: np.ndarray, sims: np.ndarray) -> np.ndarray:
+        """Similarity-weighted mean of neighbor labels, ignoring unlabeled neighbors; (n_queries, n_factors)."""
+        weights = np.where(np.isfinite(sims), 1.0 / (1.0 - np.clip(sims, -1.0, 1.0) + 1e-3), 0.0)
+        labels = self.labels[idx]  # (q, k, f)
+        known = np.isfinite(labels)
+        w = weights[:, :, None] * known
+        total = w.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, (w * np.nan_to_num(labels)).sum(axis=1) / total, np.nan)
+
+    def query(
+        self, titles: Sequence[str], bodies: Sequence[str], k: int = 5, n_probe: int = 2
+    ) -> List[Dict[str, Any]]:
+        """Per article: {"factor_scores": {output_key: 0-10 or None}, "neighbors": [{"title", "url", "similarity"}]}."""
+        if not len(titles):
+            return []
+        idx, sims = self._neighbors(self.embed(titles, bodies), k, n_probe)
+        scores = self._scores(idx, sims)
+        out = []
+        for qi in range(len(titles)):
+            out.append({
+                "factor_scores": {
+                    key: (None if np.isnan(v) else round(float(v), 2)) for key, v in zip(self.output_keys, scores[qi])
+                },
+                "neighbors": [
+                    {"title": self.titles[j], "url": self.urls[j], "similarity": round(float(s), 4)}
+                    for j, s in zip(idx[qi], sims[qi])
+                    if np.isfinite(s)
+                ],
+            })
+        return out
+
+    def leave_one_out(self, k: int = 5) -> np.ndarray:
+        """Predicted labels for every indexed article from its other neighbors; (n, n_factors)."""
+        idx, sims = self._neighbors(self.vectors, k, n_probe=len(self.lists or []) or 1, exclude_self=True)
+        return self._scores(idx, sims)
+
+
+def get_knn_index(models_dir: Optional[Path] = None, models: Optional[Dict[str, Any]] = None) -> Optional[KNNIndex]:
+    """The index from the current model set, or None if it has not been built."""
+    if models is None:
+        models = get_current_models(models_dir)
+    artifact = models.get("knn_index")
+    return artifact.get("index") if artifact else None
+
+
+def knn_scores(
+    article_title: str,
+    article_content: str,
+    k: int = 5,
+    models_dir: Optional[Path] = None,
+    models: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """0-10 factor scores and neighbor evidence for one article, or None without an index."""
+    index = get_knn_index(models_dir, models)
+    if index is None:
+        return None
+    return index.query([article_title or ""], [article_content or ""], k=k)[0]
@@ -0,0 +1,15 @@
+"""
+Text of ADK/genai content objects, shared by the model backends and hooks.
+"""
+
+from typing import Any
+
+
+def content_text(value: Any) -> str:
+    """Concatenated text parts of a Content (or a plain string; "" for None)."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    parts = getattr(value, "parts", None) or []
+    return "".join(getattr(p, "text", None) or "" for p in parts)
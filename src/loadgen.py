@@ -0,0 +1,273 @@
+"""
+Open-loop load generation for the pipeline.
+
+Requests are sent at scheduled arrival times (Poisson or replayed from a
+trace) whether or not earlier requests have finished, so queueing shows up in
+the measured latency instead of silently lowering the offered rate as in a
+closed loop. Latency is measured from each request's scheduled arrival, not
+from when it was actually sent, so client-side lag is included as well.
+
+Articles are sampled with replacement from the corpora, which keeps their
+length distribution. Targets are async callables taking a list of articles
+and returning one result per article (see src/scripts/load_test.py for the
+run(), in-process service and HTTP targets); a result with "error" counts as
+an error, one with "degraded" as degraded, and HttpError 429/503 as rejected.
+"""
+
+import asyncio
+import json
+import math
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+Target = Callable[[List[Dict[str, str]]], Awaitable[List[Dict[str, Any]]]]
+
+REJECTED_STATUSES = (429, 503)
+OUTCOMES = ("ok", "error", "rejected", "degraded", "timeout")
+
+
+def load_corpus(paths: Sequence[Path], max_chars: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Articles as [{"url", "title", "body_text", "source"}] from articles CSVs,
+    sentence CSVs (sentences joined back into articles by URL) and LIAR JSONL
+    (claim as title, justification as body).
+    """
+    import pandas as pd
+
+    from src import datasets
+
+    articles: List[Dict[str, str]] = []
+    for path in paths:
+        path = Path(path)
+        kind = datasets.infer_kind(path)
+        frames = list(datasets.iter_chunks(path, kind=kind))
+        if not frames:
+            continue
+        df = pd.concat(frames, ignore_index=True)
+        if kind == "sentences":
+            df = (
+                df.groupby("url", sort=False)
+                .agg(title=("title", "first"), body_text=("sentence", " ".join))
+                .reset_index()
+            )
+        elif kind == "liar":
+            df = df.rename(columns={"statement": "title", "justification": "body_text"}).assign(url="")
+        elif kind != "articles":
+            raise ValueError(f"{path} is not an article corpus (kind {kind!r})")
+        for url, title, body in zip(df["url"], df["title"], df["body_text"]):
+            if not body:
+                continue
+            articles.append({
+                "url": url,
+                "title": title,
+                "body_text": body[:max_chars] if max_chars else body,
+                "source": path.name,
+            })
+    return articles
+
+
+def sample_articles(corpus: Sequence[Dict[str, str]], n: int, seed: int = 0) -> List[Dict[str, str]]:
+    """n articles drawn uniformly with replacement (same length distribution as the corpus)."""
+    rng = random.Random(seed)
+    return [corpus[rng.randrange(len(corpus))] for _ in range(n)]
+
+
+def poisson_arrivals(rate: float, duration: float, seed: int = 0) -> List[float]:
+    """Arrival offsets (seconds from start) of a Poisson process with `rate` per second."""
+    rng = random.Random(seed)
+    t, out = 0.0, []
+    while True:
+        t += rng.expovariate(rate)
+        if t >= duration:
+            return out
+        out.append(t)
+
+
+def trace_arrivals(path: Path, speedup: float = 1.0, duration: Optional[float] = None) -> List[float]:
+    """
+    Arrival offsets replayed from a JSON-lines trace: records with an ISO
+    "timestamp" (e.g. logs/experiments.jsonl) or a numeric "t" in seconds.
+    speedup > 1 compresses the trace; offsets beyond `duration` are dropped.
+    """
+    times = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "t" in record:
+                times.append(float(record["t"]))
+            elif record.get("timestamp"):
+                times.append(datetime.fromisoformat(record["timestamp"]).timestamp())
+    if not times:
+        return []
+    times.sort()
+    offsets = [(t - times[0]) / speedup for t in times]
+    return [t for t in offsets if duration is None or t < duration]
+
+
+def _groups(arrivals: Sequence[float], batch_size: int, window: float) -> List[tuple]:
+    """(send offset, [arrival indices]); a batch closes when full or `window` after its first arrival."""
+    groups = []
+    i = 0
+    while i < len(arrivals):
+        j = i + 1
+        while j < len(arrivals) and j - i < batch_size and arrivals[j] - arrivals[i] <= window:
+            j += 1
+        send_at = arrivals[j - 1] if j - i == batch_size else arrivals[i] + (window if batch_size > 1 else 0.0)
+        groups.append((send_at, list(range(i, j))))
+        i = j
+    return groups
+
+
+def _outcome(result: Any) -> tuple:
+    if not isinstance(result, dict):
+        return "error", "no result"
+    if result.get("error"):
+        return "error", str(result["error"])[:200]
+    if result.get("degraded"):
+        return "degraded", result.get("overall_assessment", "")
+    return "ok", ""
+
+
+async def drive(
+    target: Target,
+    articles: Sequence[Dict[str, str]],
+    arrivals: Sequence[float],
+    batch_size: int = 1,
+    batch_window: float = 0.0,
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Send articles[i] at arrivals[i] (grouped into batches when batch_size > 1)
+    and return one record per request: scheduled/sent/done offsets, latency
+    from the scheduled arrival, outcome ("ok", "error", "rejected",
+    "degraded", "timeout") and detail.
+    """
+    records = [
+        {"i": i, "chars": len(a.get("body_text", "")), "scheduled": arrivals[i], "sent": None, "done": None,
+         "latency": None, "outcome": None, "detail": ""}
+        for i, a in enumerate(articles[: len(arrivals)])
+    ]
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+
+    async def send(indices: List[int]) -> None:
+        sent = loop.time() - t0
+        for i in indices:
+            records[i]["sent"] = sent
+        try:
+            call = target([articles[i] for i in indices])
+            results = await (asyncio.wait_for(call, timeout) if timeout else call)
+            outcomes = [_outcome(r) for r in results]
+        except asyncio.TimeoutError:
+            outcomes = [("timeout", "")] * len(indices)
+        except Exception as e:
+            status = getattr(e, "status", None)
+            kind = "rejected" if status in REJECTED_STATUSES else "error"
+            outcomes = [(kind, f"{type(e).__name__}: {e}"[:200])] * len(indices)
+        done = loop.time() - t0
+        for i, (outcome, detail) in zip(indices, outcomes):
+            records[i].update(done=done, latency=done - records[i]["scheduled"], outcome=outcome, detail=detail)
+
+    tasks = []
+    for send_at, indices in _groups(arrivals[: len(records)], max(1, batch_size), batch_window):
+        delay = t0 + send_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(send(indices)))
+    await asyncio.gather(*tasks)
+    return records
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * q
+    lo, hi = math.floor(k), math.ceil(k)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def summarize(records: Sequence[Dict[str, Any]], duration: float, slo: Optional[float] = None) -> Dict[str, Any]:
+    """Offered and achieved rates, goodput (ok within `slo`), outcome rates and latency percentiles."""
+    n = len(records)
+    span = max([duration] + [r["done"] for r in records if r["done"] is not None])
+    ok = [r["latency"] for r in records if r["outcome"] == "ok"]
+    good = [x for x in ok if slo is None or x <= slo]
+    counts: Dict[str, int] = {outcome: 0 for outcome in OUTCOMES}
+    for r in records:
+        counts[r["outcome"]] = counts.get(r["outcome"], 0) + 1
+    lags = [r["sent"] - r["scheduled"] for r in records if r["sent"] is not None]
+
+    def rnd(x):
+        return round(x, 3) if x is not None else None
+
+    return {
+        "requests": n,
+        "offered_rps": rnd(n / duration) if duration else None,
+        "throughput_rps": rnd(len(ok) / span) if span else None,
+        "goodput_rps": rnd(len(good) / span) if span else None,
+        **{f"{k}_rate": round(v / n, 4) for k, v in sorted(counts.items())},
+        "p50_s": rnd(_percentile(ok, 0.50)),
+        "p90_s": rnd(_percentile(ok, 0.90)),
+        "p99_s": rnd(_percentile(ok, 0.99)),
+        "max_s": rnd(max(ok) if ok else None),
+        "max_send_lag_s": rnd(max(lags) if lags else None),
+        "chars_p50": _percentile([r["chars"] for r in records], 0.5),
+    }
+
+
+async def http_post(url: str, payload: Any, timeout: float = 300.0) -> tuple:
+    """Minimal HTTP/1.1 POST of JSON (no client dependency); returns (status, parsed body)."""
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    body = json.dumps(payload).encode("utf-8")
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(parts.hostname, parts.port or 80), timeout)
+    try:
+        writer.write(
+            f"POST {parts.path or '/'} HTTP/1.1\r\nHost: {parts.netloc}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1]) if head else 0
+    try:
+        return status, json.loads(data or b"null")
+    except ValueError:
+        return status, None
+
+
+class HttpStatusError(Exception):
+    def __init__(self, status: int, body: Any):
+        super().__init__(f"HTTP {status}: {body}")
+        self.status = status
+
+
+def http_target(base_url: str, timeout: float = 300.0) -> Target:
+    """POST /score for single articles, /score/batch for batches."""
+    base_url = base_url.rstrip("/")
+
+    async def target(articles: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        payload = [{k: a.get(k, "") for k in ("url", "title", "body_text")} for a in articles]
+        if len(payload) == 1:
+            status, body = await http_post(base_url + "/score", payload[0], timeout)
+            if status != 200:
+                raise HttpStatusError(status, body)
+            return [body]
+        status, body = await http_post(base_url + "/score/batch", {"articles": payload}, timeout)
+        if status != 200:
+            raise HttpStatusError(status, body)
+        return body["results"]
+
+    return target
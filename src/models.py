@@ -1,7 +1,24 @@
-"""Predictive model outputs for the pipeline. Loads trained models from data/models/."""
+"""Predictive model outputs for the pipeline. Loads trained models from data/models/.
 
+For long articles, get_predictive_scores(chunked=True) / score_windows() split
+the body into overlapping windows, score all windows of a model in one
+predict_proba call, and aggregate them with a reducer (mean, max or top-k) so
+local sensational or toxic passages are not diluted by the rest of the text.
+
+When the model registry is in use (see src/registry.py), the promoted version
+is loaded and get_predictive_scores() hot-swaps to a newly promoted version on
+its next call: the new set is loaded completely before it replaces the old one,
+so a call never mixes artifacts from two versions.
+"""
+
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src import registry
+from src.profiling import profiled
 
 try:
     import joblib
@@ -23,7 +40,8 @@ _FACTOR_TO_KEY = {
 }
 
 
-def _preprocess(text: str) -> str:
+def preprocess_text(text: str) -> str:
+    """Normalization applied to every model input (lowercase, strip, cap at 100k chars)."""
     return (str(text).lower().strip() if text else "")[:100_000]
 
 
@@ -33,11 +51,11 @@ def _predict_proba(artifact: Dict[str, Any], text: str, title: str = "", body: s
     if pipeline is None:
         return None
     if input_kind == "title":
-        X = [_preprocess(title)]
+        X = [preprocess_text(title)]
     elif input_kind == "title_and_body":
-        X = [" TITLE_SEP ".join([_preprocess(title), _preprocess(body)])]
+        X = [" TITLE_SEP ".join([preprocess_text(title), preprocess_text(body)])]
     else:
-        X = [_preprocess((title or "") + " " + (text or body or ""))]
+        X = [preprocess_text((title or "") + " " + (text or body or ""))]
     try:
         proba = pipeline.predict_proba(X)[0]
         return proba.tolist()
@@ -45,37 +63,255 @@ def _predict_proba(artifact: Dict[str, Any], text: str, title: str = "", body: s
         return None
 
 
+# Other artifacts loaded alongside the factor models (see src/evidence.py, src/knn.py,
+# src/scripts/distill_llm_scores.py).
+_EXTRA_ARTIFACTS = ["sentence_scorer", "knn_index", "distilled"]
+
+# Classes whose probability marks a window as salient, by factor (default: every
+# class after the first). title_vs_body is trained with 1 = aligned, so the
+# misaligned class is 0; sentiment flags negative or positive passages; either
+# party counts for political affiliation.
+_SALIENT_CLASSES = {
+    "title_vs_body": [0],
+    "sentiment": [0, 2],
+    "political_affiliation": [0, 1],
+}
+
+REDUCERS = ("mean", "max", "topk")
+
+
+def _windows(text: str, size: int, overlap: int) -> List[Tuple[int, int]]:
+    """Overlapping (start, end) character spans over text, snapped to whitespace where possible."""
+    n = len(text)
+    if n <= size:
+        return [(0, n)]
+    spans = []
+    start = 0
+    while start < n:
+        end = min(start + size, n)
+        if end < n:
+            cut = text.rfind(" ", start + size // 2, end)
+            end = cut if cut != -1 else end
+        spans.append((start, end))
+        if end >= n:
+            break
+        nxt = max(end - overlap, start + 1)
+        space = text.find(" ", nxt, end)
+        start = space + 1 if space != -1 else nxt
+    return spans
+
+
+def _salience(factor: str, proba: np.ndarray) -> Optional[np.ndarray]:
+    """Per-window salience, or None if the artifact lacks a class the factor expects."""
+    classes = _SALIENT_CLASSES.get(factor, list(range(1, proba.shape[1])))
+    if not classes or max(classes) >= proba.shape[1]:
+        return None
+    return proba[:, classes].max(axis=1)
+
+
+def _reduce(proba: np.ndarray, salience: np.ndarray, reducer: str, top_k: int) -> np.ndarray:
+    if reducer == "mean":
+        return proba.mean(axis=0)
+    if reducer == "max":
+        return proba[int(np.argmax(salience))]
+    if reducer == "topk":
+        return proba[np.argsort(-salience, kind="stable")[:top_k]].mean(axis=0)
+    raise ValueError(f"reducer must be one of {REDUCERS}")
+
+
+class LoadedModels(dict):
+    """
+    factor -> artifact (or None), plus the registry version that was current
+    when it was loaded (None without a registry) and the directory actually
+    read, which is the base directory if that version's directory is missing.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, Optional[Dict[str, Any]]],
+        version: Optional[str] = None,
+        artifact_dir: Optional[Path] = None,
+    ):
+        super().__init__(models)
+        self.version = version
+        self.artifact_dir = artifact_dir
+
+
+def load_models(models_dir: Optional[Path] = None) -> LoadedModels:
+    """
+    Load every predictive model artifact once.
+    Returns factor -> artifact dict (or None if missing/unloadable); pass the
+    result to get_predictive_scores(models=...) to skip joblib.load per call.
+    Loads the promoted registry version when there is one.
+    """
+    base_dir = Path(models_dir) if models_dir is not None else _MODELS_DIR
+    version = registry.current_version(base_dir)
+    artifact_dir = registry.resolve_dir(base_dir)
+    models: Dict[str, Optional[Dict[str, Any]]] = {name: None for name in [*_FACTOR_TO_KEY, *_EXTRA_ARTIFACTS]}
+    if not artifact_dir.exists() or joblib is None:
+        return LoadedModels(models, version, artifact_dir)
+    for factor in models:
+        path = artifact_dir / f"{factor}.joblib"
+        if not path.exists():
+            continue
+        try:
+            models[factor] = joblib.load(path)
+        except Exception:
+            models[factor] = None
+    # Keep the version that was read even if resolve_dir fell back to base_dir, so
+    # get_current_models() sees a match and does not reload on every call.
+    return LoadedModels(models, version, artifact_dir)
+
+
+# models_dir -> LoadedModels currently served; replaced as a whole on promotion.
+_ACTIVE: Dict[Path, LoadedModels] = {}
+_ACTIVE_LOCK = threading.Lock()
+
+
+def get_current_models(models_dir: Optional[Path] = None) -> LoadedModels:
+    """
+    Return the cached model set for models_dir, reloading if a different
+    version has been promoted since it was loaded. The check is one small
+    file read; callers should hold on to the returned set for a whole request.
+    """
+    base_dir = Path(models_dir) if models_dir is not None else _MODELS_DIR
+    version = registry.current_version(base_dir)
+    active = _ACTIVE.get(base_dir)
+    if active is not None and active.version == version:
+        return active
+    with _ACTIVE_LOCK:
+        active = _ACTIVE.get(base_dir)
+        if active is None or active.version != version:
+            active = load_models(base_dir)
+            _ACTIVE[base_dir] = active
+    return active
+
+
+@profiled("get_predictive_scores")
 def get_predictive_scores(
     article_title: str,
     article_content: str,
     article_url: str = "",
     models_dir: Optional[Path] = None,
+    models: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+    chunked: bool = False,
+    **window_options: Any,
 ) -> Dict[str, Any]:
     """
     Return predictive model probability vectors for the article.
     Keys: pa_proba, cb_proba, s_proba, sa_proba, t_proba, tvb_proba.
     Each value is a list of class probabilities or None if the model is missing.
+    Without `models`, uses the cached set from get_current_models(), which
+    follows registry promotions. With chunked=True, scores come from
+    score_windows() (window_options are passed through).
     """
+    if models is None:
+        models = get_current_models(models_dir)
+    if chunked:
+        windowed = score_windows(article_title, article_content, models=models, **window_options)
+        return {key: (w["proba"] if w else None) for key, w in windowed.items()}
     out: Dict[str, Any] = {}
-    base_dir = Path(models_dir) if models_dir is not None else _MODELS_DIR
-    if not base_dir.exists() or joblib is None:
-        return {k: None for k in ["pa_proba", "cb_proba", "s_proba", "sa_proba", "t_proba", "tvb_proba"]}
+    for factor, key in _FACTOR_TO_KEY.items():
+        artifact = models.get(factor)
+        if artifact is None:
+            out[key] = None
+            continue
+        out[key] = _predict_proba(
+            artifact,
+            text=article_content,
+            title=article_title or "",
+            body=article_content or "",
+        )
+    return out
 
+
+def get_distilled_scores(
+    article_title: str,
+    article_content: str,
+    models_dir: Optional[Path] = None,
+    models: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+) -> Optional[Dict[str, Optional[float]]]:
+    """
+    0-10 factor scores from regressors distilled from logged LLM runs, keyed
+    like run()'s factor_scores, or None if no distilled model is available.
+    """
+    if models is None:
+        models = get_current_models(models_dir)
+    artifact = models.get("distilled")
+    if not artifact:
+        return None
+    X = artifact["vectorizer"].transform([preprocess_text(f"{article_title or ''} {article_content or ''}")])
+    out: Dict[str, Optional[float]] = {}
+    for key in artifact["keys"]:
+        regressor = artifact["regressors"].get(key)
+        out[key] = None if regressor is None else round(float(np.clip(regressor.predict(X)[0], 0.0, 10.0)), 2)
+    return out
+
+
+def score_windows(
+    article_title: str,
+    article_content: str,
+    models_dir: Optional[Path] = None,
+    models: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+    window: int = 2000,
+    overlap: int = 400,
+    reducer: str = "mean",
+    top_k: int = 3,
+    max_windows: int = 512,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Score overlapping windows of the article body with each model.
+
+    Every window of one model is scored in a single batched predict_proba
+    call, then reduced to one probability vector: "mean" over windows, "max"
+    (the most salient window) or "topk" (mean of the `top_k` most salient).
+    Returns {key: {"proba", "n_windows", "spans"}} with the same keys as
+    get_predictive_scores; spans are the top_k most salient windows as
+    {"start", "end", "score"} character offsets into article_content, for
+    highlighting. Title-only models are scored once with no spans, as are
+    artifacts without the classes salience is read from (e.g. a binary model
+    for sentiment), which fall back to the mean. A value is None if the model
+    is missing or fails.
+    """
+    if reducer not in REDUCERS:
+        raise ValueError(f"reducer must be one of {REDUCERS}")
+    if models is None:
+        models = get_current_models(models_dir)
+    content = str(article_content or "")
+    spans = _windows(content, window, overlap)[:max_windows]
+    title = preprocess_text(article_title)
+    out: Dict[str, Optional[Dict[str, Any]]] = {}
     for factor, key in _FACTOR_TO_KEY.items():
-        path = base_dir / f"{factor}.joblib"
-        if not path.exists():
+        artifact = models.get(factor)
+        pipeline = artifact.get("pipeline") if artifact else None
+        if pipeline is None:
             out[key] = None
             continue
+        input_kind = artifact.get("input", "title_content")
+        if input_kind == "title":
+            proba = _predict_proba(artifact, text=content, title=article_title or "", body=content)
+            out[key] = {"proba": proba, "n_windows": 1, "spans": []} if proba is not None else None
+            continue
+        pieces = [preprocess_text(content[a:b]) for a, b in spans]
+        if input_kind == "title_and_body":
+            X = [" TITLE_SEP ".join([title, piece]) for piece in pieces]
+        else:
+            X = [(title + " " + piece).strip() for piece in pieces]
         try:
-            artifact = joblib.load(path)
-            proba = _predict_proba(
-                artifact,
-                text=article_content,
-                title=article_title or "",
-                body=article_content or "",
-            )
-            out[key] = proba
+            proba = np.asarray(pipeline.predict_proba(X))
+            salience = _salience(factor, proba)
         except Exception:
             out[key] = None
-
+            continue
+        if salience is None:
+            out[key] = {"proba": proba.mean(axis=0).tolist(), "n_windows": len(spans), "spans": []}
+            continue
+        ranked = np.argsort(-salience, kind="stable")[:top_k]
+        out[key] = {
+            "proba": _reduce(proba, salience, reducer, top_k).tolist(),
+            "n_windows": len(spans),
+            "spans": [
+                {"start": spans[i][0], "end": spans[i][1], "score": float(salience[i])} for i in ranked
+            ],
+        }
     return out
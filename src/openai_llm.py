@@ -0,0 +1,141 @@
+"""
+OpenAI-compatible chat completions backend for the pipeline.
+
+OpenAICompatibleLlm is an ADK BaseLlm that posts to any server implementing
+POST {base_url}/chat/completions (vLLM, llama.cpp server, TGI, Ollama,
+LiteLLM proxy, OpenAI itself). It keeps one pooled httpx.AsyncClient per
+event loop, so the seven calls of every article reuse keep-alive connections
+instead of opening new ones; max_connections caps concurrent requests to the
+server.
+
+Use it through create_app(pattern, backend="openai", model="<served model>")
+with OPENAI_BASE_URL (default http://127.0.0.1:8000/v1) and, if the server
+needs one, OPENAI_API_KEY. The pipeline's agents only exchange text (Google
+Search is attached for Gemini models only), which is all this backend sends.
+HTTP errors are raised as OpenAIHTTPError with status_code, so
+src.concurrency treats 429/5xx as overload.
+"""
+
+import asyncio
+import os
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import httpx
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import PrivateAttr
+
+from src.llm_text import content_text
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000/v1"
+
+
+class OpenAIHTTPError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+
+
+def to_messages(llm_request: LlmRequest) -> List[Dict[str, str]]:
+    """System instruction plus the conversation as chat messages (text parts only)."""
+    messages = []
+    system = content_text(getattr(getattr(llm_request, "config", None), "system_instruction", None))
+    if system:
+        messages.append({"role": "system", "content": system})
+    for content in llm_request.contents or []:
+        text = content_text(content)
+        if not text:
+            continue
+        role = "assistant" if content.role == "model" else "user"
+        if messages and messages[-1]["role"] == role and role == "user":
+            # Several user turns in a row (e.g. ADK context notes) are merged; some servers reject repeats.
+            messages[-1]["content"] += "\n\n" + text
+        else:
+            messages.append({"role": role, "content": text})
+    return messages
+
+
+class OpenAICompatibleLlm(BaseLlm):
+    """BaseLlm for an OpenAI-compatible /chat/completions endpoint with a pooled keep-alive client."""
+
+    model: str = "default"
+    base_url: str = DEFAULT_BASE_URL
+    api_key: Optional[str] = None
+    timeout: float = 120.0
+    max_connections: int = 64
+    max_keepalive: int = 32
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    json_mode: bool = False  # send response_format={"type": "json_object"} (not every server supports it)
+
+    _clients: Dict[int, Any] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def from_env(cls, model: Optional[str] = None, **kwargs: Any) -> "OpenAICompatibleLlm":
+        """Settings from OPENAI_BASE_URL, OPENAI_API_KEY and OPENAI_MODEL; arguments take precedence."""
+        return cls(
+            model=model or os.environ.get("OPENAI_MODEL", "default"),
+            base_url=kwargs.pop("base_url", None) or os.environ.get("OPENAI_BASE_URL", DEFAULT_BASE_URL),
+            api_key=kwargs.pop("api_key", None) or os.environ.get("OPENAI_API_KEY"),
+            **kwargs,
+        )
+
+    def _client(self) -> httpx.AsyncClient:
+        # httpx clients are bound to the loop they first ran on; keep one per live loop.
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(id(loop))
+        if entry is None or entry[0] is not loop:
+            for key, (other, _client) in list(self._clients.items()):
+                if other.is_closed():
+                    del self._clients[key]
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            client = httpx.AsyncClient(
+                base_url=self.base_url.rstrip("/"),
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive),
+            )
+            entry = (loop, client)
+            self._clients[id(loop)] = entry
+        return entry[1]
+
+    async def aclose(self) -> None:
+        """Close the client of the running loop."""
+        entry = self._clients.pop(id(asyncio.get_running_loop()), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    def _payload(self, llm_request: LlmRequest) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"model": self.model, "messages": to_messages(llm_request)}
+        config = getattr(llm_request, "config", None)
+        temperature = getattr(config, "temperature", None)
+        temperature = self.temperature if temperature is None else temperature
+        if temperature is not None:
+            payload["temperature"] = temperature
+        max_tokens = getattr(config, "max_output_tokens", None) or self.max_tokens
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        if self.json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        response = await self._client().post("/chat/completions", json=self._payload(llm_request))
+        if response.status_code != 200:
+            raise OpenAIHTTPError(response.status_code, response.text[:500])
+        body = response.json()
+        choice = (body.get("choices") or [{}])[0]
+        text = (choice.get("message") or {}).get("content") or ""
+        usage = body.get("usage") or {}
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=usage.get("prompt_tokens"),
+                candidates_token_count=usage.get("completion_tokens"),
+                total_token_count=usage.get("total_tokens"),
+            ),
+        )
@@ -0,0 +1,241 @@
+"""
+On-demand profiling of the Python side of the pipeline (prompt building,
+event handling, output parsing, predictive models, training).
+
+profile(name) wraps a block; profiled(name) decorates a function. run(),
+get_predictive_scores() and each model in train_predictive_models.py are
+wrapped. Nothing is collected unless profiling is enabled, in code with
+configure(...) or with environment variables:
+
+    FACTUALITY_PROFILE=cprofile,tracemalloc   any of cprofile, tracemalloc, sample
+    FACTUALITY_PROFILE_EVERY=20               profile every 20th call per name (default 1)
+    FACTUALITY_PROFILE_DIR=logs/profiles      output directory (default)
+    FACTUALITY_PROFILE_INTERVAL_MS=5          stack sampling interval (default 5)
+
+Each profiled call writes files named <name>-<UTC time>-<pid>-<call n>:
+    .prof          cProfile stats (pstats, snakeviz)
+    .folded        sampled stacks in folded format (flamegraph.pl, speedscope)
+    .txt           summary: top functions by cumulative and own time, top
+                   sampled frames, and top allocation sites (tracemalloc)
+
+cProfile and the sampler see the whole thread, so in async code they include
+other tasks running during the profiled call. Only one profile is collected at
+a time per process; calls that overlap an active profile run unprofiled.
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, TypeVar
+
+MODES = ("cprofile", "tracemalloc", "sample")
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "logs" / "profiles"
+TOP_N = 25
+
+F = TypeVar("F", bound=Callable)
+
+
+class _Settings:
+    def __init__(self):
+        self.modes: List[str] = []
+        self.every = 1
+        self.out_dir = DEFAULT_DIR
+        self.interval = 0.005
+
+
+_SETTINGS = _Settings()
+_calls: Counter = Counter()
+_lock = threading.Lock()
+_active = False
+
+
+def configure(
+    modes: Optional[Sequence[str]] = None,
+    every: int = 1,
+    out_dir: Optional[Path] = None,
+    interval_ms: float = 5.0,
+) -> None:
+    """Enable the given modes (None or empty disables profiling)."""
+    modes = [m.strip() for m in (modes or []) if m and m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        raise ValueError(f"unknown profile mode(s) {unknown}; choose from {MODES}")
+    _SETTINGS.modes = modes
+    _SETTINGS.every = max(1, int(every))
+    _SETTINGS.out_dir = Path(out_dir) if out_dir else DEFAULT_DIR
+    _SETTINGS.interval = max(0.0005, interval_ms / 1000.0)
+
+
+def configure_from_env() -> None:
+    modes = os.environ.get("FACTUALITY_PROFILE", "")
+    if not modes:
+        return
+    configure(
+        modes.split(","),
+        every=int(os.environ.get("FACTUALITY_PROFILE_EVERY", "1")),
+        out_dir=os.environ.get("FACTUALITY_PROFILE_DIR") or None,
+        interval_ms=float(os.environ.get("FACTUALITY_PROFILE_INTERVAL_MS", "5")),
+    )
+
+
+def enabled() -> bool:
+    return bool(_SETTINGS.modes)
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a background thread; counts folded stacks."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def top_frames(self, n: int = TOP_N) -> List[tuple]:
+        """(frame, own samples) for the innermost frames seen most often."""
+        own: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        return own.most_common(n)
+
+
+def _stats_text(profiler: cProfile.Profile) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out).strip_dirs()
+    out.write("== cProfile: top functions by cumulative time ==\n")
+    stats.sort_stats("cumulative").print_stats(TOP_N)
+    out.write("== cProfile: top functions by own time ==\n")
+    stats.sort_stats("tottime").print_stats(TOP_N)
+    return out.getvalue()
+
+
+def _alloc_text(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> str:
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    lines = ["== tracemalloc: top allocation sites (net growth during the call) =="]
+    lines += [str(stat) for stat in diff[:TOP_N]]
+    current, peak = tracemalloc.get_traced_memory()
+    lines.append(f"traced memory: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB")
+    return "\n".join(lines) + "\n"
+
+
+def _should_profile(name: str) -> bool:
+    global _active
+    with _lock:
+        _calls[name] += 1
+        if _active or (_calls[name] - 1) % _SETTINGS.every:
+            return False
+        _active = True
+        return True
+
+
+@contextmanager
+def profile(name: str, modes: Optional[Sequence[str]] = None) -> Iterator[Optional[Path]]:
+    """
+    Profile the block with the configured modes (or `modes`). Yields the path
+    stem the outputs are written to, or None when this call is not profiled.
+    """
+    global _active
+    modes = list(modes) if modes is not None else _SETTINGS.modes
+    if not modes or not _should_profile(name):
+        yield None
+        return
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    stem = _SETTINGS.out_dir / f"{name}-{stamp}-{os.getpid()}-{_calls[name]}"
+    profiler = cProfile.Profile() if "cprofile" in modes else None
+    sampler = StackSampler(threading.get_ident(), _SETTINGS.interval) if "sample" in modes else None
+    started_tracemalloc = False
+    snapshot = None
+    if "tracemalloc" in modes:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            started_tracemalloc = True
+        snapshot = tracemalloc.take_snapshot()
+    if sampler is not None:
+        sampler.start()
+    t0 = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield stem
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - t0
+        if sampler is not None:
+            sampler.stop()
+        parts = [f"{name}: {elapsed:.3f}s wall, modes {','.join(modes)}\n"]
+        try:
+            stem.parent.mkdir(parents=True, exist_ok=True)
+            if profiler is not None:
+                profiler.dump_stats(str(stem.with_suffix(".prof")))
+                parts.append(_stats_text(profiler))
+            if sampler is not None:
+                stem.with_suffix(".folded").write_text(sampler.folded(), encoding="utf-8")
+                parts.append(f"== stack samples: {sampler.samples} every {_SETTINGS.interval * 1000:.1f} ms, top frames ==")
+                parts += [f"{count:>8}  {frame}" for frame, count in sampler.top_frames()]
+                parts.append("")
+            if snapshot is not None:
+                parts.append(_alloc_text(snapshot, tracemalloc.take_snapshot()))
+            stem.with_suffix(".txt").write_text("\n".join(parts), encoding="utf-8")
+        except OSError:
+            pass
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+            with _lock:
+                _active = False
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorator form of profile() for synchronous functions."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _SETTINGS.modes:
+                return fn(*args, **kwargs)
+            with profile(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+configure_from_env()
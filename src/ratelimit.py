@@ -0,0 +1,195 @@
+"""
+Host-wide LLM rate limiting shared by every process on the machine.
+
+One article fans out to seven model calls (six factor agents and the
+combiner), so a few worker processes can exceed per-minute request and token
+quotas and trigger retry storms. RateLimiter keeps two token buckets,
+requests per minute and tokens per minute, in a small SQLite database;
+every acquire refills and debits them inside a BEGIN IMMEDIATE transaction,
+so all processes using the same file share one quota. Callers that do not
+fit wait for the time the buckets need to refill instead of sending the call
+and retrying.
+
+Token cost is estimated before the call (prompt characters / 4 plus an
+output budget) and corrected afterwards from the response's usage metadata;
+a call that fails gets its estimate refunded. ADK releases without
+on_model_error_callback never report failures, so reservations older than
+`stale_after` seconds are dropped as well.
+Attach it to an app with create_app(pattern, model_hooks=[RateLimiter(...)]).
+"""
+
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.llm_text import content_text
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "ratelimit.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    requests REAL NOT NULL,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+def estimate_tokens(llm_request: Any, output_tokens: int = 512) -> int:
+    """Rough token cost of a model call: prompt characters / 4 plus the expected output."""
+    config = getattr(llm_request, "config", None)
+    chars = len(content_text(getattr(config, "system_instruction", None)))
+    chars += sum(len(content_text(c)) for c in getattr(llm_request, "contents", None) or [])
+    return chars // 4 + output_tokens
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets in a shared SQLite file.
+    `tpm=None` limits requests only. Buckets start full (one minute of burst).
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        tpm: Optional[float] = None,
+        path: Path = DEFAULT_PATH,
+        name: str = "gemini",
+        output_tokens: int = 512,
+        stale_after: float = 600.0,
+    ):
+        if rpm <= 0 or (tpm is not None and tpm <= 0):
+            raise ValueError("rpm and tpm must be positive")
+        self.rpm = float(rpm)
+        self.tpm = float(tpm) if tpm is not None else None
+        self.name = name
+        self.output_tokens = output_tokens
+        self.stale_after = stale_after
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # (invocation id, agent name) -> (estimated tokens, monotonic time reserved)
+        self._estimates: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self.granted = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float) -> Tuple[float, float]:
+        row = self._conn.execute(
+            "SELECT requests, tokens, updated FROM buckets WHERE name = ?", (self.name,)
+        ).fetchone()
+        tpm = self.tpm or 0.0
+        if row is None:
+            return self.rpm, tpm
+        requests, tokens, updated = row
+        elapsed = max(0.0, now - updated)
+        requests = min(self.rpm, requests + elapsed * self.rpm / 60.0)
+        tokens = min(tpm, tokens + elapsed * tpm / 60.0)
+        return requests, tokens
+
+    def _store(self, requests: float, tokens: float, now: float) -> None:
+        self._conn.execute(
+            "INSERT INTO buckets (name, requests, tokens, updated) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET requests = excluded.requests, tokens = excluded.tokens,"
+            " updated = excluded.updated",
+            (self.name, requests, tokens, now),
+        )
+
+    def try_acquire(self, tokens: int = 0) -> float:
+        """Take one request and `tokens` if both fit; returns 0.0, else the seconds to wait before retrying."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                requests, available = self._refill(now)
+                # A call larger than the whole minute budget goes through once the bucket is full.
+                need = min(tokens, self.tpm) if self.tpm else 0
+                wait = 0.0
+                if requests < 1.0:
+                    wait = (1.0 - requests) * 60.0 / self.rpm
+                if self.tpm and available < need:
+                    wait = max(wait, (need - available) * 60.0 / self.tpm)
+                if wait == 0.0:
+                    requests -= 1.0
+                    available -= tokens if self.tpm else 0
+                self._store(requests, available, now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Refund (or charge) the difference between the estimated and actual token count."""
+        if not self.tpm or actual == estimated:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                requests, available = self._refill(now)
+                self._store(requests, min(self.tpm, available + estimated - actual), now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait until the call fits in both buckets; returns the seconds spent waiting."""
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        while True:
+            wait = await loop.run_in_executor(None, self.try_acquire, tokens)
+            if wait == 0.0:
+                waited = time.monotonic() - start
+                self.granted += 1
+                self.waited_seconds += waited
+                return waited
+            # Jitter so processes that were refused together do not retry together.
+            await asyncio.sleep(min(wait, 5.0) * random.uniform(1.0, 1.2))
+
+    # -- ADK model callbacks (see create_app(model_hooks=...)) ----------------
+
+    @staticmethod
+    def _key(callback_context: Any) -> Tuple[str, str]:
+        return (getattr(callback_context, "invocation_id", ""), getattr(callback_context, "agent_name", ""))
+
+    async def before_model(self, callback_context: Any, llm_request: Any) -> None:
+        estimate = estimate_tokens(llm_request, self.output_tokens)
+        await self.acquire(estimate)
+        now = time.monotonic()
+        for key, (_estimate, reserved) in list(self._estimates.items()):
+            if now - reserved > self.stale_after:
+                self._estimates.pop(key, None)
+        self._estimates[self._key(callback_context)] = (estimate, now)
+        return None
+
+    def after_model(self, callback_context: Any, llm_response: Any) -> None:
+        entry = self._estimates.pop(self._key(callback_context), None)
+        usage = getattr(llm_response, "usage_metadata", None)
+        actual = getattr(usage, "total_token_count", None)
+        if entry is not None and actual:
+            self.settle(entry[0], int(actual))
+        return None
+
+    def on_model_error(self, callback_context: Any, llm_request: Any, error: BaseException) -> None:
+        """The call failed before a response: release its reservation and refund the estimate."""
+        entry = self._estimates.pop(self._key(callback_context), None)
+        if entry is not None:
+            self.settle(entry[0], 0)
+        return None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "granted": self.granted,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
@@ -0,0 +1,127 @@
+"""
+Versioned registry for predictive model artifacts under data/models/.
+
+Layout:
+
+    data/models/versions/<version>/<factor>.joblib
+    data/models/versions/<version>/manifest.json
+    data/models/CURRENT            (name of the promoted version)
+
+A version is staged in a hidden directory, gets its manifest, and is renamed
+into versions/ in one step, so a version directory is always complete.
+Promotion rewrites CURRENT via os.replace, so readers see either the old or
+the new pointer, never a partial one. Without CURRENT, the flat legacy layout
+(data/models/<factor>.joblib) is used.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+POINTER = "CURRENT"
+MANIFEST = "manifest.json"
+VERSIONS = "versions"
+
+
+def versions_dir(models_dir: Path) -> Path:
+    return Path(models_dir) / VERSIONS
+
+
+def current_version(models_dir: Path) -> Optional[str]:
+    """Name of the promoted version, or None when the registry is not in use."""
+    try:
+        version = (Path(models_dir) / POINTER).read_text().strip()
+    except OSError:
+        return None
+    return version or None
+
+
+def resolve_dir(models_dir: Path) -> Path:
+    """Directory holding the active artifacts: the promoted version, else models_dir itself."""
+    version = current_version(models_dir)
+    if version is not None and (versions_dir(models_dir) / version).is_dir():
+        return versions_dir(models_dir) / version
+    return Path(models_dir)
+
+
+def read_manifest(version_dir: Path) -> Dict[str, Any]:
+    try:
+        return json.loads((Path(version_dir) / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def list_versions(models_dir: Path) -> List[Dict[str, Any]]:
+    """Manifests of all committed versions, oldest first, with "current" marked."""
+    root = versions_dir(models_dir)
+    if not root.is_dir():
+        return []
+    active = current_version(models_dir)
+    out = []
+    for path in (p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")):
+        manifest = read_manifest(path)
+        manifest.setdefault("version", path.name)
+        manifest["current"] = path.name == active
+        out.append(manifest)
+    return sorted(out, key=lambda m: (m.get("created_at", ""), m["version"]))
+
+
+def stage(models_dir: Path) -> Path:
+    """Create an empty hidden staging directory for a new version."""
+    root = versions_dir(models_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(prefix=".staging-", dir=root))
+
+
+def commit(
+    models_dir: Path,
+    staging_dir: Path,
+    artifacts: Dict[str, Dict[str, Any]],
+    carry_over: bool = True,
+) -> str:
+    """
+    Write the manifest and move a staged directory into versions/<version>.
+
+    `artifacts` maps factor -> manifest entry (file, input, data_sha256,
+    metrics, sklearn_version, size_bytes, load_seconds). With carry_over,
+    factors present in the current version but not retrained are linked into
+    the new version with their old entries, so every version is complete.
+    Returns the new version name; the version is not promoted.
+    """
+    staging_dir = Path(staging_dir)
+    artifacts = dict(artifacts)
+    if carry_over:
+        active = resolve_dir(models_dir)
+        previous = read_manifest(active).get("artifacts", {})
+        for path in sorted(active.glob("*.joblib")):
+            factor = path.stem
+            if factor in artifacts or (staging_dir / path.name).exists():
+                continue
+            try:
+                os.link(path, staging_dir / path.name)
+            except OSError:
+                shutil.copy2(path, staging_dir / path.name)
+            artifacts[factor] = {**previous.get(factor, {"file": path.name}), "carried_over": True}
+    created = datetime.now(timezone.utc)
+    version = f"{created.strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:6]}"
+    manifest = {"version": version, "created_at": created.isoformat(), "artifacts": artifacts}
+    (staging_dir / MANIFEST).write_text(json.dumps(manifest, indent=2, default=str))
+    os.chmod(staging_dir, 0o755)  # mkdtemp creates it private
+    os.replace(staging_dir, versions_dir(models_dir) / version)
+    return version
+
+
+def promote(models_dir: Path, version: str) -> None:
+    """Atomically point CURRENT at `version`."""
+    target = versions_dir(models_dir) / version
+    if not target.is_dir():
+        raise ValueError(f"Unknown model version {version!r}")
+    pointer = Path(models_dir) / POINTER
+    tmp = pointer.with_name(f".{POINTER}.{os.getpid()}.tmp")
+    tmp.write_text(version + "\n")
+    os.replace(tmp, pointer)
@@ -2,23 +2,31 @@
 Run the pipeline: session → Runner → run → return state.
 """
 
+import hashlib
 import json
 import logging
+import os
 import re
+import tempfile
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from google.adk.apps import App
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai.types import Content, Part
 
-from src.app import FACTUALITY_FACTORS, app
+from src import profiling, tracing
+from src.app import FACTUALITY_FACTORS, app, app_factors, factor_subset_app
+from src.evidence import select_evidence
 
 _LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
 _LOG_DIR.mkdir(exist_ok=True)
+# Text of every logged run, one file per article_hash, so run logs can be joined back to what was scored.
+ARTICLE_STORE = _LOG_DIR / "articles"
 
 logger = logging.getLogger("factuality")
 if not logger.handlers:
@@ -33,7 +41,15 @@ def build_prompt(
     article_content: str,
     article_url: str = "",
     predictive_scores: Optional[Dict[str, Any]] = None,
+    evidence: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    factors: Optional[List[Tuple[str, str, str]]] = None,
 ) -> str:
+    """
+    User message for the factor agents. With `evidence` (from
+    src.evidence.select_evidence), the top sentences per factor replace the
+    full article body, which keeps the prompt short for long articles;
+    `factors` (FACTUALITY_FACTORS entries) limits the evidence to those factors.
+    """
     scores_block = ""
     if predictive_scores:
         pa = predictive_scores.get("pa_proba")
@@ -67,22 +83,47 @@ PREDICTIVE MODEL PROBABILITY VECTORS (for reference only):
             fmt(t, ["Non-toxic", "Toxic"]),
         )
 
+    if evidence is not None:
+        lines = ["Evidence (most relevant sentences per factor; full body omitted):"]
+        for name, key, _output_key in factors or FACTUALITY_FACTORS:
+            lines.append(f"[{name}]")
+            lines.extend(f"- {item['sentence']}" for item in evidence.get(key, []))
+        content_block = "\n".join(lines)
+    else:
+        content_block = f"Content: {article_content}"
+
     return f"""ARTICLE TO ANALYZE:
 Title: {article_title}
 URL: {article_url or "Not provided"}
-Content: {article_content}
+{content_block}
 {scores_block}
 
 Analyze this article according to your factuality factor and provide your evaluation."""
 
 
+def article_hash(article_title: str, article_content: str) -> str:
+    """Stable content hash identifying an article across runs and datasets.
+
+    Logged with every run so offline tools can join run logs to labeled data
+    without relying on truncated titles.
+    """
+    h = hashlib.sha256()
+    h.update((article_title or "").encode("utf-8"))
+    h.update(b"\x00")
+    h.update((article_content or "").encode("utf-8"))
+    return h.hexdigest()[:32]
+
+
 def _sanitize_json_string(s: str) -> str:
     """Replace unescaped control characters (e.g. raw newlines in strings) so json.loads does not fail."""
     return "".join(c if ord(c) >= 32 else " " for c in s)
 
 
 def _parse_json(text: str) -> Dict[str, Any]:
-    """Parse JSON from agent output. On failure, try to extract score/explanation or combined fields."""
+    """
+    Parse JSON from agent output. On failure, try to extract score/explanation or combined fields.
+    Which path succeeded is recorded on the current trace span as parse_path.
+    """
     t = text.strip()
     if "```json" in t:
         start = t.find("```json") + 7
@@ -100,14 +141,18 @@ def _parse_json(text: str) -> Dict[str, Any]:
             t = t[i : j + 1]
     t = _sanitize_json_string(t)
     try:
-        return json.loads(t)
+        parsed = json.loads(t)
+        tracing.annotate(parse_path="json")
+        return parsed
     except json.JSONDecodeError:
         pass
     # Repair attempt: newlines inside string values often break JSON; replace \r\n and \n with space
     # (only when they appear between quotes that look like a value, not after \)
     t_repaired = re.sub(r'(?<!\\)\n|\r\n?', " ", t)
     try:
-        return json.loads(t_repaired)
+        parsed = json.loads(t_repaired)
+        tracing.annotate(parse_path="repaired")
+        return parsed
     except json.JSONDecodeError:
         pass
     # Fallback: try to extract factor-style {"score": N, "explanation": "..."}
@@ -116,6 +161,7 @@ def _parse_json(text: str) -> Dict[str, Any]:
         score = int(float(m.group(1)))
         ex_m = re.search(r'"explanation"\s*:\s*"(.*?)"\s*[,}]', t, re.DOTALL)
         explanation = (ex_m.group(1).replace("\\n", "\n").replace('\\"', '"') if ex_m else "")
+        tracing.annotate(parse_path="regex_factor")
         return {"score": score, "explanation": explanation}
     # Fallback: try combiner-style {"combined_veracity_score": N, "overall_assessment": "..."}
     m = re.search(r'"combined_veracity_score"\s*:\s*(\d+(?:\.\d*)?)', t)
@@ -123,85 +169,195 @@ def _parse_json(text: str) -> Dict[str, Any]:
         score = int(float(m.group(1)))
         ex_m = re.search(r'"overall_assessment"\s*:\s*"(.*?)"\s*[,}]', t, re.DOTALL)
         overall = (ex_m.group(1).replace("\\n", "\n").replace('\\"', '"') if ex_m else "")
+        tracing.annotate(parse_path="regex_combined")
         return {"combined_veracity_score": score, "overall_assessment": overall}
+    tracing.annotate(parse_path="failed")
     return {}
 
 
-async def run(
+def _parse_factor(raw: Any) -> Dict[str, Any]:
+    """Parse one factor agent output into {"score", "explanation"}."""
+    if isinstance(raw, str) and raw.strip():
+        parsed = _parse_json(raw)
+        return {"score": parsed.get("score"), "explanation": parsed.get("explanation", "")}
+    return {"score": None, "explanation": ""}
+
+
+def _parse_combined(raw: Any) -> Dict[str, Any]:
+    """Parse the combiner output into {"combined_veracity_score", "overall_assessment"}."""
+    if isinstance(raw, str) and raw.strip():
+        parsed = _parse_json(raw)
+        return {
+            "combined_veracity_score": parsed.get("combined_veracity_score"),
+            "overall_assessment": parsed.get("overall_assessment", ""),
+        }
+    return {"combined_veracity_score": None, "overall_assessment": ""}
+
+
+# id(app) -> (app, Runner, InMemorySessionService), least recently used first. A
+# Runner holds no per-run state, so one per app is shared by all runs; sessions
+# are deleted when done. Scripts that build an app per article would otherwise
+# keep every app alive, so only the _MAX_RUNNERS most recent are kept (an
+# evicted app just gets a new Runner on its next run).
+_RUNNERS: "OrderedDict[int, Tuple[App, Runner, InMemorySessionService]]" = OrderedDict()
+_MAX_RUNNERS = 32
+
+
+def _get_runner(app_instance: App) -> Tuple[Runner, InMemorySessionService]:
+    key = id(app_instance)
+    entry = _RUNNERS.get(key)
+    if entry is None or entry[0] is not app_instance:
+        session_service = InMemorySessionService()
+        entry = (app_instance, Runner(app=app_instance, session_service=session_service), session_service)
+        _RUNNERS[key] = entry
+        while len(_RUNNERS) > _MAX_RUNNERS:
+            _RUNNERS.popitem(last=False)
+    _RUNNERS.move_to_end(key)
+    return entry[1], entry[2]
+
+
+async def run_stream(
     article_title: str,
     article_content: str,
     article_url: str = "",
     predictive_scores: Optional[Dict[str, Any]] = None,
     app_instance: Optional[App] = None,
-) -> Dict[str, Any]:
+    evidence_k: Optional[int] = None,
+    factors: Optional[List[str]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Run the factuality pipeline. Returns factor_scores, explanations, combined_veracity_score, overall_assessment.
+    Run the factuality pipeline and yield results as they become available.
+
+    Yields {"type": "factor", "key", "score", "explanation", "elapsed_seconds"}
+    as each factor agent writes its output_key, then {"type": "combined", ...}
+    when the combiner finishes, and finally {"type": "result", ...} with the
+    same payload run() returns. elapsed_seconds is measured from the start of
+    the run, so it is each agent's completion latency.
+
+    With evidence_k, the prompt carries the top evidence_k sentences per
+    factor instead of the full body (falls back to the full body if no
+    sentence scorer has been trained).
+
+    With factors (e.g. ["toxicity", "clickbait"]), only those factor agents
+    run, on a cached copy of the app (src.app.factor_subset_app), and the
+    result holds only their scores.
     """
     t_start = datetime.now(timezone.utc)
     app_to_use = app_instance or app
-    session_service = InMemorySessionService()
-    runner = Runner(app=app_to_use, session_service=session_service)
+    if factors is not None:
+        app_to_use = factor_subset_app(app_to_use, factors)
+    selected = app_factors(app_to_use)
     app_name = app_to_use.name
     user_id = "eval_user"
     session_id = str(uuid.uuid4())
+    h = article_hash(article_title, article_content)
     logger.info("run  session=%s  app=%s  title=%r", session_id, app_name, article_title[:80])
 
-    await session_service.create_session(
-        app_name=app_name,
-        user_id=user_id,
-        session_id=session_id,
-    )
-    prompt = build_prompt(
-        article_title=article_title,
-        article_content=article_content,
-        article_url=article_url,
-        predictive_scores=predictive_scores,
-    )
-    user_message = Content(parts=[Part(text=prompt)])
-
-    async for _ in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=user_message,
-    ):
-        pass
+    with tracing.span("run", app=app_name, session_id=session_id, article_hash=h, chars=len(article_content or "")):
+        with tracing.span("session_setup"):
+            runner, session_service = _get_runner(app_to_use)
+            await session_service.create_session(
+                app_name=app_name,
+                user_id=user_id,
+                session_id=session_id,
+            )
+        # The session service is cached with the runner for the life of the app,
+        # so the session is dropped even when the run fails, times out or the
+        # consumer stops iterating.
+        try:
+            evidence = None
+            if evidence_k:
+                with tracing.span("select_evidence", k=evidence_k) as s:
+                    evidence = select_evidence(article_content, k=evidence_k)
+                    if s is not None:
+                        s.set(found=evidence is not None)
+                if evidence is None:
+                    logger.warning("no sentence scorer found; sending the full article body")
+            with tracing.span("build_prompt") as s:
+                prompt = build_prompt(
+                    article_title=article_title,
+                    article_content=article_content,
+                    article_url=article_url,
+                    predictive_scores=predictive_scores,
+                    evidence=evidence,
+                    factors=selected,
+                )
+                if s is not None:
+                    s.set(prompt_chars=len(prompt))
+            user_message = Content(parts=[Part(text=prompt)])
+
+            factor_keys = {output_key for _name, _key, output_key in selected}
+            # output_key -> (raw, parsed), so the final pass does not re-parse streamed outputs.
+            parsed_outputs: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+            async for event in runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=user_message,
+            ):
+                actions = getattr(event, "actions", None)
+                delta = getattr(actions, "state_delta", None) or {}
+                for key, raw in delta.items():
+                    if key in parsed_outputs:
+                        continue
+                    elapsed = (datetime.now(timezone.utc) - t_start).total_seconds()
+                    if key in factor_keys:
+                        with tracing.span("parse", key=key):
+                            parsed = _parse_factor(raw)
+                        parsed_outputs[key] = (raw, parsed)
+                        yield {"type": "factor", "key": key, **parsed, "elapsed_seconds": elapsed}
+                    elif key == "combined_prediction":
+                        with tracing.span("parse", key=key):
+                            parsed = _parse_combined(raw)
+                        parsed_outputs[key] = (raw, parsed)
+                        yield {"type": "combined", **parsed, "elapsed_seconds": elapsed}
+
+            session = await session_service.get_session(
+                app_name=app_name,
+                user_id=user_id,
+                session_id=session_id,
+            )
+            state = dict(session.state or {})
+        finally:
+            await session_service.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
 
-    session = await session_service.get_session(
-        app_name=app_name,
-        user_id=user_id,
-        session_id=session_id,
-    )
-    state = session.state or {}
-
-    factor_scores = {}
-    explanations = {}
-    for _name, _key, output_key in FACTUALITY_FACTORS:
-        raw = state.get(output_key)
-        if isinstance(raw, str) and raw.strip():
-            parsed = _parse_json(raw)
-            factor_scores[output_key] = parsed.get("score")
-            explanations[output_key] = parsed.get("explanation", "")
-        else:
-            factor_scores[output_key] = None
-            explanations[output_key] = ""
-
-    combined_raw = state.get("combined_prediction")
-    combined_veracity_score = None
-    overall_assessment = ""
-    if isinstance(combined_raw, str) and combined_raw.strip():
-        parsed = _parse_json(combined_raw)
-        combined_veracity_score = parsed.get("combined_veracity_score")
-        overall_assessment = parsed.get("overall_assessment", "")
-
-    elapsed = (datetime.now(timezone.utc) - t_start).total_seconds()
-    logger.info(
-        "done session=%s  elapsed=%.1fs  combined_score=%s  factors=%s",
-        session_id, elapsed, combined_veracity_score, factor_scores,
-    )
-
-    _log_jsonl(session_id, app_name, article_title, factor_scores, combined_veracity_score, elapsed)
-
-    return {
+        def _final(key: str, parse):
+            raw = state.get(key)
+            cached = parsed_outputs.get(key)
+            if cached is not None and cached[0] == raw:
+                return cached[1]
+            with tracing.span("parse", key=key):
+                return parse(raw)
+
+        factor_scores = {}
+        explanations = {}
+        for _name, _key, output_key in selected:
+            parsed = _final(output_key, _parse_factor)
+            factor_scores[output_key] = parsed["score"]
+            explanations[output_key] = parsed["explanation"]
+
+        combined = _final("combined_prediction", _parse_combined)
+        combined_veracity_score = combined["combined_veracity_score"]
+        overall_assessment = combined["overall_assessment"]
+
+        elapsed = (datetime.now(timezone.utc) - t_start).total_seconds()
+        logger.info(
+            "done session=%s  elapsed=%.1fs  combined_score=%s  factors=%s",
+            session_id, elapsed, combined_veracity_score, factor_scores,
+        )
+
+        _log_jsonl(
+            session_id,
+            app_name,
+            article_title,
+            factor_scores,
+            combined_veracity_score,
+            elapsed,
+            article_hash=h,
+        )
+        _store_article(h, article_title, article_content, article_url)
+
+    yield {
+        "type": "result",
         "factor_scores": factor_scores,
         "explanations": explanations,
         "combined_veracity_score": combined_veracity_score,
@@ -209,6 +365,35 @@ async def run(
     }
 
 
+async def run(
+    article_title: str,
+    article_content: str,
+    article_url: str = "",
+    predictive_scores: Optional[Dict[str, Any]] = None,
+    app_instance: Optional[App] = None,
+    evidence_k: Optional[int] = None,
+    factors: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the factuality pipeline. Returns factor_scores, explanations, combined_veracity_score, overall_assessment.
+    With factors, only those factor agents run (see run_stream).
+    """
+    result: Dict[str, Any] = {}
+    with profiling.profile("run"):
+        async for item in run_stream(
+            article_title=article_title,
+            article_content=article_content,
+            article_url=article_url,
+            predictive_scores=predictive_scores,
+            app_instance=app_instance,
+            evidence_k=evidence_k,
+            factors=factors,
+        ):
+            if item["type"] == "result":
+                result = {k: v for k, v in item.items() if k != "type"}
+    return result
+
+
 def _log_jsonl(
     session_id: str,
     app_name: str,
@@ -216,6 +401,7 @@ def _log_jsonl(
     factor_scores: dict,
     combined: Any,
     elapsed: float,
+    article_hash: Optional[str] = None,
 ) -> None:
     """Append a structured JSON-lines record for each pipeline run."""
     record = {
@@ -223,6 +409,7 @@ def _log_jsonl(
         "session_id": session_id,
         "app": app_name,
         "article_title": title[:120],
+        "article_hash": article_hash,
         "factor_scores": factor_scores,
         "combined_veracity_score": combined,
         "elapsed_seconds": round(elapsed, 2),
@@ -232,3 +419,31 @@ def _log_jsonl(
             f.write(json.dumps(record) + "\n")
     except OSError:
         logger.warning("Could not write to experiments.jsonl")
+
+
+def _store_article(h: str, title: str, body: str, url: str = "") -> None:
+    """Write the scored text to ARTICLE_STORE/<h[:2]>/<h>.json once per hash."""
+    path = ARTICLE_STORE / h[:2] / f"{h}.json"
+    if path.exists():
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".article-", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"url": url or "", "title": title or "", "body_text": body or ""}, f)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    except OSError:
+        logger.warning("Could not store article %s", h)
+
+
+def logged_article(h: str, store: Optional[Path] = None) -> Optional[Dict[str, str]]:
+    """{"url", "title", "body_text"} a logged run scored under article_hash `h`, or None if not stored."""
+    try:
+        with open(Path(store or ARTICLE_STORE) / h[:2] / f"{h}.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,342 @@
+"""
+Microbenchmarks for the predictive model artifacts on the request path (src/models.py).
+Run from project root: python src/scripts/bench_models.py [--sizes 500 2000 8000 32000] [--check]
+
+Per artifact:
+  load_s        joblib.load in a fresh interpreter (sklearn already imported), best of --load-repeat
+  rss_mb        resident memory added by loading it
+  size_mb       artifact file size
+  vocab_terms / vocab_mb / stop_words_mb
+                TF-IDF vocabulary size and approximate in-memory size, and the size of
+                the pruned-terms set (stop_words_) sklearn keeps only for introspection
+  single_ms     per-article latency through _predict_proba, one call per article
+  batch_ms      per-article latency of one predict_proba call over --batch articles
+for each body size in --sizes (characters; bodies are built from data/articles.csv).
+
+The six factor artifacts are loaded from the current registry version. Any that
+are missing are fitted on corpus text with synthetic labels using the training
+script's TF-IDF + logistic regression configuration (marked "synthetic"), so the
+benchmark runs on a fresh checkout; pass --no-train to skip them instead.
+Each result records its source ("synthetic" or the registry version it was
+loaded from).
+
+Results are written to logs/bench/models-<time>.json. --save-baseline stores them
+as the baseline (logs/bench/models_baseline.json by default; baselines are per
+machine); --check compares against it and exits 1 if any metric is worse than
+the baseline by more than --tolerance (and an absolute noise floor), or if there
+is no baseline. Only artifacts with the same source in both are compared.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+# Project root (src/scripts/ -> src/ -> root)
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+from src import datasets, registry  # noqa: E402
+from src.models import _FACTOR_TO_KEY, _predict_proba, preprocess_text  # noqa: E402
+
+DATA = ROOT / "data"
+MODELS_DIR = DATA / "models"
+OUT_DIR = ROOT / "logs" / "bench"
+DEFAULT_BASELINE = OUT_DIR / "models_baseline.json"
+CORPUS = DATA / "articles.csv"
+
+# Input kind per factor, as in train_predictive_models.CONFIGS.
+INPUT_KINDS = {
+    "clickbait": "title",
+    "sensationalism": "title_content",
+    "title_vs_body": "title_and_body",
+    "sentiment": "title_content",
+    "toxicity": "title_content",
+    "political_affiliation": "title_content",
+}
+# Regressions smaller than these are treated as noise whatever the ratio.
+NOISE_FLOOR = {"_s": 0.005, "_ms": 0.05, "_mb": 1.0}
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return float("nan")
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _cold_load(path: str) -> tuple:
+    """Runs in a fresh spawned process (which has imported this module, so sklearn is loaded): (seconds, MB added)."""
+    before = _rss_mb()
+    t0 = time.perf_counter()
+    artifact = joblib.load(path)
+    seconds = time.perf_counter() - t0
+    rss = _rss_mb() - before
+    del artifact
+    return seconds, rss
+
+
+def _deep_size_mb(mapping) -> float:
+    if not mapping:
+        return 0.0
+    items = mapping.items() if isinstance(mapping, dict) else ((k, None) for k in mapping)
+    total = sys.getsizeof(mapping) + sum(sys.getsizeof(k) + (sys.getsizeof(v) if v is not None else 0) for k, v in items)
+    return total / 1e6
+
+
+def _vectorizer(pipeline):
+    for _name, step in getattr(pipeline, "steps", []):
+        if hasattr(step, "vocabulary_"):
+            return step
+    return None
+
+
+def _corpus_texts() -> list:
+    if CORPUS.exists():
+        table = datasets.load(CORPUS, kind="articles")
+        texts = [(t, b) for t, b in zip(table["title"], table["body_text"]) if b]
+        if texts:
+            return texts
+    words = "the senate vote on the new budget was delayed after officials said".split()
+    rng = np.random.default_rng(0)
+    return [(" ".join(rng.choice(words, 8)), " ".join(rng.choice(words, 400))) for _ in range(50)]
+
+
+def _articles(texts: list, size: int, n: int) -> list:
+    """n (title, body) pairs with bodies of exactly `size` characters, cycling through the corpus."""
+    out = []
+    for i in range(n):
+        title, body = texts[i % len(texts)]
+        j = i
+        while len(body) < size:
+            j += 1
+            body += " " + texts[j % len(texts)][1]
+        out.append((title, body[:size]))
+    return out
+
+
+def _synthetic_artifact(name: str, texts: list) -> dict:
+    """Same pipeline shape as train_predictive_models._make_pipeline, fitted on corpus text with random labels."""
+    docs = [preprocess_text(f"{t} {b}") for t, b in texts]
+    labels = np.arange(len(docs)) % (3 if name == "sentiment" else 2)
+    pipe = Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000)),
+        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
+    ])
+    pipe.fit(docs, labels)
+    return {"pipeline": pipe, "input": INPUT_KINDS[name], "synthetic": True}
+
+
+def _batch_inputs(artifact: dict, articles: list) -> list:
+    kind = artifact.get("input", "title_content")
+    if kind == "title":
+        return [preprocess_text(t) for t, _b in articles]
+    if kind == "title_and_body":
+        return [" TITLE_SEP ".join([preprocess_text(t), preprocess_text(b)]) for t, b in articles]
+    return [preprocess_text(f"{t} {b}") for t, b in articles]
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def bench_artifact(path: Path, artifact: dict, texts: list, sizes, batch: int, repeat: int, load_repeat: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    loads = []
+    for _ in range(load_repeat):
+        with ctx.Pool(1) as pool:
+            loads.append(pool.apply(_cold_load, (str(path),)))
+    pipeline = artifact["pipeline"]
+    vec = _vectorizer(pipeline)
+    result = {
+        "synthetic": bool(artifact.get("synthetic")),
+        "input": artifact.get("input"),
+        "load_s": round(min(s for s, _ in loads), 4),
+        "rss_mb": round(float(np.median([m for _, m in loads])), 2),
+        "size_mb": round(path.stat().st_size / 1e6, 3),
+        "vocab_terms": len(vec.vocabulary_) if vec is not None else None,
+        "vocab_mb": round(_deep_size_mb(vec.vocabulary_), 2) if vec is not None else None,
+        "stop_words_mb": round(_deep_size_mb(getattr(vec, "stop_words_", None)), 2) if vec is not None else None,
+        "single_ms": {},
+        "batch_ms": {},
+    }
+    for size in sizes:
+        articles = _articles(texts, size, batch)
+        X = _batch_inputs(artifact, articles)
+        single = _best(lambda: [_predict_proba(artifact, b, title=t, body=b) for t, b in articles], repeat)
+        batched = _best(lambda: pipeline.predict_proba(X), repeat)
+        result["single_ms"][str(size)] = round(single * 1000 / batch, 3)
+        result["batch_ms"][str(size)] = round(batched * 1000 / batch, 3)
+    return result
+
+
+def _flatten(results: dict, names=None) -> dict:
+    flat = {}
+    for name, r in results.items():
+        if names is not None and name not in names:
+            continue
+        for key in ("load_s", "rss_mb", "size_mb", "vocab_mb"):
+            if r.get(key) is not None:
+                flat[f"{name}.{key}"] = r[key]
+        for key in ("single_ms", "batch_ms"):
+            for size, value in r[key].items():
+                flat[f"{name}.{key}.{size}"] = value
+    return flat
+
+
+def comparable(current: dict, baseline: dict) -> list:
+    """Artifacts present in both reports and built from the same source (synthetic vs. a registry version)."""
+    base = baseline["results"]
+    return [
+        name
+        for name, r in current["results"].items()
+        if name in base and r.get("source") is not None and r.get("source") == base[name].get("source")
+    ]
+
+
+def check_regressions(current: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics worse than baseline * (1 + tolerance) by more than the noise floor: [(metric, baseline, current)].
+
+    Only artifacts with matching sources are compared; timings of a synthetic
+    stand-in say nothing about a trained model and vice versa.
+    """
+    names = set(comparable(current, baseline))
+    base, cur = _flatten(baseline["results"], names), _flatten(current["results"], names)
+    regressions = []
+    for metric, b in base.items():
+        c = cur.get(metric)
+        if c is None or b is None:
+            continue
+        suffix = next((s for s in NOISE_FLOOR if metric.split(".")[1].endswith(s)), None)
+        floor = NOISE_FLOOR.get(suffix, 0.0)
+        if c > b * (1 + tolerance) and c - b > floor:
+            regressions.append((metric, b, c))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark predictive model load time, memory and inference")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000, 32000], help="Body sizes in chars")
+    parser.add_argument("--batch", type=int, default=64, help="Articles per size (default: 64)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats; the best is kept (default: 3)")
+    parser.add_argument("--load-repeat", type=int, default=3, help="Cold loads per artifact (default: 3)")
+    parser.add_argument("--only", action="append", default=None, help="Benchmark only this model (repeatable)")
+    parser.add_argument("--no-train", action="store_true", help="Skip missing artifacts instead of fitting stand-ins")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any metric regressed against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown (default: 0.25)")
+    args = parser.parse_args()
+
+    texts = _corpus_texts()
+    artifact_dir = registry.resolve_dir(MODELS_DIR)
+    version = registry.current_version(MODELS_DIR)
+    if version is not None and artifact_dir != registry.versions_dir(MODELS_DIR) / version:
+        version = None  # dangling pointer; resolve_dir fell back to the flat directory
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in _FACTOR_TO_KEY:
+            if args.only and name not in args.only:
+                continue
+            path = artifact_dir / f"{name}.joblib"
+            if path.exists():
+                artifact = joblib.load(path)
+                source = version or "unversioned"  # flat data/models/ without a registry
+            elif args.no_train:
+                print(f"[SKIP] {name}: {path} not found")
+                continue
+            else:
+                artifact = _synthetic_artifact(name, texts)
+                path = Path(tmp) / f"{name}.joblib"
+                joblib.dump(artifact, path)
+                source = "synthetic"
+                print(f"[INFO] {name}: no trained artifact; fitted a synthetic stand-in")
+            if artifact.get("pipeline") is None:
+                print(f"[SKIP] {name}: artifact has no pipeline")
+                continue
+            results[name] = bench_artifact(
+                path, artifact, texts, args.sizes, args.batch, args.repeat, args.load_repeat
+            )
+            results[name]["source"] = source
+            print(f"[OK] {name}")
+
+    if not results:
+        print("[SKIP] nothing to benchmark")
+        return
+    print(f"\n{'model':<24}{'load s':>8}{'RSS MB':>8}{'vocab':>8}{'vocab MB':>9}{'stop MB':>8}", end="")
+    print("".join(f"{'1x/' + str(s):>11}{'batch/' + str(s):>12}" for s in args.sizes), "  (ms/article)")
+    for name, r in results.items():
+        print(
+            f"{name:<24}{r['load_s']:>8.3f}{r['rss_mb']:>8.1f}{r['vocab_terms'] or 0:>8}"
+            f"{r['vocab_mb'] or 0:>9.1f}{r['stop_words_mb'] or 0:>8.1f}",
+            end="",
+        )
+        print("".join(f"{r['single_ms'][str(s)]:>11.3f}{r['batch_ms'][str(s)]:>12.3f}" for s in args.sizes))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "model_version": version,
+        "env": {
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "params": {"sizes": args.sizes, "batch": args.batch, "repeat": args.repeat},
+        "results": results,
+    }
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    out = OUT_DIR / f"models-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}.json"
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\n[OK] Results -> {out}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"[OK] Baseline -> {args.baseline}")
+    if args.check:
+        if not args.baseline.exists():
+            print(f"[ERR] no baseline at {args.baseline}; run with --save-baseline first")
+            sys.exit(1)
+        baseline = json.loads(args.baseline.read_text())
+        matched = comparable(report, baseline)
+        for name in results:
+            if name not in matched:
+                base_source = baseline["results"].get(name, {}).get("source", "absent")
+                print(f"[SKIP] {name}: source {results[name]['source']} vs baseline {base_source}; not compared")
+        regressions = check_regressions(report, baseline, args.tolerance)
+        for metric, b, c in regressions:
+            print(f"[ERR] {metric}: {b} -> {c} (+{(c / b - 1) * 100 if b else float('inf'):.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"[OK] No regressions beyond {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
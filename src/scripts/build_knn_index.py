@@ -0,0 +1,98 @@
+"""
+Build the kNN scoring index (src/knn.py) over the human-labeled articles.
+Run from project root: python src/scripts/build_knn_index.py [--components 128] [--lists 0] [-k 5]
+
+Prints leave-one-out MAE against the human labels (each article scored from
+its other neighbors) and measured query throughput, then registers a new
+model version containing knn_index.joblib (other artifacts are carried over)
+and promotes it unless --no-promote is given.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import sklearn
+
+# Project root (src/scripts/ -> src/ -> root)
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+from src import datasets, registry  # noqa: E402
+from src.knn import LABEL_TO_OUTPUT_KEY, KNNIndex  # noqa: E402
+
+DATA = ROOT / "data"
+MODELS_DIR = DATA / "models"
+LABELED_CSV = DATA / "articles_labeled_human_scored_v2.csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the kNN factor-score index over human-labeled articles")
+    parser.add_argument("--csv", type=Path, default=LABELED_CSV, help="Labeled articles CSV")
+    parser.add_argument("--components", type=int, default=128, help="TruncatedSVD dimensions (default: 128)")
+    parser.add_argument("--lists", type=int, default=0, help="IVF lists; 0 = brute force (default)")
+    parser.add_argument("-k", type=int, default=5, help="Neighbors per query for the report (default: 5)")
+    parser.add_argument("--no-promote", action="store_true", help="Register the version without promoting it")
+    args = parser.parse_args()
+
+    if not args.csv.exists():
+        print(f"[SKIP] {args.csv} not found")
+        return
+    data = datasets.load(args.csv, kind="articles")
+    label_cols = list(LABEL_TO_OUTPUT_KEY)
+    labels = np.column_stack([
+        np.asarray(data[c], dtype=float) if c in data else np.full(data.n_rows, np.nan) for c in label_cols
+    ])
+    titles, bodies, urls = data["title"].tolist(), data["body_text"].tolist(), data["url"].tolist()
+
+    t0 = time.perf_counter()
+    index = KNNIndex.build(titles, bodies, labels, urls, n_components=args.components, n_lists=args.lists)
+    build_seconds = time.perf_counter() - t0
+    print(
+        f"[OK] Indexed {len(titles)} articles: {index.vectors.shape[1]} dims, "
+        f"{'IVF ' + str(args.lists) + ' lists' if index.centroids is not None else 'brute force'} "
+        f"({build_seconds:.2f}s)"
+    )
+
+    predicted = index.leave_one_out(k=args.k)
+    print(f"\nLeave-one-out vs human labels (k={args.k}):")
+    metrics = {}
+    for j, col in enumerate(label_cols):
+        valid = np.isfinite(predicted[:, j]) & np.isfinite(labels[:, j])
+        mae = float(np.abs(predicted[valid, j] - labels[valid, j]).mean()) if valid.any() else float("nan")
+        baseline = float(np.abs(labels[valid, j] - np.nanmean(labels[:, j])).mean()) if valid.any() else float("nan")
+        metrics[col] = {"mae": round(mae, 3), "mean_baseline_mae": round(baseline, 3), "n": int(valid.sum())}
+        print(f"  {col:<22} MAE {mae:.3f}  (predict-the-mean {baseline:.3f}, n={int(valid.sum())})")
+
+    # Throughput on a batch of corpus articles repeated to 2000 queries.
+    reps = int(np.ceil(2000 / max(len(titles), 1)))
+    q_titles, q_bodies = (titles * reps)[:2000], (bodies * reps)[:2000]
+    t0 = time.perf_counter()
+    index.query(q_titles, q_bodies, k=args.k)
+    elapsed = time.perf_counter() - t0
+    print(f"\nQuery throughput: {len(q_titles) / elapsed:,.0f} articles/s ({elapsed * 1000 / len(q_titles):.3f} ms each)")
+
+    staging = registry.stage(MODELS_DIR)
+    out = staging / "knn_index.joblib"
+    joblib.dump({"index": index, "input": "knn", "kind": "knn"}, out)
+    entry = {
+        "file": out.name,
+        "input": "knn",
+        "kind": "knn",
+        "data": {str(args.csv): datasets.cached_digest(args.csv)},
+        "metrics": {"n_samples": len(titles), "k": args.k, "leave_one_out": metrics},
+        "sklearn_version": sklearn.__version__,
+        "size_bytes": out.stat().st_size,
+    }
+    version = registry.commit(MODELS_DIR, staging, {"knn_index": entry})
+    if args.no_promote:
+        print(f"Registered version {version} (not promoted)")
+    else:
+        registry.promote(MODELS_DIR, version)
+        print(f"Registered and promoted version {version}")
+
+
+if __name__ == "__main__":
+    main()
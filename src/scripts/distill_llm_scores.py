@@ -0,0 +1,263 @@
+"""
+Distill logged LLM factor scores into fast local regressors.
+Run from project root: python src/scripts/distill_llm_scores.py [--pattern cot] [--logs ...] [--corpus ...]
+
+1. Harvest: every run logged to logs/experiments.jsonl (and every finished job
+   in data/jobs.sqlite) carries the article_hash of the text it scored. Hashes
+   are joined back to the text run() stored under logs/articles/, falling
+   back to the corpora (data/articles*.csv by default) for runs logged before
+   that store existed. Repeated runs of one article are collapsed to the
+   median score per factor. The deduplicated dataset is written to
+   data/distill/llm_scores.csv; if no logged run joins, the script exits 1.
+2. Train: one TF-IDF over title + body and a Ridge regressor per factor.
+   Articles in the human-labeled CSV are never trained on, so the human
+   comparison below is on unseen articles.
+3. Report: 5-fold out-of-fold agreement with the LLM, and agreement with the
+   human labels next to the LLM's own agreement on the same articles
+   (data/distill/report.csv).
+4. Package: registered as the "distilled" model artifact (other artifacts are
+   carried over); serve with src.models.get_distilled_scores().
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import KFold
+
+# Project root (src/scripts/ -> src/ -> root)
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+from src import datasets, registry  # noqa: E402
+from src.app import FACTUALITY_FACTORS, PATTERNS  # noqa: E402
+from src.human_eval import FACTOR_MAP, compute_metrics, iter_run_logs  # noqa: E402
+from src.models import preprocess_text  # noqa: E402
+from src.run import ARTICLE_STORE, article_hash, logged_article  # noqa: E402
+
+DATA = ROOT / "data"
+MODELS_DIR = DATA / "models"
+OUT_DIR = DATA / "distill"
+LABELED_CSV = DATA / "articles_labeled_human_scored_v2.csv"
+DEFAULT_LOGS = [ROOT / "logs" / "experiments.jsonl"]
+DEFAULT_CORPORA = [DATA / "articles.csv", DATA / "articles_labeled.csv", LABELED_CSV]
+JOBS_DB = DATA / "jobs.sqlite"
+
+OUTPUT_KEYS = [output_key for _name, _key, output_key in FACTUALITY_FACTORS]
+# The human eval script truncates bodies before calling run(), so its logged hashes are of the prefix.
+TRUNCATIONS = (None, 8000)
+
+
+def _texts_by_hash(corpora) -> dict:
+    """article_hash -> (url, title, body) for every body a run may have scored: full or truncated.
+
+    Each hash maps to exactly the text it was computed from, so a run logged on
+    the 8000-char prefix trains on that prefix, not on the full body.
+    """
+    texts = {}
+    for path in corpora:
+        if not path.exists():
+            continue
+        table = datasets.load(path, kind="articles")
+        for url, title, body in zip(table["url"], table["title"], table["body_text"]):
+            for n in TRUNCATIONS:
+                scored = body[:n] if n else body
+                texts.setdefault(article_hash(title, scored), (url, title, scored))
+    return texts
+
+
+def _add_scores(scores: dict, h: str, factor_scores: dict) -> None:
+    entry = scores.setdefault(h, {key: [] for key in OUTPUT_KEYS})
+    for key in OUTPUT_KEYS:
+        try:
+            value = float(factor_scores.get(key))
+        except (TypeError, ValueError):
+            continue
+        if np.isfinite(value):
+            entry[key].append(value)
+
+
+def harvest(log_paths, corpora, jobs_db=None, patterns=None, store=ARTICLE_STORE) -> tuple:
+    """
+    (rows, unmatched): one row per article with hash, text, number of runs and
+    the median LLM score per factor; and the number of logged runs whose text
+    was neither in `store` nor in the corpora.
+    """
+    texts = _texts_by_hash(corpora)
+    apps = {f"factuality_evaluator_{p}" for p in patterns} if patterns else None
+    scores: dict = {}
+    runs: dict = {}
+    unmatched = 0
+    for record in iter_run_logs([p for p in log_paths if p.exists()]):
+        h = record.get("article_hash")
+        if not h or (apps and record.get("app") not in apps):
+            continue
+        if h not in texts:
+            stored = logged_article(h, store)
+            if stored is None:
+                unmatched += 1
+                continue
+            texts[h] = (stored.get("url", ""), stored.get("title", ""), stored.get("body_text", ""))
+        _add_scores(scores, h, record.get("factor_scores") or {})
+        runs[h] = runs.get(h, 0) + 1
+    if jobs_db is not None and jobs_db.exists():
+        from src.jobqueue import JobQueue
+
+        queue = JobQueue(jobs_db)
+        for job in queue.results():
+            if job["status"] != "done" or (patterns and job["pattern"] not in patterns):
+                continue
+            h = job["article_hash"]
+            texts.setdefault(h, (job["url"], job["title"], job["body_text"]))
+            _add_scores(scores, h, (job["result"] or {}).get("factor_scores") or {})
+            runs[h] = runs.get(h, 0) + 1
+        queue.close()
+    rows = []
+    for h, entry in scores.items():
+        url, title, body = texts[h]
+        row = {"article_hash": h, "url": url, "title": title, "body_text": body, "n_runs": runs[h]}
+        row.update({key: float(np.median(v)) if v else np.nan for key, v in entry.items()})
+        rows.append(row)
+    df = pd.DataFrame(rows, columns=["article_hash", "url", "title", "body_text", "n_runs", *OUTPUT_KEYS])
+    return df, unmatched
+
+
+def _docs(df: pd.DataFrame) -> list:
+    return [preprocess_text(f"{t} {b}") for t, b in zip(df["title"], df["body_text"])]
+
+
+def fit(df: pd.DataFrame, alpha: float = 1.0) -> dict:
+    """TF-IDF over all rows, one Ridge per factor over rows with that score."""
+    docs = _docs(df)
+    vectorizer = TfidfVectorizer(
+        ngram_range=(1, 2), min_df=2 if len(docs) >= 50 else 1, max_df=0.95, max_features=20_000, sublinear_tf=True
+    )
+    X = vectorizer.fit_transform(docs)
+    regressors = {}
+    for key in OUTPUT_KEYS:
+        y = df[key].to_numpy(dtype=float)
+        mask = np.isfinite(y)
+        regressors[key] = Ridge(alpha=alpha).fit(X[mask], y[mask]) if mask.sum() >= 2 else None
+    return {"vectorizer": vectorizer, "regressors": regressors, "keys": OUTPUT_KEYS, "input": "title_and_body"}
+
+
+def predict(artifact: dict, df: pd.DataFrame) -> np.ndarray:
+    X = artifact["vectorizer"].transform(_docs(df))
+    out = np.full((len(df), len(OUTPUT_KEYS)), np.nan)
+    for j, key in enumerate(OUTPUT_KEYS):
+        regressor = artifact["regressors"].get(key)
+        if regressor is not None and len(df):
+            out[:, j] = np.clip(regressor.predict(X), 0.0, 10.0)
+    return out
+
+
+def _lookup(by_hash: pd.DataFrame, title: str, body: str) -> np.ndarray:
+    """Median logged LLM scores for an article, under either hash it may have been run with."""
+    for n in TRUNCATIONS:
+        h = article_hash(title, body[:n] if n else body)
+        if h in by_hash.index:
+            return by_hash.loc[h].to_numpy(dtype=float)
+    return np.full(len(OUTPUT_KEYS), np.nan)
+
+
+def _fmt(value) -> str:
+    return f"{value:.2f}" if value is not None else "n/a"
+
+
+def _row(source: str, key: str, metrics: dict, n: int) -> dict:
+    return {"comparison": source, "factor": key, "n": n, **{k: metrics.get(k) for k in ("mae", "pearson", "pct_within_2")}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill logged LLM factor scores into local regressors")
+    parser.add_argument("--logs", type=Path, nargs="*", default=DEFAULT_LOGS, help="Run logs (JSON lines)")
+    parser.add_argument("--corpus", type=Path, action="append", default=None, help="Article CSVs to join on hash")
+    parser.add_argument("--jobs-db", type=Path, default=JOBS_DB, help="Job queue results to include")
+    parser.add_argument("--pattern", action="append", choices=PATTERNS, default=None, help="Only runs of this pattern")
+    parser.add_argument("--alpha", type=float, default=1.0, help="Ridge regularization (default: 1.0)")
+    parser.add_argument("--min-articles", type=int, default=20, help="Skip training below this many articles")
+    parser.add_argument("--no-promote", action="store_true", help="Register the version without promoting it")
+
+    parser.add_argument("--articles", type=Path, default=ARTICLE_STORE, help="Text stored by run() per article_hash")
+    args = parser.parse_args()
+
+    df, unmatched = harvest(args.logs, args.corpus or DEFAULT_CORPORA, args.jobs_db, args.pattern, args.articles)
+    if df.empty:
+        print(
+            f"[ERR] no logged run could be joined to its text ({unmatched} runs had no text in {args.articles} "
+            "or the corpora); nothing to train on"
+        )
+        sys.exit(1)
+    if unmatched:
+        print(f"[WARN] {unmatched} logged runs had no stored text and were skipped")
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    df.to_csv(OUT_DIR / "llm_scores.csv", index=False)
+    n_runs = int(df["n_runs"].sum())
+    print(f"[OK] Harvested {len(df)} articles ({n_runs} runs) -> {OUT_DIR / 'llm_scores.csv'}")
+
+    human = datasets.load(LABELED_CSV, kind="articles").to_frame() if LABELED_CSV.exists() else pd.DataFrame()
+    human_hashes = set()
+    for t, b in zip(human.get("title", []), human.get("body_text", [])):
+        human_hashes.update(article_hash(t, b[:n] if n else b) for n in TRUNCATIONS)
+    train = df[~df["article_hash"].isin(human_hashes)].reset_index(drop=True)
+    if len(train) < args.min_articles:
+        print(
+            f"[ERR] {len(train)} non-human-labeled articles with LLM scores; need {args.min_articles} "
+            "(human-labeled articles are held out)"
+        )
+        sys.exit(1)
+
+    report = []
+    oof = np.full((len(train), len(OUTPUT_KEYS)), np.nan)
+    for tr, va in KFold(n_splits=min(5, len(train)), shuffle=True, random_state=42).split(train):
+        oof[va] = predict(fit(train.iloc[tr], args.alpha), train.iloc[va])
+    print(f"\nAgreement with the LLM (5-fold out-of-fold, n={len(train)}):")
+    for j, key in enumerate(OUTPUT_KEYS):
+        m = compute_metrics(list(oof[:, j]), list(train[key]))
+        report.append(_row("distilled_vs_llm", key, m, len(train)))
+        print(f"  {key:<28} MAE {_fmt(m['mae'])}  within ±2: {_fmt(m['pct_within_2'])}%")
+
+    artifact = fit(train, args.alpha)
+    if len(human):
+        pred = predict(artifact, human)
+        by_hash = df.set_index("article_hash")[OUTPUT_KEYS]
+        llm = np.array([_lookup(by_hash, t, b) for t, b in zip(human["title"], human["body_text"])])
+        print(f"\nAgreement with human labels (n={len(human)} unseen articles):")
+        for label_col, key in FACTOR_MAP:
+            j = OUTPUT_KEYS.index(key)
+            truth = list(human[label_col])
+            m = compute_metrics(list(pred[:, j]), truth)
+            ref = compute_metrics(list(llm[:, j]), truth)
+            report.append(_row("distilled_vs_human", key, m, len(human)))
+            report.append(_row("llm_vs_human", key, ref, len(human)))
+            print(f"  {key:<28} distilled MAE {_fmt(m['mae'])}  LLM MAE {_fmt(ref['mae'])}")
+    pd.DataFrame(report).to_csv(OUT_DIR / "report.csv", index=False)
+    print(f"\nReport -> {OUT_DIR / 'report.csv'}")
+
+    staging = registry.stage(MODELS_DIR)
+    out = staging / "distilled.joblib"
+    joblib.dump({**artifact, "kind": "distilled"}, out)
+    entry = {
+        "file": out.name,
+        "input": "title_and_body",
+        "kind": "distilled",
+        "data": {str(p): datasets.cached_digest(p) for p in (args.corpus or DEFAULT_CORPORA) if p.exists()},
+        "metrics": {"n_samples": len(train), "patterns": args.pattern or "all"},
+        "sklearn_version": sklearn.__version__,
+        "size_bytes": out.stat().st_size,
+    }
+    version = registry.commit(MODELS_DIR, staging, {"distilled": entry})
+    if args.no_promote:
+        print(f"Registered version {version} (not promoted)")
+    else:
+        registry.promote(MODELS_DIR, version)
+        print(f"Registered and promoted version {version}")
+
+
+if __name__ == "__main__":
+    main()
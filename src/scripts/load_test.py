@@ -0,0 +1,189 @@
+"""
+Open-loop load test: replay sampled corpus articles at target arrival rates.
+Run from project root:
+
+    python src/scripts/load_test.py --target run --rate 1 --rate 2 --rate 4 --duration 60 --stub-delay 0.5
+    python src/scripts/load_test.py --target service --rate 8 --concurrency 4 --queue 8
+    python src/scripts/load_test.py --target http --url http://127.0.0.1:8080 --rate 2 --batch-size 8
+    python src/scripts/load_test.py --target run --trace logs/experiments.jsonl --speedup 60
+
+Targets: "run" calls src.run.run() in process; "service" goes through
+ScoringService.score()/score_batch() in process (admission control, 429s,
+coalescing, AIMD); "http" posts to a running service. The in-process targets
+use the stand-in LLM (src/stub_model.py) unless --gemini is given, so the test
+measures the Python side and queueing, not the model. Arrivals are Poisson at
+each --rate (one run per rate, so a sweep shows where the pipeline saturates)
+or replayed from --trace. See src/loadgen.py.
+
+Prints one summary row per rate and writes per-request records and the
+summaries to logs/load/.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Project root (src/scripts/ -> src/ -> root)
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+from src import loadgen  # noqa: E402
+
+DATA = ROOT / "data"
+DEFAULT_CORPORA = [DATA / "article.csv", DATA / "articles.csv", *sorted((DATA / "jsonl").glob("*.jsonl"))]
+OUT_DIR = ROOT / "logs" / "load"
+SUMMARY_COLUMNS = [
+    "rate", "requests", "offered_rps", "throughput_rps", "goodput_rps", "ok_rate", "error_rate",
+    "rejected_rate", "degraded_rate", "timeout_rate", "p50_s", "p90_s", "p99_s", "max_send_lag_s",
+]
+
+
+def _in_process_target(args):
+    from src.app import create_app
+    from src.run import run
+
+    model = None
+    if not args.gemini:
+        from src.stub_model import StubLlm
+
+        model = StubLlm(delay=args.stub_delay)
+    else:
+        from dotenv import load_dotenv
+
+        load_dotenv(ROOT / ".env")
+    app_instance = create_app(args.pattern, model=model)
+
+    if args.target == "service":
+        from src.concurrency import AIMDLimiter, ModelGuard
+        from src.service import ScoringService
+
+        service = ScoringService(
+            app_instance,
+            concurrency=args.concurrency,
+            queue=args.queue,
+            predictive=args.predictive,
+            guard=None if args.fixed_concurrency else ModelGuard(AIMDLimiter(initial=2, max_limit=args.concurrency)),
+        )
+
+        async def service_target(articles):
+            payload = [{k: a[k] for k in ("url", "title", "body_text")} for a in articles]
+            if len(payload) == 1:
+                return [await service.score(payload[0])]
+            return await service.score_batch(payload)
+
+        return service_target, service.health
+
+    async def score(article):
+        predictive_scores = None
+        if args.predictive:
+            from src.models import get_predictive_scores
+
+            predictive_scores = await asyncio.get_running_loop().run_in_executor(
+                None, get_predictive_scores, article["title"], article["body_text"], article["url"]
+            )
+        return await run(
+            article_title=article["title"],
+            article_content=article["body_text"],
+            article_url=article["url"],
+            predictive_scores=predictive_scores,
+            app_instance=app_instance,
+        )
+
+    async def run_target(articles):
+        results = await asyncio.gather(*(score(a) for a in articles), return_exceptions=True)
+        return [{"error": f"{type(r).__name__}: {r}"} if isinstance(r, BaseException) else r for r in results]
+
+    return run_target, None
+
+
+def _fmt(value) -> str:
+    return "-" if value is None else (f"{value:.3f}" if isinstance(value, float) else str(value))
+
+
+async def _main(args) -> None:
+    corpus = loadgen.load_corpus(args.corpus or DEFAULT_CORPORA, max_chars=args.max_chars)
+    if not corpus:
+        print("[SKIP] no articles found in the corpora")
+        return
+    lengths = sorted(len(a["body_text"]) for a in corpus)
+    print(
+        f"[INFO] {len(corpus)} articles; body chars p10/p50/p90: "
+        f"{lengths[len(lengths) // 10]}/{lengths[len(lengths) // 2]}/{lengths[len(lengths) * 9 // 10]}"
+    )
+    if args.target == "http":
+        target, health = loadgen.http_target(args.url, timeout=args.timeout), None
+    else:
+        target, health = _in_process_target(args)
+
+    if args.trace:
+        schedules = [("trace", loadgen.trace_arrivals(args.trace, args.speedup, args.duration))]
+    else:
+        schedules = [
+            (rate, loadgen.poisson_arrivals(rate, args.duration or 30.0, seed=args.seed + n))
+            for n, rate in enumerate(args.rate or [1.0])
+        ]
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    summaries = []
+    print("\n" + "".join(f"{c:>15}" for c in SUMMARY_COLUMNS))
+    for rate, arrivals in schedules:
+        if not arrivals:
+            print(f"[SKIP] rate {rate}: no arrivals")
+            continue
+        articles = loadgen.sample_articles(corpus, len(arrivals), seed=args.seed)
+        duration = (args.duration or 30.0) if rate != "trace" else max(arrivals) or 1.0
+        records = await loadgen.drive(
+            target, articles, arrivals, batch_size=args.batch_size, batch_window=args.batch_window, timeout=args.timeout
+        )
+        summary = {"rate": rate, **loadgen.summarize(records, duration, slo=args.slo)}
+        if health is not None:
+            summary["service"] = health()
+        summaries.append(summary)
+        print("".join(f"{_fmt(summary.get(c)):>15}" for c in SUMMARY_COLUMNS))
+        with open(OUT_DIR / f"{stamp}-rate{rate}.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]))
+            writer.writeheader()
+            writer.writerows(records)
+        if args.cooldown:
+            await asyncio.sleep(args.cooldown)
+
+    out = OUT_DIR / f"{stamp}-summary.json"
+    out.write_text(json.dumps({"args": {k: str(v) for k, v in vars(args).items()}, "runs": summaries}, indent=2))
+    print(f"\n[OK] Per-request records and summary -> {OUT_DIR}/{stamp}-*")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test against run(), the service or an HTTP endpoint")
+    parser.add_argument("--target", choices=["run", "service", "http"], default="run")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Service base URL for --target http")
+    parser.add_argument("--pattern", default="simple_prompt", help="Pattern for the in-process targets")
+    parser.add_argument("--corpus", type=Path, action="append", default=None, help="Article corpora to sample")
+    parser.add_argument("--max-chars", type=int, default=None, help="Truncate bodies (e.g. 8000 like the eval script)")
+    parser.add_argument("--rate", type=float, action="append", default=None, help="Poisson arrivals/s (repeatable)")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds of arrivals per rate (default: 30)")
+    parser.add_argument("--trace", type=Path, default=None, help="Replay arrival times from a JSONL trace instead")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Compress --trace time by this factor")
+    parser.add_argument("--batch-size", type=int, default=1, help="Group arrivals into batches of up to N")
+    parser.add_argument("--batch-window", type=float, default=0.5, help="Seconds a batch waits to fill (default: 0.5)")
+    parser.add_argument("--slo", type=float, default=None, help="Latency target (s) for goodput; default: any success")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cooldown", type=float, default=0.0, help="Seconds to wait between rates")
+    parser.add_argument("--stub-delay", type=float, default=0.5, help="Seconds per stand-in LLM call (default: 0.5)")
+    parser.add_argument("--gemini", action="store_true", help="Use the real model instead of the stand-in")
+    parser.add_argument("--predictive", action="store_true", help="Include the predictive model scores")
+    parser.add_argument("--concurrency", type=int, default=8, help="--target service: pipelines at once")
+    parser.add_argument("--queue", type=int, default=64, help="--target service: admitted requests waiting")
+    parser.add_argument("--fixed-concurrency", action="store_true", help="--target service: no AIMD or breaker")
+    args = parser.parse_args()
+    if args.trace and args.rate:
+        parser.error("use either --rate or --trace")
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Inspect and switch predictive model versions in data/models/versions/.
+Run from project root:
+    python src/scripts/model_registry.py list
+    python src/scripts/model_registry.py promote <version>
+
+Running processes pick up a promotion on their next get_predictive_scores() call.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Project root (src/scripts/ -> src/ -> root)
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+from src import registry  # noqa: E402
+
+MODELS_DIR = ROOT / "data" / "models"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage predictive model versions")
+    parser.add_argument("--models-dir", type=Path, default=MODELS_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List registered versions")
+    promote = sub.add_parser("promote", help="Make a version current (atomic pointer switch)")
+    promote.add_argument("version")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        versions = registry.list_versions(args.models_dir)
+        if not versions:
+            print(f"No versions under {registry.versions_dir(args.models_dir)}")
+        for manifest in versions:
+            artifacts = manifest.get("artifacts", {})
+            size_mb = sum(a.get("size_bytes", 0) for a in artifacts.values()) / (1024 * 1024)
+            marker = "*" if manifest["current"] else " "
+            print(
+                f"{marker} {manifest['version']}  {manifest.get('created_at', '')}  "
+                f"{len(artifacts)} models  {size_mb:.1f} MB  {', '.join(sorted(artifacts))}"
+            )
+    elif args.command == "promote":
+        try:
+            registry.promote(args.models_dir, args.version)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Promoted {args.version}")
+
+
+if __name__ == "__main__":
+    main()
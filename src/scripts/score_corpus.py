@@ -0,0 +1,215 @@
+"""
+Score article corpora through the durable job queue (src/jobqueue.py).
+Run from project root:
+    python src/scripts/score_corpus.py enqueue data/articles.csv --pattern simple_prompt --corpus nightly
+    python src/scripts/score_corpus.py work --workers 4 --concurrency 4
+    python src/scripts/score_corpus.py status
+    python src/scripts/score_corpus.py export results.csv --corpus nightly
+
+Each worker process leases jobs, runs up to --concurrency pipelines at once,
+renews its leases while they run, and writes results back. Killing a worker
+is safe: its leases expire and the jobs are picked up again.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+# Project root (src/scripts/ -> src/ -> root)
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+from src.jobqueue import JobQueue, worker_id  # noqa: E402
+
+DB_PATH = ROOT / "data" / "jobs.sqlite"
+
+
+async def _work(
+    db: Path, concurrency: int, lease_seconds: float, max_attempts: int, stub: bool, rpm=None, tpm=None
+) -> int:
+    from src.app import create_app
+    from src.models import get_current_models, get_predictive_scores
+    from src.run import run
+
+    model = None
+    if stub:
+        from src.stub_model import StubLlm
+
+        model = StubLlm()
+    hooks = []
+    if rpm:
+        from src.ratelimit import RateLimiter
+
+        hooks.append(RateLimiter(rpm, tpm))  # one shared quota for all worker processes
+    queue = JobQueue(db, max_attempts=max_attempts)
+    owner = worker_id()
+    apps = {}
+    held = {}
+    done = 0
+    loop = asyncio.get_running_loop()
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            for job in list(held.values()):
+                if not queue.renew(job, owner, lease_seconds):
+                    held.pop(job["id"], None)
+
+    async def process(job):
+        nonlocal done
+        try:
+            app = apps.get(job["pattern"])
+            if app is None:
+                app = apps[job["pattern"]] = create_app(job["pattern"], model=model, model_hooks=hooks)
+            models = get_current_models()
+            scores = await loop.run_in_executor(
+                None, lambda: get_predictive_scores(job["title"], job["body_text"], job["url"], models=models)
+            )
+            result = await run(
+                article_title=job["title"],
+                article_content=job["body_text"],
+                article_url=job["url"],
+                predictive_scores=scores or None,
+                app_instance=app,
+            )
+            missing = result.get("combined_veracity_score") is None or any(
+                v is None for v in (result.get("factor_scores") or {}).values()
+            )
+            if missing:
+                queue.fail(job, owner, "missing scores in result")
+            elif queue.complete(job, owner, result):
+                done += 1
+        except Exception as e:
+            queue.fail(job, owner, f"{type(e).__name__}: {e}")
+        finally:
+            held.pop(job["id"], None)
+
+    beat = asyncio.ensure_future(heartbeat())
+    tasks = set()
+    try:
+        while True:
+            free = concurrency - len(tasks)
+            jobs = queue.lease(owner, free, lease_seconds) if free > 0 else []
+            for job in jobs:
+                held[job["id"]] = job
+                tasks.add(asyncio.ensure_future(process(job)))
+            if not tasks:
+                if queue.stats()["leased"] == 0:
+                    break
+                # Other workers still hold leases; wait in case they expire and need retrying.
+                await asyncio.sleep(min(5.0, lease_seconds / 3))
+                continue
+            finished, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        beat.cancel()
+        queue.close()
+    return done
+
+
+def _worker(db: Path, concurrency: int, lease_seconds: float, max_attempts: int, stub: bool, rpm, tpm) -> None:
+    if not stub:
+        from dotenv import load_dotenv
+
+        load_dotenv(ROOT / ".env")
+    asyncio.run(_work(db, concurrency, lease_seconds, max_attempts, stub, rpm, tpm))
+
+
+def _print_stats(queue: JobQueue, corpus=None) -> dict:
+    s = queue.stats(corpus)
+    print(
+        f"done {s['done']}/{s['total']}  pending {s['pending']}  leased {s['leased']}  failed {s['failed']}  "
+        f"retries {s['retries']}  {s['throughput']:.2f} articles/s (last minute {s['recent_throughput']:.2f}/s)"
+    )
+    return s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score article corpora through a SQLite job queue")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help=f"Queue database (default: {DB_PATH})")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Leases per job before it is marked failed")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enqueue = sub.add_parser("enqueue", help="Queue a CSV/JSONL file of articles (url, title, body_text)")
+    enqueue.add_argument("path", type=Path)
+    enqueue.add_argument("--pattern", default="simple_prompt")
+    enqueue.add_argument("--corpus", default="default")
+    work = sub.add_parser("work", help="Run worker processes until the queue is empty")
+    work.add_argument("--workers", type=int, default=2)
+    work.add_argument("--concurrency", type=int, default=4, help="Articles in flight per worker")
+    work.add_argument("--lease-seconds", type=float, default=300.0)
+    work.add_argument("--stub", action="store_true", help="Use the deterministic stand-in LLM")
+    work.add_argument("--rpm", type=float, default=None, help="LLM requests per minute shared by all workers")
+    work.add_argument("--tpm", type=float, default=None, help="LLM tokens per minute shared by all workers")
+    status = sub.add_parser("status", help="Show progress, throughput and failures")
+    status.add_argument("--corpus", default=None)
+    retry = sub.add_parser("retry", help="Re-queue failed jobs")
+    retry.add_argument("--corpus", default=None)
+    export = sub.add_parser("export", help="Write finished results to CSV")
+    export.add_argument("out", type=Path)
+    export.add_argument("--corpus", default=None)
+    args = parser.parse_args()
+    if args.command == "work" and args.tpm and not args.rpm:
+        parser.error("--tpm requires --rpm")
+
+    queue = JobQueue(args.db, max_attempts=args.max_attempts)
+    if args.command == "enqueue":
+        from src.app import PATTERNS
+        from src.batch import read_articles
+
+        if args.pattern not in PATTERNS:
+            parser.error(f"--pattern must be one of {PATTERNS}")
+        rows = read_articles(args.path)
+        added = queue.enqueue(rows, args.pattern, args.corpus)
+        print(f"[OK] Queued {added} of {len(rows)} articles ({len(rows) - added} already queued) -> {args.db}")
+    elif args.command == "status":
+        _print_stats(queue, args.corpus)
+    elif args.command == "retry":
+        print(f"[OK] Re-queued {queue.retry_failed(args.corpus)} failed jobs")
+    elif args.command == "export":
+        import pandas as pd
+
+        from src.app import FACTUALITY_FACTORS
+
+        records = []
+        for job in queue.results(args.corpus):
+            result = job["result"] or {}
+            scores = result.get("factor_scores") or {}
+            record = {k: job[k] for k in ("corpus", "pattern", "article_hash", "url", "title", "status", "attempts")}
+            for _name, _key, output_key in FACTUALITY_FACTORS:
+                record[output_key] = scores.get(output_key)
+            record["combined_veracity_score"] = result.get("combined_veracity_score")
+            record["overall_assessment"] = result.get("overall_assessment", "")
+            record["error"] = job["error"] or ""
+            records.append(record)
+        pd.DataFrame(records).to_csv(args.out, index=False)
+        print(f"[OK] Wrote {len(records)} results -> {args.out}")
+    elif args.command == "work":
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(
+                target=_worker,
+                args=(
+                    args.db, args.concurrency, args.lease_seconds, args.max_attempts, args.stub, args.rpm, args.tpm
+                ),
+            )
+            for _ in range(args.workers)
+        ]
+        for p in procs:
+            p.start()
+        try:
+            while any(p.is_alive() for p in procs):
+                time.sleep(5)
+                _print_stats(queue)
+        except KeyboardInterrupt:
+            for p in procs:
+                p.terminate()
+        for p in procs:
+            p.join()
+        s = _print_stats(queue)
+        print("[OK] Queue drained" if s["pending"] + s["leased"] == 0 else "[INFO] Workers stopped with jobs left")
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,140 @@
 """
-Train the six predictive models and save to data/models/*.joblib.
-Run from project root: python src/scripts/train_predictive_models.py
+Train the predictive models (see CONFIGS) and register them as a new version under
+data/models/versions/ (see src/registry.py), promoted unless --no-promote.
+Run from project root: python src/scripts/train_predictive_models.py [--jobs N]
+
+Training data is read through src.datasets, which caches parsed columns under
+data/.cache/ so repeated runs skip parsing. The models train in a process
+pool (one fresh process per model), and fitted TF-IDF outputs are cached in
+data/.cache/features/ via Pipeline(memory=...), so a retrain on unchanged data
+only refits the classifiers. That cache keeps an entry per distinct input and
+is never pruned; pass --clear-cache to empty it before training. Per-model
+wall time, peak memory (the increase over the worker's RSS at task start, so
+memory inherited from the parent is excluded) and artifact size are printed
+at the end.
+
+For corpora too large for memory (e.g. data/tox-new/train.csv,
+data/pol-new/train_orig.txt), --out-of-core streams chunks through a stateless
+HashingVectorizer into SGDClassifier.partial_fit. --update continues training
+those artifacts on new labeled data, e.g.:
+
+    python src/scripts/train_predictive_models.py --out-of-core --update --data toxicity=new_labels.csv
+
+Either way the artifact is {"pipeline", "input"}, so src/models.py loads it unchanged.
 """
 
+import argparse
+import multiprocessing
 import os
+import shutil
 import sys
+import time
 from pathlib import Path
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
 import joblib
 import numpy as np
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.multioutput import MultiOutputClassifier
 from sklearn.pipeline import Pipeline
 
 # Project root (src/scripts/ -> src/ -> root)
 ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(ROOT))
+from src import datasets, profiling, registry  # noqa: E402
+from src.evidence import SENTENCE_FACTORS  # noqa: E402
+
 DATA = ROOT / "data"
 MODELS_DIR = ROOT / "data" / "models"
+FEATURE_CACHE = datasets.CACHE_DIR / "features"
 
-TSV_COLUMNS = [
-    "id", "label", "statement", "subjects", "speaker", "speaker_job_title",
-    "state_info", "party_affiliation", "barely_true_counts", "false_counts",
-    "half_true_counts", "mostly_true_counts", "pants_on_fire_counts",
-    "context", "justification", "json_file_id",
-]
+
+def _make_pipeline() -> Pipeline:
+    """TF-IDF + logistic regression; the fitted TF-IDF step is cached on disk by its inputs."""
+    return Pipeline(
+        [
+            ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000)),
+            ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
+        ],
+        memory=joblib.Memory(str(FEATURE_CACHE), verbose=0),
+    )
+
+
+def _fit(X, y):
+    """Fit a fresh TF-IDF pipeline; return (pipeline, metrics for the manifest)."""
+    pipe = _make_pipeline()
+    pipe.fit(X, y)
+    metrics = {
+        "n_samples": len(y),
+        "class_counts": {str(k): int(v) for k, v in zip(*np.unique(y, return_counts=True))},
+        "train_accuracy": float(pipe.score(X, y)),
+        "vocabulary": len(pipe.named_steps["tfidf"].vocabulary_),
+    }
+    return pipe, metrics
 
 
 def _preprocess(text: str) -> str:
     return (str(text).lower().strip() if text else "")[:100_000]
 
 
-def _load_tsv(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path, sep="\t", header=None, on_bad_lines="skip")
-    df = df.drop(df.columns[0], axis=1)
-    df.columns = TSV_COLUMNS[: len(df.columns)]
-    df["statement"] = df["statement"].astype(str).fillna("").str.strip()
-    df["justification"] = df.get("justification", pd.Series([""] * len(df))).astype(str).fillna("")
-    return df.dropna(subset=["statement"])
+# -----------------------------------------------------------------------------
+# Features and labels per factor. `data` is a datasets.Table or a normalized
+# DataFrame chunk (both index columns by name), so the same code serves the
+# in-memory and out-of-core trainers.
+# -----------------------------------------------------------------------------
+
+# Heuristic: false / pants-fire -> sensational (1)
+_SENSATIONAL_LABELS = {"false": 1, "pants-fire": 1, "barely-true": 0, "half-true": 0, "mostly-true": 0, "true": 0}
+# Aligned = 1 if true/mostly-true
+_ALIGNED_LABELS = {"true": 1, "mostly-true": 1, "barely-true": 0, "half-true": 0, "false": 0, "pants-fire": 0}
+
+
+def xy_clickbait(data):
+    X = [ _preprocess(t) for t in data["text"] ]
+    return X, np.asarray(data["label"], dtype=int)
+
+
+def xy_sensationalism(data):
+    X = [ _preprocess(t) for t in data["statement"] ]
+    return X, np.array([_SENSATIONAL_LABELS.get(v, 0) for v in data["label"]])
+
+
+def xy_title_vs_body(data):
+    # Input: "TITLE: ... BODY: ..."
+    X = [
+        " TITLE_SEP ".join([_preprocess(statement), _preprocess(justification)])
+        for statement, justification in zip(data["statement"], data["justification"])
+    ]
+    return X, np.array([_ALIGNED_LABELS.get(v, 0) for v in data["label"]])
+
+
+def xy_sentiment(data):
+    # Combine title + body for input
+    X = [ _preprocess(t + " " + b) for t, b in zip(data["title"], data["body_text"]) ]
+    # Labels are 0=neg, 1=neu, 2=pos; missing or out-of-range values count as neutral
+    sent = np.asarray(data["sentiment"], dtype=float)
+    return X, np.where(np.isin(sent, [0, 1, 2]), sent, 1).astype(int)
+
+
+def xy_toxicity(data):
+    X = [ _preprocess(t) for t in data["text"] ]
+    return X, np.asarray(data["label"], dtype=int)
+
+
+def xy_political_affiliation(data):
+    X = [ _preprocess(t) for t in data["text"] ]
+    return X, np.asarray(data["label"], dtype=int)
+
+
+# -----------------------------------------------------------------------------
+# In-memory trainers (TF-IDF + logistic regression)
+# -----------------------------------------------------------------------------
 
 
 def train_clickbait():
@@ -46,17 +142,8 @@ def train_clickbait():
     if not path.exists():
         print(f"[SKIP] Clickbait: {path} not found")
         return None
-    df = pd.read_csv(path)
-    text_col = "headline" if "headline" in df.columns else df.columns[0]
-    label_col = "clickbait" if "clickbait" in df.columns else df.columns[1]
-    X = [ _preprocess(t) for t in df[text_col] ]
-    y = df[label_col].astype(int).values
-    pipe = Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000)),
-        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
-    ])
-    pipe.fit(X, y)
-    return pipe
+    X, y = xy_clickbait(datasets.load(path, kind="clickbait"))
+    return _fit(X, y)
 
 
 def train_sensationalism():
@@ -64,17 +151,8 @@ def train_sensationalism():
     if not path.exists():
         print(f"[SKIP] Sensationalism: {path} not found")
         return None
-    df = _load_tsv(path)
-    X = [ _preprocess(t) for t in df["statement"] ]
-    # Heuristic: false / pants-fire -> sensational (1)
-    label_map = {"false": 1, "pants-fire": 1, "barely-true": 0, "half-true": 0, "mostly-true": 0, "true": 0}
-    y = df["label"].str.strip().str.lower().map(lambda v: label_map.get(v, 0)).values
-    pipe = Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000)),
-        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
-    ])
-    pipe.fit(X, y)
-    return pipe
+    X, y = xy_sensationalism(datasets.load(path, kind="liar"))
+    return _fit(X, y)
 
 
 def train_title_vs_body():
@@ -82,20 +160,9 @@ def train_title_vs_body():
     if not path.exists():
         print(f"[SKIP] Title vs Body: {path} not found")
         return None
-    df = _load_tsv(path)
-    # Input: "TITLE: ... BODY: ..."; aligned = 1 if true/mostly-true
-    X = [
-        " TITLE_SEP ".join([_preprocess(df["statement"].iloc[i]), _preprocess(df["justification"].iloc[i])])
-        for i in range(len(df))
-    ]
-    label_map = {"true": 1, "mostly-true": 1, "barely-true": 0, "half-true": 0, "false": 0, "pants-fire": 0}
-    y = df["label"].str.strip().str.lower().map(lambda v: label_map.get(v, 0)).values
-    pipe = Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000)),
-        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
-    ])
-    pipe.fit(X, y)
-    return pipe
+    # Same file as sensationalism: the second load memory-maps the cached columns.
+    X, y = xy_title_vs_body(datasets.load(path, kind="liar"))
+    return _fit(X, y)
 
 
 def train_sentiment():
@@ -103,27 +170,15 @@ def train_sentiment():
     if not path.exists():
         print(f"[SKIP] Sentiment: {path} not found")
         return None
-    df = pd.read_csv(path)
-    if "sentiment" not in df.columns or "title" not in df.columns or "body_text" not in df.columns:
+    data = datasets.load(path, kind="articles")
+    if "sentiment" not in data:
         print("[SKIP] Sentiment: missing sentiment/title/body_text columns")
         return None
-    # Combine title + body for input
-    titles = df["title"].astype(str).fillna("")
-    bodies = df["body_text"].astype(str).fillna("")
-    X = [ _preprocess(t + " " + b) for t, b in zip(titles, bodies) ]
-    sent = df["sentiment"].astype(str).str.strip().str.lower()
-    # Map common values to 0=neg, 1=neu, 2=pos
-    sent_map = {"negative": 0, "neg": 0, "0": 0, "neutral": 1, "neu": 1, "1": 1, "positive": 2, "pos": 2, "2": 2}
-    y = sent.map(lambda v: sent_map.get(v, 1)).values
+    X, y = xy_sentiment(data)
     if len(np.unique(y)) < 2:
         print("[SKIP] Sentiment: insufficient class variety")
         return None
-    pipe = Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000)),
-        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
-    ])
-    pipe.fit(X, y)
-    return pipe
+    return _fit(X, y)
 
 
 def train_toxicity():
@@ -131,18 +186,13 @@ def train_toxicity():
     if not path.exists():
         print(f"[SKIP] Toxicity: {path} not found")
         return None
-    df = pd.read_csv(path)
-    if "comment_text" not in df.columns or "toxic" not in df.columns:
+    try:
+        data = datasets.load(path, kind="toxicity")
+    except ValueError:
         print("[SKIP] Toxicity: missing comment_text/toxic columns")
         return None
-    X = [ _preprocess(t) for t in df["comment_text"] ]
-    y = df["toxic"].astype(int).values
-    pipe = Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000)),
-        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
-    ])
-    pipe.fit(X, y)
-    return pipe
+    X, y = xy_toxicity(data)
+    return _fit(X, y)
 
 
 def train_political_affiliation():
@@ -150,51 +200,308 @@ def train_political_affiliation():
     if not path.exists():
         print(f"[SKIP] Political: {path} not found")
         return None
-    lines = path.read_text(encoding="utf-8", errors="ignore").strip().split("\n")
-    X, y = [], []
-    for line in lines:
-        parts = line.split("\t", 1)
-        if len(parts) != 2:
-            continue
-        label_str, text = parts
-        try:
-            label = int(label_str.strip())
-        except ValueError:
-            continue
-        X.append(_preprocess(text))
-        y.append(label)
-    if len(set(y)) < 2:
+    X, y = xy_political_affiliation(datasets.load(path, kind="political"))
+    if len(set(y.tolist())) < 2:
         print("[SKIP] Political: insufficient class variety")
         return None
+    return _fit(X, y)
+
+
+def train_sentence_scorer():
+    """One TF-IDF over labeled sentences, one logistic regression per factor (see src/evidence.py)."""
+    path = DATA / "sentences_labeled.csv"
+    if not path.exists():
+        print(f"[SKIP] Sentence scorer: {path} not found")
+        return None
+    data = datasets.load(path, kind="sentences")
+    X = [ _preprocess(t) for t in data["sentence"] ]
+    targets = []
+    for factor in SENTENCE_FACTORS:
+        labels = np.nan_to_num(np.asarray(data[factor], dtype=float), nan=0.0)
+        # Sentiment is 0=neg, 1=neu, 2=pos; any non-neutral sentence is evidence.
+        targets.append(labels != 1 if factor == "sentiment" else labels > 0)
+    Y = np.column_stack(targets).astype(int)
+    if (Y.sum(axis=0) == 0).any():
+        print("[SKIP] Sentence scorer: a factor has no positive sentences")
+        return None
     pipe = Pipeline([
-        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000)),
-        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)),
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_df=0.95, max_features=20_000, sublinear_tf=True)),
+        ("clf", MultiOutputClassifier(LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42))),
     ])
-    pipe.fit(X, np.array(y))
-    return pipe
+    pipe.fit(X, Y)
+    metrics = {
+        "n_samples": len(X),
+        "positives": {f: int(n) for f, n in zip(SENTENCE_FACTORS, Y.sum(axis=0))},
+        "vocabulary": len(pipe.named_steps["tfidf"].vocabulary_),
+    }
+    return pipe, metrics
+
+
+# (name, trainer, input kind, source file). The source is parsed into the
+# columnar cache once up front so pool workers only memory-map it.
+CONFIGS = [
+    ("clickbait", train_clickbait, "title", DATA / "clickbait" / "train1.csv"),  # input: title only
+    ("sensationalism", train_sensationalism, "title_content", DATA / "tsv" / "train2.tsv"),
+    ("title_vs_body", train_title_vs_body, "title_and_body", DATA / "tsv" / "train2.tsv"),
+    ("sentiment", train_sentiment, "title_content", DATA / "articles_labeled.csv"),
+    ("toxicity", train_toxicity, "title_content", DATA / "tox-new" / "train.csv"),
+    ("political_affiliation", train_political_affiliation, "title_content", DATA / "pol-new" / "train_orig.txt"),
+    ("sentence_scorer", train_sentence_scorer, "sentence", DATA / "sentences_labeled.csv"),
+]
+
+# -----------------------------------------------------------------------------
+# Out-of-core trainers (HashingVectorizer + SGD partial_fit over chunks)
+# -----------------------------------------------------------------------------
+
+# name -> (dataset kind, features/labels, all classes; partial_fit needs them up front)
+INCREMENTAL = {
+    "clickbait": ("clickbait", xy_clickbait, [0, 1]),
+    "sensationalism": ("liar", xy_sensationalism, [0, 1]),
+    "title_vs_body": ("liar", xy_title_vs_body, [0, 1]),
+    "sentiment": ("articles", xy_sentiment, [0, 1, 2]),
+    "toxicity": ("toxicity", xy_toxicity, [0, 1]),
+    "political_affiliation": ("political", xy_political_affiliation, [0, 1]),
+}
+
+
+def _make_incremental_pipeline() -> Pipeline:
+    """Stateless hashing features + logistic SGD; predict_proba works like the TF-IDF pipelines."""
+    return Pipeline([
+        ("hash", HashingVectorizer(ngram_range=(1, 2), n_features=2 ** 20, alternate_sign=False)),
+        ("clf", SGDClassifier(loss="log_loss", alpha=1e-5, random_state=42)),
+    ])
+
+
+def train_out_of_core(name: str, paths, chunksize: int, update: bool = False):
+    """
+    Stream `paths` in chunks of `chunksize` rows through partial_fit.
+    Memory is bounded by one chunk. With update=True, training continues from
+    the existing incremental artifact in MODELS_DIR (e.g. on newly labeled data).
+    Returns (pipeline, rows seen in this call, rows seen in total) or None.
+    """
+    kind, xy, classes = INCREMENTAL[name]
+    pipe, n_before = None, 0
+    if update:
+        existing = registry.resolve_dir(MODELS_DIR) / f"{name}.joblib"
+        if not existing.exists():
+            print(f"[SKIP] {name}: --update but {existing} not found")
+            return None
+        artifact = joblib.load(existing)
+        if artifact.get("kind") != "incremental":
+            print(f"[SKIP] {name}: {existing} was not trained out-of-core; retrain with --out-of-core first")
+            return None
+        pipe, n_before = artifact["pipeline"], artifact.get("n_samples", 0)
+    pipe = pipe or _make_incremental_pipeline()
+    hasher, clf = pipe.named_steps["hash"], pipe.named_steps["clf"]
+    n_seen = 0
+    for path in paths:
+        if not path.exists():
+            print(f"[SKIP] {name}: {path} not found")
+            continue
+        for chunk in datasets.iter_chunks(path, kind=kind, chunksize=chunksize):
+            X, y = xy(chunk)
+            if not X:
+                continue
+            clf.partial_fit(hasher.transform(X), y, classes=classes)
+            n_seen += len(X)
+    if n_seen == 0:
+        return None
+    return pipe, n_seen, n_before + n_seen
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (Linux /proc; falls back to the peak so far)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return _peak_rss_mb()
+
+
+def _train_one(
+    name: str,
+    out_dir: Path,
+    out_of_core: bool = False,
+    paths=None,
+    chunksize: int = 50_000,
+    update: bool = False,
+) -> dict:
+    """Train one model in a pool worker, save it to out_dir; return its stats and manifest entry."""
+    _, trainer, input_kind, default_path = next(c for c in CONFIGS if c[0] == name)
+    paths = paths or [default_path]
+    t0 = time.perf_counter()
+    start_mb = _rss_mb()  # forked workers start with the parent's pages already resident
+    stats = {"name": name, "status": "OK", "seconds": 0.0, "peak_mb": float("nan"), "size_mb": 0.0, "message": ""}
+    try:
+        with profiling.profile(f"train_{name}"):
+            if out_of_core:
+                trained = train_out_of_core(name, paths, chunksize, update=update)
+                pipe = trained[0] if trained else None
+                artifact = {"pipeline": pipe, "input": input_kind, "kind": "incremental"}
+                metrics = {}
+                if trained:
+                    artifact["n_samples"] = trained[2]
+                    metrics = {"n_samples": trained[2], "n_samples_added": trained[1]}
+            else:
+                trained = trainer()
+                pipe, metrics = trained if trained else (None, {})
+                artifact = {"pipeline": pipe, "input": input_kind}
+                if name == "sentence_scorer":
+                    artifact["factors"] = SENTENCE_FACTORS
+        if pipe is None:
+            stats["status"] = "SKIP"
+            stats["message"] = "no model"
+        else:
+            # The memory cache is only needed while fitting; keep artifacts self-contained.
+            if pipe.memory is not None:
+                pipe.set_params(memory=None)
+            out = Path(out_dir) / f"{name}.joblib"
+            joblib.dump(artifact, out)
+            t_load = time.perf_counter()
+            joblib.load(out)
+            stats["size_mb"] = out.stat().st_size / (1024 * 1024)
+            stats["message"] = str(out)
+            stats["manifest"] = {
+                "file": out.name,
+                "input": input_kind,
+                "kind": artifact.get("kind", "tfidf_logreg"),
+                "data": {str(p): datasets.cached_digest(p) for p in paths if p.exists()},
+                "metrics": metrics,
+                "sklearn_version": sklearn.__version__,
+                "size_bytes": out.stat().st_size,
+                "load_seconds": round(time.perf_counter() - t_load, 4),
+            }
+    except Exception as e:
+        stats["status"] = "ERR"
+        stats["message"] = str(e)
+    stats["seconds"] = time.perf_counter() - t0
+    stats["peak_mb"] = max(0.0, _peak_rss_mb() - start_mb)
+    return stats
+
+
+def _warm_dataset_cache() -> None:
+    seen = set()
+    for name, _, _, path in CONFIGS:
+        if path in seen or not path.exists():
+            continue
+        seen.add(path)
+        try:
+            datasets.load(path)
+        except Exception as e:
+            print(f"[WARN] {name}: could not cache {path}: {e}")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the predictive models")
+    parser.add_argument(
+        "--jobs", type=int, default=min(len(CONFIGS), os.cpu_count() or 1), help="Models trained in parallel"
+    )
+    parser.add_argument("--only", action="append", default=None, help="Train only this model (repeatable)")
+    parser.add_argument(
+        "--out-of-core",
+        action="store_true",
+        help="Stream data in chunks through HashingVectorizer + SGDClassifier.partial_fit (bounded memory)",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="With --out-of-core: continue training the existing artifacts instead of starting fresh",
+    )
+    parser.add_argument(
+        "--data",
+        action="append",
+        default=[],
+        metavar="NAME=PATH",
+        help="With --out-of-core: train NAME on PATH instead of its default file (repeatable)",
+    )
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Rows per chunk with --out-of-core")
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Empty the fitted-feature cache (data/.cache/features/) before training; it otherwise grows with each new input",
+    )
+    parser.add_argument(
+        "--no-promote", action="store_true", help="Register the new version without making it current"
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="MODES",
+        help="Profile each model's training: comma-separated cprofile,tracemalloc,sample (output in logs/profiles/)",
+    )
+    args = parser.parse_args()
+    if args.profile:
+        try:
+            profiling.configure(args.profile.split(","))
+        except ValueError as e:
+            parser.error(str(e))
+        os.environ["FACTUALITY_PROFILE"] = args.profile  # pool workers read it on import
+    if args.update and not args.out_of_core:
+        parser.error("--update requires --out-of-core")
+
+    data_paths = {}
+    for spec in args.data:
+        name, sep, path = spec.partition("=")
+        if not sep or name not in INCREMENTAL:
+            parser.error(f"--data expects NAME=PATH with NAME in {list(INCREMENTAL)}")
+        data_paths.setdefault(name, []).append(Path(path))
+
+    names = [name for name, _, _, _ in CONFIGS if not args.only or name in args.only]
+    if args.out_of_core:
+        names = [name for name in names if name in INCREMENTAL]
+    if args.update and data_paths and not args.only:
+        # Updating with new data only touches the models that were given data.
+        names = [name for name in names if name in data_paths]
+
+    if args.clear_cache:
+        shutil.rmtree(FEATURE_CACHE, ignore_errors=True)
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
-    configs = [
-        ("clickbait", train_clickbait, "title"),           # input: title only
-        ("sensationalism", train_sensationalism, "title_content"),
-        ("title_vs_body", train_title_vs_body, "title_and_body"),
-        ("sentiment", train_sentiment, "title_content"),
-        ("toxicity", train_toxicity, "title_content"),
-        ("political_affiliation", train_political_affiliation, "title_content"),
+    t0 = time.perf_counter()
+    if not args.out_of_core:
+        _warm_dataset_cache()
+    staging = registry.stage(MODELS_DIR)
+    tasks = [
+        (name, staging, args.out_of_core, data_paths.get(name), args.chunksize, args.update) for name in names
     ]
-    for name, trainer, input_kind in configs:
-        try:
-            pipe = trainer()
-            if pipe is not None:
-                out = MODELS_DIR / f"{name}.joblib"
-                joblib.dump({"pipeline": pipe, "input": input_kind}, out)
-                print(f"[OK] {name} -> {out}")
-            else:
-                print(f"[SKIP] {name} (no model)")
-        except Exception as e:
-            print(f"[ERR] {name}: {e}")
+    # One fresh process per model; peak_mb is its growth over the RSS it started with.
+    with multiprocessing.Pool(processes=max(1, args.jobs), maxtasksperchild=1) as pool:
+        results = pool.starmap(_train_one, tasks, chunksize=1)
+    for stats in results:
+        if stats["status"] == "OK":
+            print(f"[OK] {stats['name']} -> {stats['message']}")
+        elif stats["status"] == "SKIP":
+            print(f"[SKIP] {stats['name']} ({stats['message']})")
+        else:
+            print(f"[ERR] {stats['name']}: {stats['message']}")
+
+    print(f"\n{'model':<24}{'status':<8}{'wall s':>10}{'+peak MB':>10}{'size MB':>10}")
+    for stats in results:
+        print(
+            f"{stats['name']:<24}{stats['status']:<8}{stats['seconds']:>10.1f}"
+            f"{stats['peak_mb']:>10.0f}{stats['size_mb']:>10.2f}"
+        )
+    print(f"Total wall time: {time.perf_counter() - t0:.1f}s")
+
+    trained = {stats["name"]: stats["manifest"] for stats in results if stats["status"] == "OK"}
+    if not trained:
+        shutil.rmtree(staging, ignore_errors=True)
+        print("No models trained; registry unchanged.")
+    else:
+        version = registry.commit(MODELS_DIR, staging, trained)
+        if args.no_promote:
+            print(f"Registered version {version} (not promoted)")
+        else:
+            registry.promote(MODELS_DIR, version)
+            print(f"Registered and promoted version {version}")
     print("Done.")
 
 
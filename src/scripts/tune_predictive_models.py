@@ -0,0 +1,218 @@
+"""
+Hyperparameter search for the predictive models: accuracy vs inference cost.
+Run from project root: python src/scripts/tune_predictive_models.py [--only NAME] [--jobs N]
+
+For each model, every (vectorizer config, CV fold) pair is featurized once in
+a parallel worker and reused for all classifier settings. Each candidate is
+then refit on the full training data to measure single-article predict_proba
+latency, artifact size, and accuracy on the held-out LIAR-PLUS val2/test2
+splits where they apply. Results go to data/models/tuning/<name>.csv with the
+Pareto frontier (accuracy up, latency and size down) marked and printed.
+
+If a LIAR-PLUS training file is absent, val2 is used for CV and test2 stays held out.
+"""
+
+import argparse
+import io
+import itertools
+import os
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, balanced_accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import Pipeline
+
+# Project root (src/scripts/ -> src/ -> root)
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+from src import datasets  # noqa: E402
+from src.scripts.train_predictive_models import CONFIGS, DATA, INCREMENTAL, MODELS_DIR  # noqa: E402
+
+TUNING_DIR = MODELS_DIR / "tuning"
+
+VECTORIZER_GRID = [
+    {"ngram_range": ngram, "max_features": max_features, "min_df": 2, "max_df": 0.95}
+    for ngram, max_features in itertools.product([(1, 1), (1, 2)], [2_000, 5_000, 20_000, 50_000])
+]
+CLASSIFIER_GRID = [{"C": c} for c in (0.25, 1.0, 4.0)]
+
+# LIAR-PLUS held-out splits for the models trained on data/tsv/train2.tsv.
+HOLDOUT = {
+    "sensationalism": (DATA / "tsv" / "val2.tsv", DATA / "tsv" / "test2.tsv"),
+    "title_vs_body": (DATA / "tsv" / "val2.tsv", DATA / "tsv" / "test2.tsv"),
+}
+
+
+def _make_classifier(params: dict) -> LogisticRegression:
+    return LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42, **params)
+
+
+def _load_xy(name: str, path: Path):
+    kind, xy, _ = INCREMENTAL[name]
+    X, y = xy(datasets.load(path, kind=kind))
+    return np.array(X, dtype=object), np.asarray(y)
+
+
+def _cv_fold(vec_params: dict, X, y, train_idx, val_idx) -> list:
+    """Featurize one fold once, then score every classifier setting on it."""
+    vec = TfidfVectorizer(**vec_params)
+    Xtr = vec.fit_transform(X[train_idx])
+    Xva = vec.transform(X[val_idx])
+    rows = []
+    for clf_params in CLASSIFIER_GRID:
+        clf = _make_classifier(clf_params).fit(Xtr, y[train_idx])
+        rows.append({**clf_params, "accuracy": accuracy_score(y[val_idx], clf.predict(Xva))})
+    return rows
+
+
+def _refit(vec_params: dict, X, y, holdouts: dict, latency_docs: list) -> list:
+    """Fit the vectorizer once on all data, then measure each classifier setting."""
+    vec = TfidfVectorizer(**vec_params).fit(X)
+    Xall = vec.transform(X)
+    held = {split: (vec.transform(Xh), yh) for split, (Xh, yh) in holdouts.items()}
+    rows = []
+    for clf_params in CLASSIFIER_GRID:
+        clf = _make_classifier(clf_params).fit(Xall, y)
+        pipe = Pipeline([("tfidf", vec), ("clf", clf)])
+        buf = io.BytesIO()
+        joblib.dump({"pipeline": pipe}, buf)
+        timings = []
+        for doc in latency_docs:
+            t0 = time.perf_counter()
+            pipe.predict_proba([doc])
+            timings.append(time.perf_counter() - t0)
+        row = {
+            **clf_params,
+            "latency_ms": float(np.median(timings) * 1000) if timings else float("nan"),
+            "size_mb": buf.tell() / (1024 * 1024),
+            "vocabulary": len(vec.vocabulary_),
+        }
+        for split, (Xh, yh) in held.items():
+            pred = clf.predict(Xh)
+            row[f"{split}_accuracy"] = accuracy_score(yh, pred)
+            row[f"{split}_balanced_accuracy"] = balanced_accuracy_score(yh, pred)
+        rows.append(row)
+    return rows
+
+
+def pareto_front(df: pd.DataFrame, acc_col: str) -> pd.Series:
+    """True for rows no other row beats on accuracy, latency and size at once."""
+    acc = df[acc_col].to_numpy()
+    lat = df["latency_ms"].to_numpy()
+    size = df["size_mb"].to_numpy()
+    better_eq = (acc[None, :] >= acc[:, None]) & (lat[None, :] <= lat[:, None]) & (size[None, :] <= size[:, None])
+    strictly = (acc[None, :] > acc[:, None]) | (lat[None, :] < lat[:, None]) | (size[None, :] < size[:, None])
+    return pd.Series(~(better_eq & strictly).any(axis=1), index=df.index)
+
+
+def tune(name: str, folds: int, jobs: int, latency_samples: int, tolerance: float):
+    _, _, _, train_path = next(c for c in CONFIGS if c[0] == name)
+    val_path, test_path = HOLDOUT.get(name, (None, None))
+    holdout_paths = {}
+    if train_path.exists():
+        X, y = _load_xy(name, train_path)
+        if val_path is not None and val_path.exists():
+            holdout_paths["val"] = val_path
+    elif val_path is not None and val_path.exists():
+        print(f"[INFO] {name}: {train_path} not found; cross-validating on {val_path}")
+        X, y = _load_xy(name, val_path)
+    else:
+        print(f"[SKIP] {name}: {train_path} not found")
+        return None
+    if test_path is not None and test_path.exists():
+        holdout_paths["test"] = test_path
+    holdouts = {split: _load_xy(name, path) for split, path in holdout_paths.items()}
+
+    n_splits = min(folds, int(np.bincount(y).min()) if len(y) else 0)
+    if n_splits < 2 or len(np.unique(y)) < 2:
+        print(f"[SKIP] {name}: not enough examples per class for cross-validation")
+        return None
+    splits = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42).split(X, y))
+    print(f"[RUN] {name}: {len(y)} examples, {len(VECTORIZER_GRID)}x{len(CLASSIFIER_GRID)} candidates, {n_splits} folds")
+
+    t0 = time.perf_counter()
+    tasks = [(vi, fi) for vi in range(len(VECTORIZER_GRID)) for fi in range(n_splits)]
+    fold_rows = Parallel(n_jobs=jobs)(
+        delayed(_cv_fold)(VECTORIZER_GRID[vi], X, y, *splits[fi]) for vi, fi in tasks
+    )
+    cv = {}
+    for (vi, _fi), rows in zip(tasks, fold_rows):
+        for row in rows:
+            cv.setdefault((vi, row["C"]), []).append(row["accuracy"])
+
+    rng = np.random.default_rng(0)
+    latency_docs = [str(d) for d in X[rng.choice(len(X), size=min(latency_samples, len(X)), replace=False)]]
+    refits = Parallel(n_jobs=jobs)(
+        delayed(_refit)(vec_params, X, y, holdouts, latency_docs) for vec_params in VECTORIZER_GRID
+    )
+
+    records = []
+    for vi, rows in enumerate(refits):
+        vec_params = VECTORIZER_GRID[vi]
+        for row in rows:
+            scores = cv[(vi, row["C"])]
+            records.append({
+                "ngram_range": f"{vec_params['ngram_range'][0]}-{vec_params['ngram_range'][1]}",
+                "max_features": vec_params["max_features"],
+                "cv_accuracy": float(np.mean(scores)),
+                "cv_accuracy_std": float(np.std(scores)),
+                **row,
+            })
+    df = pd.DataFrame(records)
+    acc_col = "val_accuracy" if "val_accuracy" in df.columns else "cv_accuracy"
+    df["pareto"] = pareto_front(df, acc_col)
+    df = df.sort_values([acc_col, "latency_ms"], ascending=[False, True]).reset_index(drop=True)
+
+    TUNING_DIR.mkdir(parents=True, exist_ok=True)
+    out = TUNING_DIR / f"{name}.csv"
+    df.to_csv(out, index=False)
+
+    front = df[df["pareto"]]
+    cols = ["ngram_range", "max_features", "C", "cv_accuracy"] + [
+        c for c in ("val_accuracy", "test_accuracy") if c in df.columns
+    ] + ["latency_ms", "size_mb"]
+    print(f"\nPareto frontier for {name} ({acc_col} vs latency and size):")
+    print(front[cols].to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    best = df[acc_col].max()
+    ok = df[df[acc_col] >= best - tolerance].sort_values(["latency_ms", "size_mb"])
+    pick = ok.iloc[0]
+    print(
+        f"Smallest/fastest within {tolerance:.3f} of best {acc_col} ({best:.4f}): "
+        f"ngram={pick['ngram_range']} max_features={pick['max_features']} C={pick['C']} "
+        f"({pick[acc_col]:.4f}, {pick['latency_ms']:.2f} ms, {pick['size_mb']:.2f} MB)"
+    )
+    print(f"[OK] {name}: {len(df)} candidates in {time.perf_counter() - t0:.1f}s -> {out}")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune predictive models for accuracy vs inference cost")
+    parser.add_argument("--only", action="append", default=None, help="Tune only this model (repeatable)")
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds (default: 5)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Parallel workers (default: all cores)")
+    parser.add_argument("--latency-samples", type=int, default=200, help="Documents timed per candidate")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.005, help="Accuracy a smaller/faster pick may give up (default: 0.005)"
+    )
+    args = parser.parse_args()
+
+    for name, _, _, _ in CONFIGS:
+        if name not in INCREMENTAL or (args.only and name not in args.only):
+            continue
+        try:
+            tune(name, args.folds, args.jobs, args.latency_samples, args.tolerance)
+        except Exception as e:
+            print(f"[ERR] {name}: {e}")
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
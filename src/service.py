@@ -0,0 +1,400 @@
+"""
+Async HTTP scoring service (stdlib asyncio, HTTP/1.1 with keep-alive).
+
+    python -m src.service --pattern simple_prompt [--port 8080] [--stub]
+
+Endpoints:
+    GET  /healthz      status, load, counters and model version
+    POST /score        {"title", "body_text", "url"?, "evidence_k"?} -> run() result
+    POST /score/batch  {"articles": [{...}, ...]} -> {"results": [...]}
+
+Identical articles that are already in flight (same content hash and
+options) are computed once and every caller gets the same result. At most
+`concurrency` pipelines run at once and at most `queue` more wait; requests
+beyond that get 429 with Retry-After instead of piling up. On SIGINT/SIGTERM
+the listener closes, new requests get 503, and in-flight work gets up to
+--drain-timeout seconds to finish. --stub serves with src.stub_model.StubLlm,
+so the service runs and can be tested locally without an API key.
+
+Within `concurrency`, an AIMD controller (src/concurrency.py) sets how many
+pipelines actually run, and an open circuit breaker turns requests into
+degraded results ("degraded": true, no scores) until the backend recovers.
+Both report their state under /healthz.
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from google.adk.apps import App
+
+from src.app import BACKENDS, PATTERNS, app_factors, create_app
+from src.concurrency import AIMDLimiter, CircuitOpen, ModelGuard, degraded_result
+from src.models import get_current_models, get_predictive_scores
+from src.run import article_hash, run
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BATCH = 256
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def parse_article(payload: Any) -> Dict[str, Any]:
+    """Validate one article payload; raises HttpError(400) if title/body_text are missing."""
+    if not isinstance(payload, dict):
+        raise HttpError(400, "article must be a JSON object")
+    missing = [k for k in ("title", "body_text") if not isinstance(payload.get(k), str)]
+    if missing:
+        raise HttpError(400, f"missing string fields: {', '.join(missing)}")
+    evidence_k = payload.get("evidence_k")
+    if evidence_k is not None and (not isinstance(evidence_k, int) or evidence_k < 1):
+        raise HttpError(400, "evidence_k must be a positive integer")
+    return {
+        "title": payload["title"],
+        "body_text": payload["body_text"],
+        "url": str(payload.get("url") or ""),
+        "evidence_k": evidence_k,
+    }
+
+
+class ScoringService:
+    """
+    Admission, coalescing and execution for one app; `handle` is the
+    asyncio.start_server connection callback.
+    """
+
+    def __init__(
+        self,
+        app_instance: App,
+        concurrency: int = 8,
+        queue: int = 64,
+        predictive: bool = True,
+        models_dir: Optional[Path] = None,
+        guard: Optional[ModelGuard] = None,
+    ):
+        self.app_instance = app_instance
+        self.guard = guard
+        self.concurrency = max(1, int(concurrency))
+        self.capacity = self.concurrency + max(0, int(queue))
+        self.predictive = predictive
+        self.models_dir = models_dir
+        self.draining = False
+        self.running = 0
+        self.counters = {"requests": 0, "coalesced": 0, "rejected": 0, "completed": 0, "failed": 0, "degraded": 0}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._busy: Set[asyncio.Task] = set()
+
+    # -- scoring -------------------------------------------------------------
+
+    def _key(self, article: Dict[str, Any]) -> str:
+        return f"{article_hash(article['title'], article['body_text'])}:{article['url']}:{article['evidence_k']}"
+
+    def _admit(self, new: int) -> None:
+        if self.draining:
+            raise HttpError(503, "service is draining")
+        if len(self._inflight) + new > self.capacity:
+            self.counters["rejected"] += 1
+            raise HttpError(429, "too many requests in flight", {"Retry-After": "1"})
+
+    async def _compute(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._semaphore:
+            self.running += 1
+            try:
+                predictive_scores = None
+                if self.predictive:
+                    models = get_current_models(self.models_dir)
+                    loop = asyncio.get_running_loop()
+                    predictive_scores = await loop.run_in_executor(
+                        None,
+                        lambda: get_predictive_scores(
+                            article["title"], article["body_text"], article["url"], models=models
+                        ),
+                    )
+
+                def score():
+                    return run(
+                        article_title=article["title"],
+                        article_content=article["body_text"],
+                        article_url=article["url"],
+                        predictive_scores=predictive_scores or None,
+                        app_instance=self.app_instance,
+                        evidence_k=article["evidence_k"],
+                    )
+
+                result = await (self.guard.run(score) if self.guard is not None else score())
+                self.counters["completed"] += 1
+                return result
+            except CircuitOpen as e:
+                self.counters["degraded"] += 1
+                return degraded_result(str(e), [f[2] for f in app_factors(self.app_instance)])
+            except Exception:
+                self.counters["failed"] += 1
+                raise
+            finally:
+                self.running -= 1
+
+    def _submit(self, key: str, article: Dict[str, Any]) -> asyncio.Future:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+            return future
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        future = asyncio.ensure_future(self._compute(article))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _f: self._inflight.pop(key, None))
+        return future
+
+    async def score(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Score one article, joining an identical in-flight computation if there is one."""
+        key = self._key(article)
+        self._admit(0 if key in self._inflight else 1)
+        self.counters["requests"] += 1
+        # shield: a caller that disconnects must not cancel work others are waiting on.
+        return await asyncio.shield(self._submit(key, article))
+
+    async def score_batch(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score a batch; admitted as a whole so it is never half-rejected."""
+        keys = [self._key(a) for a in articles]
+        self._admit(len(set(keys) - set(self._inflight)))
+        self.counters["requests"] += len(articles)
+        futures = [self._submit(key, a) for key, a in zip(keys, articles)]
+        results = await asyncio.gather(*(asyncio.shield(f) for f in futures), return_exceptions=True)
+        return [
+            {"error": f"{type(r).__name__}: {r}"} if isinstance(r, BaseException) else r
+            for r in results
+        ]
+
+    def health(self) -> Dict[str, Any]:
+        models = get_current_models(self.models_dir) if self.predictive else None
+        return {
+            "status": "draining" if self.draining else "ok",
+            "app": self.app_instance.name,
+            "running": self.running,
+            "in_flight": len(self._inflight),
+            "capacity": self.capacity,
+            "model_version": getattr(models, "version", None),
+            **self.counters,
+            **(self.guard.metrics() if self.guard is not None else {}),
+        }
+
+    # -- HTTP ----------------------------------------------------------------
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        if path == "/healthz":
+            if method != "GET":
+                raise HttpError(405, "use GET")
+            return (503 if self.draining else 200), self.health(), {}
+        if path not in ("/score", "/score/batch"):
+            raise HttpError(404, f"no route for {path}")
+        if method != "POST":
+            raise HttpError(405, "use POST")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise HttpError(400, "body is not valid JSON")
+        if path == "/score":
+            return 200, await self.score(parse_article(payload)), {}
+        articles = payload.get("articles") if isinstance(payload, dict) else None
+        if not isinstance(articles, list) or not articles:
+            raise HttpError(400, "expected {\"articles\": [...]}")
+        if len(articles) > MAX_BATCH:
+            raise HttpError(413, f"at most {MAX_BATCH} articles per batch")
+        return 200, {"results": await self.score_batch([parse_article(a) for a in articles])}, {}
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "malformed request line")
+        headers = {}
+        while True:
+            raw = await reader.readline()
+            if raw in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = raw.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], version, headers, body
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, payload: Any, headers: Dict[str, str], keep_alive: bool) -> None:
+        data = json.dumps(payload, default=str).encode("utf-8")
+        lines = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(data)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            *(f"{k}: {v}" for k, v in headers.items()),
+        ]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        task = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    self._write(writer, e.status, {"error": str(e)}, e.headers, keep_alive=False)
+                    await writer.drain()
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, path, version, headers, body = request
+                self._busy.add(task)
+                try:
+                    status, payload, extra = await self.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                except Exception as e:
+                    status, payload, extra = 500, {"error": f"{type(e).__name__}: {e}"}, {}
+                finally:
+                    self._busy.discard(task)
+                keep_alive = (
+                    version == "HTTP/1.1" and headers.get("connection", "").lower() != "close" and not self.draining
+                )
+                self._write(writer, status, payload, extra, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    # -- lifecycle -----------------------------------------------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Warm the predictive models, start listening, and return the bound port."""
+        if self.predictive:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, get_current_models, self.models_dir)
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def shutdown(self, timeout: float = 30.0) -> int:
+        """Stop accepting, let in-flight work finish (up to timeout), close connections.
+        Returns the number of computations still unfinished at the deadline."""
+        self.draining = True
+        if self._server is not None:
+            self._server.close()
+        pending = list(self._inflight.values()) + list(self._busy)
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        left = sum(1 for f in self._inflight.values() if not f.done())
+        for writer in list(self._writers):
+            writer.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+        return left
+
+
+async def serve(service: ScoringService, host: str, port: int, drain_timeout: float) -> None:
+    """Run until SIGINT/SIGTERM, then drain."""
+    bound = await service.start(host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    print(f"[OK] Serving {service.app_instance.name} on http://{host}:{bound}")
+    await stop.wait()
+    print(f"[INFO] Draining ({len(service._inflight)} in flight, up to {drain_timeout:.0f}s)")
+    left = await service.shutdown(drain_timeout)
+    if left:
+        print(f"[ERR] Stopped with {left} requests unfinished")
+    else:
+        print("[OK] Stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the factuality pipeline over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pattern", choices=PATTERNS, default="simple_prompt", help="Prompting pattern to serve")
+    parser.add_argument("--concurrency", type=int, default=8, help="Most pipelines running at once (default: 8)")
+    parser.add_argument(
+        "--fixed-concurrency", action="store_true", help="Always run --concurrency at once (no AIMD or circuit breaker)"
+    )
+    parser.add_argument("--queue", type=int, default=64, help="Admitted requests waiting beyond --concurrency (default: 64)")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to finish in-flight work on shutdown")
+    parser.add_argument("--no-predictive", action="store_true", help="Skip the predictive model scores")
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default="gemini", help="gemini, or an OpenAI-compatible server (OPENAI_BASE_URL)"
+    )
+    parser.add_argument("--model", default=None, help="Model name (default: gemini-2.5-flash / OPENAI_MODEL)")
+    parser.add_argument("--stub", action="store_true", help="Use the deterministic stand-in LLM (no API key needed)")
+    parser.add_argument("--stub-delay", type=float, default=0.0, help="Seconds each stub LLM call takes")
+    parser.add_argument("--rpm", type=float, default=None, help="Host-wide LLM requests per minute (src/ratelimit.py)")
+    parser.add_argument("--tpm", type=float, default=None, help="Host-wide LLM tokens per minute (needs --rpm)")
+    args = parser.parse_args()
+    if args.tpm and not args.rpm:
+        parser.error("--tpm requires --rpm")
+
+    model = args.model
+    if args.stub:
+        if args.backend != "gemini":
+            parser.error("--stub replaces the backend; drop --backend")
+        from src.stub_model import StubLlm
+
+        model = StubLlm(delay=args.stub_delay)
+    else:
+        from dotenv import load_dotenv
+
+        load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+    hooks = []
+    if args.rpm:
+        from src.ratelimit import RateLimiter
+
+        hooks.append(RateLimiter(args.rpm, args.tpm))
+    service = ScoringService(
+        create_app(args.pattern, model=model, model_hooks=hooks, backend=args.backend),
+        concurrency=args.concurrency,
+        queue=args.queue,
+        predictive=not args.no_predictive,
+        guard=None if args.fixed_concurrency else ModelGuard(AIMDLimiter(initial=2, max_limit=args.concurrency)),
+    )
+    asyncio.run(serve(service, args.host, args.port, args.drain_timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Deterministic stand-in LLM for running the pipeline without an API key.
+
+StubLlm answers factor agents with {"score", "explanation"} and the combiner
+with {"combined_veracity_score", "overall_assessment"} (the mean of the
+factor scores it was given). Scores are derived from a hash of the request,
+so the same article always gets the same result. Use it through
+create_app(pattern, model=StubLlm()) for local serving, tests and load runs.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+from typing import AsyncGenerator
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from src.llm_text import content_text
+
+_SCORE = re.compile(r'"score"\s*:\s*(-?\d+(?:\.\d+)?)')
+
+
+class StubLlm(BaseLlm):
+    """BaseLlm that returns deterministic JSON after an optional fixed delay."""
+
+    model: str = "stub"
+    delay: float = 0.0
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        config = getattr(llm_request, "config", None)
+        system = content_text(getattr(config, "system_instruction", None))
+        prompt = "\n".join(content_text(c) for c in llm_request.contents or [])
+        digest = hashlib.sha256((system + "\x00" + prompt).encode("utf-8")).digest()
+        if "combined_veracity_score" in system:
+            scores = [float(s) for s in _SCORE.findall(system)]
+            combined = round(sum(scores) / len(scores), 1) if scores else float(digest[0] % 11)
+            payload = {
+                "combined_veracity_score": combined,
+                "overall_assessment": f"Stub assessment from {len(scores)} factor scores.",
+            }
+        else:
+            payload = {"score": digest[0] % 11, "explanation": "Stub evaluation."}
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=json.dumps(payload))]))
@@ -0,0 +1,105 @@
+"""Test batch article reading and concurrent batch runs with the stand-in LLM."""
+
+import asyncio
+import io
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def test_read_articles_csv_and_jsonl():
+    from src.batch import read_articles
+
+    csv_rows = read_articles(io.StringIO("title,body_text\nA,Body A\nB,\n"), fmt="csv")
+    assert csv_rows == [
+        {"url": "", "title": "A", "body_text": "Body A"},
+        {"url": "", "title": "B", "body_text": ""},
+    ]
+
+    jsonl = b'{"url": "u", "title": "T", "body_text": "X", "source": "cnn"}\n\n'
+    assert read_articles(io.BytesIO(jsonl), fmt="jsonl") == [{"url": "u", "title": "T", "body_text": "X"}]
+
+
+def test_read_articles_missing_columns():
+    from src.batch import read_articles
+
+    try:
+        read_articles(io.StringIO("headline\nA\n"), fmt="csv")
+    except ValueError as e:
+        assert "body_text" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def _counting_llm(delay):
+    from src.stub_model import StubLlm
+
+    class CountingLlm(StubLlm):
+        """StubLlm that records the peak number of concurrent model calls."""
+
+        active: int = 0
+        peak: int = 0
+
+        async def generate_content_async(self, llm_request, stream=False):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                async for response in super().generate_content_async(llm_request, stream=stream):
+                    yield response
+            finally:
+                self.active -= 1
+
+    return CountingLlm(delay=delay)
+
+
+def _rows(n):
+    return [{"url": "", "title": f"Title {i}", "body_text": f"Body {i}."} for i in range(n)]
+
+
+def test_batch_concurrency_is_bounded():
+    from src.app import create_app
+    from src.batch import BatchJob
+
+    llm = _counting_llm(0.05)
+    job = BatchJob(_rows(5), create_app("simple_prompt", model=llm), concurrency=2)
+    asyncio.run(job.run())
+    assert job.completed == job.total == 5
+    assert job.failed_indices() == []
+    # Six factor calls run in parallel per article; two articles at most.
+    assert 6 < llm.peak <= 12
+
+
+def test_batch_cancel_and_retry():
+    from src.app import create_app
+    from src.batch import BatchJob
+
+    llm = _counting_llm(0.2)
+    job = BatchJob(_rows(4), create_app("simple_prompt", model=llm), concurrency=1)
+
+    async def cancel_soon():
+        task = asyncio.ensure_future(job.run())
+        await asyncio.sleep(0.1)
+        job.cancel()
+        await task
+
+    asyncio.run(cancel_soon())
+    # Rows still waiting for the semaphore count as completed and failed too.
+    assert job.completed == job.total == 4
+    assert job.errors == ["cancelled"] * 4
+    assert job.failed_indices() == [0, 1, 2, 3]
+
+    llm.delay = 0.0
+    asyncio.run(job.run(job.failed_indices()[1:]))
+    assert job.completed == job.total == 3
+    assert job.failed_indices() == [0]
+    assert job.results[1]["combined_veracity_score"] is not None
+
+
+if __name__ == "__main__":
+    test_read_articles_csv_and_jsonl()
+    test_read_articles_missing_columns()
+    test_batch_concurrency_is_bounded()
+    test_batch_cancel_and_retry()
+    print("OK")
@@ -0,0 +1,41 @@
+"""Test recording model calls to a cassette and replaying them without the model."""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def test_replay_matches_recording_without_model_calls():
+    from src.app import create_app
+    from src.cassette import CassetteMiss, cassette_model
+    from src.run import run
+    from src.stub_model import StubLlm
+
+    path = os.path.join(tempfile.mkdtemp(), "cot.jsonl.gz")
+    stub = StubLlm()
+    recorder = cassette_model(path, mode="record", model=stub)
+    assert recorder  # an empty cassette is still a model, not a falsy value
+    recorded = asyncio.run(run("Title", "Body text.", app_instance=create_app("cot", model=recorder)))
+    assert stub.calls == 7 and recorder.size == 7
+
+    player = cassette_model(path, mode="replay", model="stub")
+    assert player.inner is None and player.size == 7
+    replayed = asyncio.run(run("Title", "Body text.", app_instance=create_app("cot", model=player)))
+    assert replayed["factor_scores"] == recorded["factor_scores"]
+    assert replayed["combined_veracity_score"] == recorded["combined_veracity_score"]
+    assert player.hits == 7 and player.misses == 0 and stub.calls == 7
+
+    # A request that was never recorded is a miss, not a model call.
+    try:
+        asyncio.run(run("Other title", "Other body.", app_instance=create_app("cot", model=player)))
+    except CassetteMiss:
+        pass
+    assert player.misses > 0 and stub.calls == 7
+
+
+if __name__ == "__main__":
+    test_replay_matches_recording_without_model_calls()
@@ -0,0 +1,105 @@
+"""Test the AIMD limiter and circuit breaker with a fake backend."""
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+class _Throttled(Exception):
+    code = 429
+
+
+def test_aimd_backs_off_and_breaker_fails_fast():
+    from src.concurrency import AIMDLimiter, CircuitBreaker, CircuitOpen, ModelGuard
+
+    async def scenario():
+        guard = ModelGuard(AIMDLimiter(initial=4, max_limit=8), CircuitBreaker(failure_threshold=3, reset_timeout=60))
+
+        async def ok():
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        async def throttled():
+            raise _Throttled("429 RESOURCE_EXHAUSTED")
+
+        for _ in range(20):
+            assert await guard.run(ok) == "ok"
+        grown = guard.limiter.limit
+        assert grown > 4
+
+        for _ in range(3):
+            try:
+                await guard.run(throttled)
+            except _Throttled:
+                pass
+        assert guard.limiter.limit <= grown / 2
+        assert guard.breaker.state == "open"
+
+        calls = []
+        try:
+            await guard.run(lambda: calls.append(1) or ok())
+        except CircuitOpen:
+            pass
+        assert calls == []
+        assert guard.metrics()["circuit"]["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancel_while_probing_frees_the_probe():
+    from src.concurrency import AIMDLimiter, CircuitBreaker, ModelGuard
+
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        guard = ModelGuard(AIMDLimiter(initial=1, max_limit=1), breaker)
+        release = asyncio.Event()
+
+        async def hold_slot():
+            async with guard.limiter.slot():
+                await release.wait()
+
+        async def ok():
+            return "ok"
+
+        holder = asyncio.ensure_future(hold_slot())
+        await asyncio.sleep(0)
+        probe = asyncio.ensure_future(guard.run(ok))  # half-open probe, waits for the slot
+        await asyncio.sleep(0.01)
+        assert breaker.state == "half_open"
+        probe.cancel()
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+        release.set()
+        await holder
+        assert await guard.run(ok) == "ok"  # the probe was handed back
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_degraded_result_lists_the_app_factors():
+    from src.app import create_app
+    from src.batch import BatchJob
+    from src.concurrency import AIMDLimiter, CircuitBreaker, ModelGuard, degraded_result
+    from src.stub_model import StubLlm
+
+    assert len(degraded_result("down")["factor_scores"]) == 6
+    assert degraded_result("down", ["toxicity_level"])["explanations"] == {"toxicity_level": ""}
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    job = BatchJob(
+        [{"title": "T", "body_text": "B"}],
+        create_app("simple_prompt", model=StubLlm(), factors=["toxicity", "clickbait"]),
+        guard=ModelGuard(AIMDLimiter(), breaker),
+    )
+    asyncio.run(job.run())
+    assert job.errors == ["circuit open"]
+    assert set(job.results[0]["factor_scores"]) == {"clickbait_level", "toxicity_level"}
+    assert job.results[0]["degraded"] is True
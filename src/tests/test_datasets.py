@@ -0,0 +1,92 @@
+"""Test dataset readers and the columnar cache."""
+
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def test_liar_tsv_and_jsonl_share_schema(tmp_path):
+    from src import datasets
+
+    tsv = tmp_path / "tsv" / "mini.tsv"
+    tsv.parent.mkdir()
+    tsv.write_text(
+        "0\t1.json\tTrue\tA claim.\teconomy\tbob\tGov\tTexas\trepublican\t1\t2\t3\t4\t5\tradio\tIt checks out.\n"
+    )
+    jsonl = tmp_path / "jsonl" / "mini.jsonl"
+    jsonl.parent.mkdir()
+    jsonl.write_text(json.dumps({
+        "json_file_id": "2.json", "label": "false", "claim": "Other claim.", "topics": ["a", "b"],
+        "originator": "amy", "title": "Senator", "party": "Ohio", "justification": "Nope.",
+    }) + "\n")
+
+    t = datasets.load(tsv, cache_dir=tmp_path / "cache")
+    j = datasets.load(jsonl, cache_dir=tmp_path / "cache")
+    assert list(t.columns) == list(j.columns) == datasets.SCHEMAS["liar"]
+    assert t["label"][0] == "true" and t["justification"][0] == "It checks out."
+    assert j["subjects"][0] == "a,b" and j["statement"].tolist() == ["Other claim."]
+
+
+def test_cache_is_reused_and_keyed_by_content(tmp_path):
+    from src import datasets
+
+    path = tmp_path / "pol-new" / "train.txt"
+    path.parent.mkdir()
+    path.write_text("0\tfirst text\n1\tsecond text\nbad line\n")
+    cache = tmp_path / "cache"
+
+    first = datasets.load(path, cache_dir=cache)
+    assert len(first) == 2
+    assert first["label"].tolist() == [0, 1]
+    assert first["text"].tolist() == ["first text", "second text"]
+    entries = [p for p in cache.iterdir() if p.is_dir()]
+    assert len(entries) == 1
+
+    datasets.load(path, cache_dir=cache)
+    assert len([p for p in cache.iterdir() if p.is_dir()]) == 1
+
+    path.write_text("1\tchanged\n")
+    assert datasets.load(path, cache_dir=cache)["text"].tolist() == ["changed"]
+    assert len([p for p in cache.iterdir() if p.is_dir()]) == 2
+
+
+def test_chunked_reader(tmp_path):
+    from src import datasets
+
+    path = tmp_path / "pol-new" / "train.txt"
+    path.parent.mkdir()
+    path.write_text("".join(f"{i % 2}\ttext {i}\n" for i in range(5)))
+    sizes = [len(chunk) for chunk in datasets.iter_chunks(path, chunksize=2)]
+    assert sizes == [2, 2, 1]
+
+
+def test_string_dtype_columns_are_cached_as_text(tmp_path):
+    import pandas as pd
+
+    from src import datasets
+
+    # pandas >= 3 reads text as the "str" dtype instead of object; it must still be memory-mappable.
+    chunk = pd.DataFrame({"text": pd.Series(["a", "bé"], dtype="string"), "label": [0, 1]})
+    meta = datasets._write_columns(iter([chunk]), tmp_path)
+    (tmp_path / "meta.json").write_text(json.dumps(meta))
+    assert {c["name"]: c["type"] for c in meta["columns"]} == {"text": "text", "label": "numeric"}
+    table = datasets._read_columns(tmp_path)
+    assert table["text"].tolist() == ["a", "bé"] and table["label"].tolist() == [0, 1]
+
+
+def test_digest_memo_is_shared(tmp_path):
+    from src import datasets
+
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    a.write_text("one")
+    b.write_text("two")
+    cache = tmp_path / "cache"
+    assert datasets.cached_digest(a, cache) == datasets.file_digest(a)
+    datasets.cached_digest(b, cache)
+    memo = json.loads((cache / "digests.json").read_text())
+    assert len(memo) == 2
+    assert [p.name for p in cache.iterdir()] == ["digests.json"]
+
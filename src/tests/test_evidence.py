@@ -0,0 +1,39 @@
+"""Test sentence splitting and evidence selection with a stand-in scorer."""
+
+import os
+import sys
+
+import numpy as np
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+class _Vocabulary:
+    """transform stand-in: one column per word in the vocabulary."""
+
+    def __init__(self, words):
+        self.words = words
+
+    def transform(self, texts):
+        return np.array([[float(w in t) for w in self.words] for t in texts])
+
+
+def test_select_evidence_ranks_sentences_per_factor():
+    from src.evidence import SentenceScorer, select_evidence, split_sentences
+
+    text = "The mayor opened a new library today. This is the most SHOCKING scandal ever! Residents were mostly pleased."
+    spans = split_sentences(text)
+    assert [text[a:b] for a, b in spans][1] == "This is the most SHOCKING scandal ever!"
+
+    weights = np.array([[4.0, 0.0], [0.0, 4.0]], dtype=np.float32)
+    scorer = SentenceScorer(
+        _Vocabulary(["shocking", "pleased"]), weights, np.array([-2.0, -2.0]), ["sensationalism", "sentiment"]
+    )
+    evidence = select_evidence(text, k=1, scorer=scorer)
+
+    top = evidence["sensationalism"][0]
+    assert top["sentence"].startswith("This is the most SHOCKING")
+    assert text[top["start"]:top["end"]] == top["sentence"]
+    assert evidence["sentiment"][0]["sentence"] == "Residents were mostly pleased."
+    assert top["score"] > 0.8
@@ -0,0 +1,65 @@
+"""Test running the pipeline on a subset of the factuality factors."""
+
+import asyncio
+import gc
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def test_factor_subset_runs_only_selected_agents():
+    from src.app import app_factors, create_app, factor_subset_app
+    from src.run import run
+    from src.stub_model import StubLlm
+
+    stub = StubLlm()
+    full = create_app("simple_prompt", model=stub)
+    result = asyncio.run(run("Title", "Body text.", app_instance=full, factors=["toxicity", "clickbait_level"]))
+    assert stub.calls == 3  # two factor agents + combiner instead of seven calls
+    assert set(result["factor_scores"]) == {"clickbait_level", "toxicity_level"}
+    scores = list(result["factor_scores"].values())
+    assert result["combined_veracity_score"] == round(sum(scores) / len(scores), 1)
+
+    subset = factor_subset_app(full, ["clickbait", "toxicity"])
+    assert factor_subset_app(full, ["toxicity_level", "clickbait"]) is subset
+    assert [f[2] for f in app_factors(subset)] == ["clickbait_level", "toxicity_level"]
+    assert len(app_factors(full)) == 6
+
+    for pattern in ("cot", "fcot"):
+        app_instance = create_app(pattern, model=stub, factors=["sentiment"])
+        assert app_instance.name == f"factuality_evaluator_{pattern}__sentiment"
+        result = asyncio.run(run("Title", "Body text.", app_instance=app_instance))
+        assert list(result["factor_scores"]) == ["sentiment_bias"]
+        assert result["combined_veracity_score"] == result["factor_scores"]["sentiment_bias"]
+
+
+def test_subset_cache_does_not_keep_apps_alive():
+    from src import app as app_module
+    from src.stub_model import StubLlm
+
+    base = app_module.create_app("basic_cot", model=StubLlm())
+    subset = app_module.factor_subset_app(base, ["toxicity"])
+    ids = [id(base), id(subset)]
+    assert all(i in app_module._APP_SPECS for i in ids)
+    del base, subset
+    gc.collect()
+    assert not any(i in app_module._APP_SPECS for i in ids)
+
+
+def test_unknown_factor_is_rejected():
+    from src.app import select_factors
+
+    try:
+        select_factors(["toxicity", "credibility"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_factor_subset_runs_only_selected_agents()
+    test_subset_cache_does_not_keep_apps_alive()
+    test_unknown_factor_is_rejected()
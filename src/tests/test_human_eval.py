@@ -0,0 +1,123 @@
+"""Test src.human_eval and the sampling/bootstrap helpers of scripts/compute_generative_human_eval.py."""
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def _labeled(errors):
+    """Truth frame and predictions with a fixed absolute error per article for every factor."""
+    import pandas as pd
+
+    from src.human_eval import FACTOR_MAP
+
+    truth = pd.DataFrame({csv_col: [5.0] * len(errors) for csv_col, _ in FACTOR_MAP})
+    predictions = {csv_col: [5.0 + e for e in errors] for csv_col, _ in FACTOR_MAP}
+    return truth, predictions
+
+
+def test_compute_metrics():
+    from src.human_eval import compute_metrics
+
+    m = compute_metrics([1, 2, 3, float("nan")], [2, 4, 3, 5])
+    assert m["mae"] == 1.0 and m["human_eval_pct"] == 90.0
+    assert round(m["pct_within_2"], 6) == 100.0 and m["pearson"] is not None
+    assert compute_metrics([float("nan")], [1])["mae"] is None
+
+
+def test_iter_run_logs_skips_bad_lines(tmp_path):
+    from src.human_eval import iter_run_logs
+
+    log = tmp_path / "experiments.jsonl"
+    log.write_text('{"app": "a"}\n\nnot json\n{"app": "b"}\n')
+    assert [r["app"] for r in iter_run_logs([log])] == ["a", "b"]
+
+
+def test_stratified_order_mixes_sources_deterministically():
+    import pandas as pd
+
+    from scripts.compute_generative_human_eval import stratified_order
+
+    df = pd.DataFrame({"source": ["a"] * 6 + ["b"] * 3, "id": range(9)})
+    first = stratified_order(df, seed=3)
+    assert first["id"].tolist() == stratified_order(df, seed=3)["id"].tolist()
+    assert sorted(first["id"]) == list(range(9))
+    # Every prefix of three rows already holds both sources, in roughly 2:1 proportion.
+    for start in range(0, 9, 3):
+        assert first["source"].iloc[start : start + 3].tolist().count("b") == 1
+    shuffled = stratified_order(df.drop(columns="source"), seed=3)
+    assert sorted(shuffled["id"]) == list(range(9))
+
+
+def test_bootstrap_intervals():
+    import numpy as np
+
+    from scripts.compute_generative_human_eval import bootstrap_intervals
+
+    exact = bootstrap_intervals([3, 4, 5], [3, 4, 5], n_boot=200)
+    assert exact == {"n": 3, "mae_ci": (0.0, 0.0), "human_eval_pct_ci": (100.0, 100.0)}
+
+    off_by_two = bootstrap_intervals([1, 2, float("nan")], [3, 4, 5], n_boot=200)
+    assert off_by_two["n"] == 2
+    assert off_by_two["mae_ci"] == (2.0, 2.0) and off_by_two["human_eval_pct_ci"] == (80.0, 80.0)
+
+    pred, truth = [0, 1, 2, 3, 4, 5, 6, 7], [0] * 8
+    a = bootstrap_intervals(pred, truth, n_boot=500, rng=np.random.default_rng(1))
+    b = bootstrap_intervals(pred, truth, n_boot=500, rng=np.random.default_rng(1))
+    assert a == b
+    lo, hi = a["mae_ci"]
+    assert lo < 3.5 < hi
+    assert a["human_eval_pct_ci"] == (100 - hi * 10, 100 - lo * 10)
+
+    assert bootstrap_intervals([], [])["mae_ci"] == (None, None)
+
+
+def test_overall_interval():
+    import numpy as np
+
+    from scripts.compute_generative_human_eval import _overall_interval
+
+    truth, predictions = _labeled([1.0, 1.0, float("nan"), 1.0])
+    lo, hi = _overall_interval(predictions, truth, 200, 0.05, np.random.default_rng(0))
+    assert (round(lo, 6), round(hi, 6)) == (90.0, 90.0)
+
+    truth, predictions = _labeled([float("nan")] * 3)
+    assert _overall_interval(predictions, truth, 200, 0.05, np.random.default_rng(0)) == (None, None)
+
+
+if __name__ == "__main__":
+    test_compute_metrics()
+    test_stratified_order_mixes_sources_deterministically()
+    test_bootstrap_intervals()
+    test_overall_interval()
+
+
+def test_replay_matches_full_and_truncated_hashes(tmp_path):
+    import json
+
+    import pandas as pd
+
+    from scripts.compute_generative_human_eval import replay_predictions
+    from src.human_eval import FACTOR_MAP
+    from src.run import article_hash
+
+    full = "x" * 9000
+    df = pd.DataFrame({
+        "title": ["A", "B"],
+        "body_text": [full[:8000], "short"],
+        "full_article_hash": [article_hash("A", full), article_hash("B", "short")],
+    })
+    records = [
+        {"app": "factuality_evaluator_cot", "article_hash": article_hash("A", full), "factor_scores": {"toxicity_level": 3}},
+        {"app": "factuality_evaluator_cot", "article_hash": article_hash("B", "short"), "factor_scores": {"toxicity_level": 7}},
+        {"app": "factuality_evaluator_cot", "article_hash": "unknown", "factor_scores": {}},
+        {"app": "factuality_evaluator_fcot", "article_hash": "unknown", "factor_scores": {}},
+    ]
+    log = tmp_path / "experiments.jsonl"
+    log.write_text("".join(json.dumps(r) + "\n" for r in records))
+    predictions, unmatched = replay_predictions(df, [log], ["cot"])
+    toxicity = next(csv_col for csv_col, key in FACTOR_MAP if key == "toxicity_level")
+    assert predictions["cot"][toxicity] == [3.0, 7.0]
+    assert unmatched == 1
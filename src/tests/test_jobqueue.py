@@ -0,0 +1,36 @@
+"""Test job leasing, lease expiry and stale-result rejection in the SQLite queue."""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def test_expired_lease_is_retried_once():
+    from src.jobqueue import JobQueue
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(Path(tmp) / "jobs.sqlite", max_attempts=2)
+        rows = [{"title": "A", "body_text": "x"}, {"title": "B", "body_text": "y"}]
+        assert queue.enqueue(rows, "simple_prompt") == 2
+        assert queue.enqueue(rows[:1], "simple_prompt") == 0
+
+        # Worker 1 leases both and "dies"; worker 2 picks them up after expiry.
+        stale = queue.lease("w1", n=2, lease_seconds=0.05)
+        assert queue.lease("w2", n=2) == []
+        time.sleep(0.1)
+        fresh = queue.lease("w2", n=2)
+        assert [j["attempts"] for j in fresh] == [2, 2]
+
+        assert not queue.complete(stale[0], "w1", {"combined_veracity_score": 1})
+        assert queue.complete(fresh[0], "w2", {"combined_veracity_score": 2})
+        assert queue.fail(fresh[1], "w2", "boom")  # second attempt: final
+
+        stats = queue.stats()
+        assert (stats["done"], stats["failed"], stats["pending"]) == (1, 1, 0)
+        assert [j["result"] for j in queue.results() if j["status"] == "done"] == [{"combined_veracity_score": 2}]
+        queue.close()
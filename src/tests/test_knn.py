@@ -0,0 +1,41 @@
+"""Test kNN factor scores on a tiny labeled corpus."""
+
+import os
+import sys
+
+import numpy as np
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def test_knn_scores_follow_nearest_labels():
+    from src.knn import KNNIndex
+
+    titles = [
+        "Senate passes budget",
+        "Budget vote in the Senate",
+        "SHOCKING celebrity scandal",
+        "You won't believe this scandal",
+    ]
+    bodies = [
+        "The senate approved the annual budget after a long debate on spending.",
+        "Lawmakers in the senate voted on the budget and spending bill.",
+        "A shocking scandal rocked the celebrity world, fans are outraged.",
+        "Fans are outraged by the shocking celebrity scandal nobody saw coming.",
+    ]
+    labels = np.zeros((4, 6))
+    labels[2:, 2] = 8.0  # sensationalism
+    labels[:2, 2] = 1.0
+    labels[3, 0] = np.nan  # unlabeled political_affiliation is ignored
+
+    for n_lists in (0, 2):
+        index = KNNIndex.build(titles, bodies, labels, n_components=3, n_lists=n_lists)
+        [result] = index.query(["Celebrity scandal"], ["Another shocking scandal has fans outraged."], k=2, n_probe=2)
+        assert result["factor_scores"]["sensationalism"] > 6
+        assert result["factor_scores"]["political_affiliation_bias"] == 0.0
+        assert "scandal" in result["neighbors"][0]["title"].lower()
+
+    loo = index.leave_one_out(k=1)
+    assert loo.shape == (4, 6)
+    assert loo[0, 2] == 1.0 and loo[2, 2] == 8.0
@@ -0,0 +1,52 @@
+"""Test that the open-loop driver measures queueing and batches arrivals."""
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+class _Rejected(Exception):
+    status = 429
+
+
+def test_open_loop_latency_includes_queueing():
+    from src import loadgen
+
+    lock = asyncio.Lock()
+    calls = []
+
+    async def target(articles):
+        calls.append(len(articles))
+        if articles[0]["title"] == "reject":
+            raise _Rejected("busy")
+        async with lock:  # capacity 1
+            await asyncio.sleep(0.02)
+        return [{"factor_scores": {}} for _ in articles]
+
+    articles = [{"title": "a", "body_text": "x" * 10}] * 5 + [{"title": "reject", "body_text": "y"}]
+    arrivals = [0.0, 0.005, 0.01, 0.015, 0.02, 0.025]
+    records = asyncio.run(loadgen.drive(target, articles, arrivals))
+
+    assert all(r["sent"] - r["scheduled"] < 0.015 for r in records)  # sent on schedule, not after replies
+    ok = [r["latency"] for r in records if r["outcome"] == "ok"]
+    assert len(ok) == 5 and ok[-1] > 0.08  # the fifth request waited behind four others
+    assert records[-1]["outcome"] == "rejected"
+
+    summary = loadgen.summarize(records, duration=0.03)
+    assert summary["requests"] == 6
+    assert summary["rejected_rate"] == round(1 / 6, 4)
+    assert summary["degraded_rate"] == summary["timeout_rate"] == 0.0  # always reported, even when zero
+    assert summary["p99_s"] >= summary["p50_s"]
+
+
+def test_batches_and_arrivals():
+    from src import loadgen
+
+    assert loadgen._groups([0.0, 0.1, 0.2, 1.0], batch_size=2, window=0.5) == [(0.1, [0, 1]), (0.7, [2]), (1.5, [3])]
+    arrivals = loadgen.poisson_arrivals(50.0, 10.0, seed=1)
+    assert 400 < len(arrivals) < 600 and arrivals == sorted(arrivals)
+    corpus = [{"body_text": "a"}, {"body_text": "bbbb"}]
+    assert len(loadgen.sample_articles(corpus, 10)) == 10
@@ -0,0 +1,78 @@
+"""Test chunked predictive scoring with a stand-in pipeline."""
+
+import os
+import sys
+
+import numpy as np
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+class _KeywordPipeline:
+    """predict_proba stand-in: class 1 probability is high when 'awful' appears."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        p = np.array([0.9 if "awful" in x else 0.1 for x in X])
+        return np.column_stack([1 - p, p])
+
+
+def test_score_windows_batches_and_points_to_passage():
+    from src.models import get_predictive_scores, score_windows
+
+    pipe = _KeywordPipeline()
+    models = {"toxicity": {"pipeline": pipe, "input": "title_content"}}
+    content = "calm words " * 400 + "an awful rant " + "calm words " * 400
+    result = score_windows("Title", content, models=models, window=500, overlap=100, reducer="max", top_k=1)
+
+    tox = result["t_proba"]
+    assert pipe.calls == 1
+    assert tox["n_windows"] > 1
+    assert tox["proba"][1] > 0.8
+    span = tox["spans"][0]
+    assert "awful" in content[span["start"]:span["end"]]
+    assert result["cb_proba"] is None
+
+    mean = get_predictive_scores("Title", content, models=models, chunked=True, window=500, overlap=100)
+    assert mean["t_proba"][1] < tox["proba"][1]
+
+
+def test_score_windows_without_salient_class_falls_back_to_mean():
+    from src.models import score_windows
+
+    # A binary artifact where sentiment expects three classes (salience reads class 2).
+    models = {"sentiment": {"pipeline": _KeywordPipeline(), "input": "title_content"}}
+    content = "calm words " * 400 + "an awful rant"
+    result = score_windows("Title", content, models=models, window=500, overlap=100, reducer="max")
+    sentiment = next(v for v in result.values() if v is not None)
+    assert sentiment["spans"] == []
+    assert len(sentiment["proba"]) == 2 and sentiment["n_windows"] > 1
+
+
+class _Constant:
+    """Regressor stand-in returning a fixed value."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, X):
+        return np.full(len(X), self.value)
+
+
+class _Identity:
+    def transform(self, docs):
+        return docs
+
+
+def test_distilled_scores_are_clipped_and_keyed_like_run():
+    from src.models import get_distilled_scores
+
+    keys = ["clickbait_level", "toxicity_level"]
+    artifact = {"vectorizer": _Identity(), "regressors": {"clickbait_level": _Constant(12.3)}, "keys": keys}
+    scores = get_distilled_scores("Title", "Body", models={"distilled": artifact})
+    assert scores == {"clickbait_level": 10.0, "toxicity_level": None}
+    assert get_distilled_scores("Title", "Body", models={"distilled": None}) is None
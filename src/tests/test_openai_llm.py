@@ -0,0 +1,75 @@
+"""Test the OpenAI-compatible backend against a local stub chat completions server."""
+
+import asyncio
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+class _StubServer:
+    """Minimal keep-alive HTTP/1.1 server answering POST /v1/chat/completions."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            headers = {}
+            while True:
+                h = await reader.readline()
+                if h in (b"\r\n", b"\n", b""):
+                    break
+                k, _, v = h.decode().partition(":")
+                headers[k.strip().lower()] = v.strip()
+            body = json.loads(await reader.readexactly(int(headers.get("content-length", 0))))
+            self.requests.append(body)
+            system = body["messages"][0]["content"] if body["messages"][0]["role"] == "system" else ""
+            if "combined_veracity_score" in system:
+                content = {"combined_veracity_score": 6, "overall_assessment": "ok"}
+            else:
+                content = {"score": 4, "explanation": "stub"}
+            payload = json.dumps({
+                "choices": [{"message": {"role": "assistant", "content": json.dumps(content)}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            }).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+        writer.close()
+
+
+def test_every_pattern_runs_over_pooled_connections():
+    from src.app import PATTERNS, create_app
+    from src.run import run
+
+    async def scenario():
+        stub = _StubServer()
+        server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+        try:
+            for pattern in PATTERNS:
+                app_instance = create_app(pattern, backend="openai", model="local-model")
+                result = await run("Title", "Body text.", app_instance=app_instance)
+                assert result["combined_veracity_score"] == 6, pattern
+                assert set(result["factor_scores"].values()) == {4}, pattern
+        finally:
+            os.environ.pop("OPENAI_BASE_URL", None)
+            server.close()
+        return stub
+
+    stub = asyncio.run(scenario())
+    assert len(stub.requests) == 7 * len(PATTERNS)
+    assert all(r["model"] == "local-model" for r in stub.requests)
+    assert stub.connections < len(stub.requests)  # keep-alive connections were reused
@@ -42,8 +42,63 @@ async def test_run_returns_shape():
     assert len(result["factor_scores"]) == 6
 
 
+def test_runner_cache_is_bounded():
+    import importlib
+
+    from src.app import create_app
+    from src.stub_model import StubLlm
+
+    run_module = importlib.import_module("src.run")  # `src.run` is shadowed by the run() function
+    first = create_app("simple_prompt", model=StubLlm())
+    runner, _sessions = run_module._get_runner(first)
+    assert run_module._get_runner(first)[0] is runner
+    for _ in range(run_module._MAX_RUNNERS + 5):
+        run_module._get_runner(create_app("simple_prompt", model=StubLlm()))
+    assert len(run_module._RUNNERS) == run_module._MAX_RUNNERS
+    assert id(first) not in run_module._RUNNERS
+
+
 if __name__ == "__main__":
     test_app_import()
     test_run_import()
     asyncio.run(test_run_returns_shape())
+    test_runner_cache_is_bounded()
     print("All tests passed.")
+
+
+def test_cancelled_run_deletes_its_session():
+    import importlib
+
+    from src.app import create_app
+    from src.stub_model import StubLlm
+
+    run_module = importlib.import_module("src.run")
+    app_instance = create_app("simple_prompt", model=StubLlm(delay=5.0))
+
+    async def scenario():
+        task = asyncio.ensure_future(run_module.run("Title", "Body text.", app_instance=app_instance))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        _runner, sessions = run_module._get_runner(app_instance)
+        listed = await sessions.list_sessions(app_name=app_instance.name, user_id="eval_user")
+        return listed.sessions
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_run_stores_the_scored_text():
+    import importlib
+
+    from src.app import create_app
+    from src.stub_model import StubLlm
+
+    run_module = importlib.import_module("src.run")
+    title, body = "Stored title", "Body text that a later distillation run joins on."
+    asyncio.run(run_module.run(title, body, "https://example.com/a", app_instance=create_app("simple_prompt", model=StubLlm())))
+    stored = run_module.logged_article(run_module.article_hash(title, body))
+    assert stored == {"url": "https://example.com/a", "title": title, "body_text": body}
+    assert run_module.logged_article("0" * 32) is None
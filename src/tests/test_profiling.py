@@ -0,0 +1,41 @@
+"""Test on-demand profiling output and every-N selection."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def _busy():
+    chunks = []
+    for i in range(20_000):
+        chunks.append(str(i) * 3)
+    return len("".join(chunks))
+
+
+def test_profile_writes_summaries():
+    from src import profiling
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profiling.configure(["cprofile", "tracemalloc", "sample"], every=2, out_dir=Path(tmp), interval_ms=1)
+        try:
+            stems = []
+            for _ in range(3):
+                with profiling.profile("unit") as stem:
+                    _busy()
+                stems.append(stem)
+        finally:
+            profiling.configure(None)
+
+        assert stems[0] is not None and stems[1] is None and stems[2] is not None
+        summary = stems[0].with_suffix(".txt").read_text()
+        assert "_busy" in summary
+        assert "tracemalloc" in summary
+        assert stems[0].with_suffix(".prof").exists()
+        assert stems[0].with_suffix(".folded").exists()
+
+    with profiling.profile("unit") as stem:
+        assert stem is None  # disabled
@@ -0,0 +1,57 @@
+"""Test that rate limiters sharing a file share one quota."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def test_buckets_are_shared_and_settled():
+    from src.ratelimit import RateLimiter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ratelimit.sqlite"
+        a = RateLimiter(rpm=2, tpm=1000, path=path)
+        b = RateLimiter(rpm=2, tpm=1000, path=path)  # e.g. another worker process
+
+        assert a.try_acquire(tokens=400) == 0.0
+        assert b.try_acquire(tokens=400) == 0.0
+        wait = a.try_acquire(tokens=10)
+        assert 25 < wait <= 30  # one request refills every 30s at 2 rpm
+
+        c = RateLimiter(rpm=100, tpm=1000, path=path, name="other")
+        assert c.try_acquire(tokens=900) == 0.0
+        assert c.try_acquire(tokens=500) > 0  # token bucket exhausted
+        c.settle(estimated=900, actual=300)  # refund the overestimate
+        assert c.try_acquire(tokens=500) == 0.0
+
+
+def test_failed_calls_release_their_reservation():
+    import asyncio
+    from types import SimpleNamespace
+
+    from src.ratelimit import RateLimiter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        limiter = RateLimiter(rpm=100, tpm=1000, path=Path(tmp) / "ratelimit.sqlite", output_tokens=800)
+        ctx = SimpleNamespace(invocation_id="inv", agent_name="clickbait_evaluator")
+        request = SimpleNamespace(config=None, contents=[])
+
+        asyncio.run(limiter.before_model(ctx, request))
+        assert limiter.try_acquire(tokens=800) > 0  # the estimate is reserved
+        limiter.on_model_error(ctx, request, RuntimeError("503"))
+        assert limiter._estimates == {}
+        assert limiter.try_acquire(tokens=800) == 0.0  # and refunded
+
+        # Without an error callback, stale reservations are dropped on the next call.
+        limiter.stale_after = 0.0
+        limiter.settle(estimated=1000, actual=0)  # refill the token bucket before each call
+        asyncio.run(limiter.before_model(ctx, request))
+        other = SimpleNamespace(invocation_id="inv2", agent_name="clickbait_evaluator")
+        limiter.settle(estimated=1000, actual=0)
+        asyncio.run(limiter.before_model(other, request))
+        assert list(limiter._estimates) == [("inv2", "clickbait_evaluator")]
+
@@ -0,0 +1,65 @@
+"""Test model registry versioning and hot swap."""
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+def test_commit_promote_and_hot_swap(tmp_path):
+    import joblib
+
+    from src import registry
+    from src.models import get_current_models
+
+    first = registry.stage(tmp_path)
+    joblib.dump({"pipeline": None, "input": "title"}, first / "clickbait.joblib")
+    joblib.dump({"pipeline": None, "input": "title_content"}, first / "toxicity.joblib")
+    v1 = registry.commit(tmp_path, first, {"clickbait": {"file": "clickbait.joblib"}, "toxicity": {}})
+    assert registry.current_version(tmp_path) is None
+    registry.promote(tmp_path, v1)
+
+    models = get_current_models(tmp_path)
+    assert models.version == v1
+    assert models["clickbait"]["input"] == "title"
+    assert get_current_models(tmp_path) is models
+
+    # Retrain one model only; the other is carried over into the new version.
+    second = registry.stage(tmp_path)
+    joblib.dump({"pipeline": None, "input": "title_and_body"}, second / "clickbait.joblib")
+    v2 = registry.commit(tmp_path, second, {"clickbait": {"file": "clickbait.joblib"}})
+    assert (registry.versions_dir(tmp_path) / v2 / "toxicity.joblib").exists()
+    assert get_current_models(tmp_path) is models
+
+    registry.promote(tmp_path, v2)
+    swapped = get_current_models(tmp_path)
+    assert swapped.version == v2
+    assert swapped["clickbait"]["input"] == "title_and_body"
+    assert swapped["toxicity"]["input"] == "title_content"
+    assert [m["current"] for m in registry.list_versions(tmp_path)] == [False, True]
+
+
+def test_dangling_pointer_loads_once(tmp_path):
+    import joblib
+
+    from src import registry
+    from src.models import get_current_models
+
+    joblib.dump({"pipeline": None, "input": "title"}, tmp_path / "clickbait.joblib")
+    (tmp_path / registry.POINTER).write_text("v-missing\n")
+    models = get_current_models(tmp_path)
+    assert models.version == "v-missing" and models.artifact_dir == tmp_path
+    assert models["clickbait"]["input"] == "title"
+    assert get_current_models(tmp_path) is models
+
+
+def test_promote_unknown_version(tmp_path):
+    from src import registry
+
+    try:
+        registry.promote(tmp_path, "missing")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
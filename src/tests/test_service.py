@@ -0,0 +1,61 @@
+"""Test the HTTP scoring service end to end with the stand-in LLM."""
+
+import asyncio
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    writer.write(head.encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    status_line, _, rest = raw.partition(b"\r\n")
+    return int(status_line.split()[1]), json.loads(rest.split(b"\r\n\r\n", 1)[1])
+
+
+def test_service_coalesces_and_applies_backpressure():
+    from src.app import create_app
+    from src.service import ScoringService
+    from src.stub_model import StubLlm
+
+    async def scenario():
+        llm = StubLlm(delay=0.2)
+        service = ScoringService(create_app("simple_prompt", model=llm), concurrency=1, queue=0, predictive=False)
+        port = await service.start()
+        article = {"title": "Title", "body_text": "Body text."}
+
+        status, health = await _request(port, "GET", "/healthz")
+        assert status == 200 and health["status"] == "ok"
+
+        # Two identical requests share one pipeline run (6 factor calls + 1 combiner).
+        first, second = await asyncio.gather(
+            _request(port, "POST", "/score", article), _request(port, "POST", "/score", article)
+        )
+        assert first == second and first[0] == 200
+        assert first[1]["combined_veracity_score"] is not None
+        assert llm.calls == 7
+        assert service.counters["coalesced"] == 1
+
+        # A different article while the only slot is busy is rejected, not queued.
+        slow = asyncio.ensure_future(_request(port, "POST", "/score", article))
+        await asyncio.sleep(0.05)
+        status, _ = await _request(port, "POST", "/score", {"title": "Other", "body_text": "Else."})
+        assert status == 429
+        assert (await slow)[0] == 200
+
+        assert await service.shutdown(timeout=5) == 0
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_service_coalesces_and_applies_backpressure()
+    print("ok")
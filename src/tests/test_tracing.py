@@ -0,0 +1,160 @@
+"""Test span nesting, sampling and the trace exporters."""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, root)
+
+
+class _Ctx:
+    def __init__(self, agent_name):
+        self.invocation_id = "inv-1"
+        self.agent_name = agent_name
+
+
+class _Usage:
+    prompt_token_count = 120
+    candidates_token_count = 30
+    total_token_count = 150
+
+
+class _Response:
+    usage_metadata = _Usage()
+    grounding_metadata = None
+
+
+def test_spans_nest_and_export():
+    from src import tracing
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trace.jsonl"
+        tracing.configure(path)
+        hook = tracing.TraceHook()
+
+        async def agent(name):
+            ctx = _Ctx(name)
+            hook.before_agent(ctx)
+            hook.before_model(ctx, None)
+            await asyncio.sleep(0)
+            hook.after_model(ctx, _Response())
+            hook.after_agent(ctx)
+
+        async def main():
+            with tracing.span("run", article_hash="abc"):
+                await asyncio.gather(agent("a_evaluator"), agent("b_evaluator"))
+                with tracing.span("parse", key="clickbait_level"):
+                    tracing.annotate(parse_path="json")
+
+        try:
+            asyncio.run(main())
+        finally:
+            tracing.configure(None)
+
+        spans = [json.loads(line) for line in path.read_text().splitlines()]
+        by_name = {}
+        for s in spans:
+            by_name.setdefault(s["name"], []).append(s)
+        (run,) = by_name["run"]
+        assert run["parent_id"] is None
+        assert len({s["trace_id"] for s in spans}) == 1
+        agents = by_name["agent"]
+        assert {a["attributes"]["agent"] for a in agents} == {"a_evaluator", "b_evaluator"}
+        assert all(a["parent_id"] == run["span_id"] for a in agents)
+        agent_ids = {a["span_id"] for a in agents}
+        assert all(m["parent_id"] in agent_ids for m in by_name["llm"])
+        assert by_name["llm"][0]["attributes"]["total_tokens"] == 150
+        assert by_name["parse"][0]["attributes"]["parse_path"] == "json"
+
+
+def test_sampling_keeps_errors_and_chrome_format():
+    from src import tracing
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trace.json"
+        tracing.configure(path, sample_rate=0.0)
+        try:
+            with tracing.span("run"):
+                pass  # sampled out
+            try:
+                with tracing.span("run"):
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+        finally:
+            tracing.configure(None)
+
+        events = json.loads(path.read_text().rstrip().rstrip(",") + "]")
+        spans = [e for e in events if e["ph"] == "X"]
+        assert len(spans) == 1
+        assert spans[0]["args"]["status"] == "error"
+        assert "boom" in spans[0]["args"]["error"]
+
+    with tracing.span("run") as s:
+        assert s is None  # disabled: nothing recorded
+
+
+def test_failed_model_call_closes_its_spans():
+    from src import tracing
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trace.jsonl"
+        tracing.configure(path, sample_rate=0.0)
+        hook = tracing.TraceHook()
+
+        async def failing_agent(name):
+            ctx = _Ctx(name)
+            hook.before_agent(ctx)
+            hook.before_model(ctx, None)
+            await asyncio.sleep(0)
+            hook.on_model_error(ctx, None, RuntimeError("quota"))
+            assert tracing._current.get() is None or tracing._current.get().name == "run"
+
+        async def stalled_agent():
+            hook.before_agent(_Ctx("c_evaluator"))  # no after_agent or error callback
+
+        async def main():
+            with tracing.span("run"):
+                await asyncio.gather(failing_agent("a_evaluator"), stalled_agent())
+
+        try:
+            asyncio.run(main())
+        finally:
+            tracing.configure(None)
+
+        assert hook._open == {}
+        spans = [json.loads(line) for line in path.read_text().splitlines()]  # errors are always exported
+        by_name = {s["name"]: s for s in spans if s["name"] != "agent"}
+        assert by_name["llm"]["status"] == "error" and "quota" in by_name["llm"]["attributes"]["error"]
+        agents = {s["attributes"]["agent"]: s for s in spans if s["name"] == "agent"}
+        assert agents["a_evaluator"]["status"] == "error"
+        assert agents["c_evaluator"]["status"] == "error"
+        assert all(s["duration_ms"] >= 0 for s in spans)
+
+
+def test_stub_model_error_leaves_no_open_spans():
+    from src.app import create_app
+    from src.run import run
+    from src.stub_model import StubLlm
+    from src.tracing import TRACE_HOOK, configure
+
+    class FailingLlm(StubLlm):
+        async def generate_content_async(self, llm_request, stream=False):
+            raise RuntimeError("backend down")
+            yield  # pragma: no cover
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure(Path(tmp) / "trace.jsonl")
+        try:
+            asyncio.run(run("Title", "Body text.", app_instance=create_app("simple_prompt", model=FailingLlm())))
+        except Exception as e:
+            assert "backend down" in str(e)
+        else:
+            raise AssertionError("expected the model error to propagate")
+        finally:
+            configure(None)
+    assert TRACE_HOOK._open == {}
@@ -0,0 +1,351 @@
+"""
+Lightweight tracing: nested spans with attributes, exported to local files.
+
+A run() call is the root span. Its children cover evidence selection,
+build_prompt, runner/session setup, each agent (one lane per agent, so
+parallel factor agents show side by side), each model call (tokens, Google
+Search grounding queries), tool calls, and parsing of agent output (which
+_parse_json path succeeded). Agent, model and tool spans come from ADK
+callbacks that create_app() attaches (see TraceHook).
+
+Spans follow OpenTelemetry naming (trace_id, span_id, parent_id, attributes,
+status). Exporters:
+    ChromeTraceExporter  Chrome trace event JSON; open in chrome://tracing or ui.perfetto.dev
+    JsonlExporter        one span per line
+
+Configure in code with configure(...), or with environment variables:
+    FACTUALITY_TRACE=logs/traces/trace.json   (.json = Chrome trace, .jsonl = JSON lines)
+    FACTUALITY_TRACE_SAMPLE=0.05              fraction of runs exported (default 1.0)
+    FACTUALITY_TRACE_SLOW_MS=20000            always export runs slower than this
+Runs that raise are always exported. With no exporter configured, span()
+returns immediately and nothing is recorded.
+"""
+
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+_LANES = itertools.count(1)
+
+
+class Span:
+    __slots__ = ("name", "trace", "span_id", "parent", "start_ns", "end_ns", "attributes", "status", "lane")
+
+    def __init__(self, name: str, trace: "_Trace", parent: Optional["Span"], lane: int, attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent = parent
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.lane = lane
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent is not None else None,
+            "name": self.name,
+            "start_unix_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _Trace:
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+        self.error = False
+
+
+class JsonlExporter:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class ChromeTraceExporter:
+    """
+    Appends complete ("X") events to a JSON array. The closing bracket is
+    never written, which the trace viewers accept, so the file can grow while
+    the process runs.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def export(self, spans: List[Span]) -> None:
+        events = []
+        named = set()
+        for s in spans:
+            if s.lane not in named:
+                named.add(s.lane)
+                label = s.attributes.get("agent") or s.name
+                events.append({
+                    "ph": "M", "name": "thread_name", "pid": self._pid, "tid": s.lane,
+                    "args": {"name": f"{s.trace.trace_id[:8]} {label}"},
+                })
+            events.append({
+                "name": s.name,
+                "cat": "factuality",
+                "ph": "X",
+                "ts": s.start_ns / 1000,
+                "dur": ((s.end_ns or s.start_ns) - s.start_ns) / 1000,
+                "pid": self._pid,
+                "tid": s.lane,
+                "args": {**s.attributes, "trace_id": s.trace.trace_id, "span_id": s.span_id, "status": s.status},
+            })
+        text = "".join(json.dumps(e, default=str) + ",\n" for e in events)
+        with self._lock:
+            new = not self.path.exists() or self.path.stat().st_size == 0
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(("[\n" if new else "") + text)
+
+
+class Tracer:
+    def __init__(self):
+        self.exporter = None
+        self.sample_rate = 1.0
+        self.slow_ms: Optional[float] = None
+        self.exported = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(self, name: str, parent: Optional[Span] = None, lane: bool = False, **attributes: Any) -> Optional[Span]:
+        """Start a span under `parent` (default: the current span); a new trace if there is none."""
+        if self.exporter is None:
+            return None
+        parent = parent if parent is not None else _current.get()
+        trace = parent.trace if parent is not None else _Trace()
+        span = Span(name, trace, parent, next(_LANES) if lane or parent is None else parent.lane, attributes)
+        with trace.lock:
+            trace.spans.append(span)
+        return span
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        if span is None or span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.status = "error"
+            span.set(error=f"{type(error).__name__}: {error}")
+            span.trace.error = True
+        if span.parent is None:
+            # Spans left open under the root (an agent that failed without an
+            # after_* or error callback) end with it rather than with no end time.
+            with span.trace.lock:
+                orphans = [s for s in span.trace.spans if s.end_ns is None]
+            for s in orphans:
+                s.end_ns = span.end_ns
+                s.status = "error"
+                s.set(error="unfinished when the run ended")
+                span.trace.error = True
+            for hook in list(_HOOKS):
+                hook._discard(span.trace)
+            self._finish(span)
+
+    def _finish(self, root: Span) -> None:
+        keep = (
+            root.trace.error
+            or (self.slow_ms is not None and root.duration_ms >= self.slow_ms)
+            or random.random() < self.sample_rate
+        )
+        if not keep or self.exporter is None:
+            self.dropped += 1
+            return
+        with root.trace.lock:
+            spans = list(root.trace.spans)
+        try:
+            self.exporter.export(spans)
+            self.exported += 1
+        except OSError:
+            self.dropped += 1
+
+
+TRACER = Tracer()
+# TraceHooks to notify when a trace ends, so spans a failed agent left open are dropped.
+_HOOKS: "weakref.WeakSet[TraceHook]" = weakref.WeakSet()
+_current: ContextVar[Optional[Span]] = ContextVar("factuality_span", default=None)
+
+
+def configure(
+    path: Optional[Path] = None,
+    fmt: Optional[str] = None,
+    sample_rate: float = 1.0,
+    slow_ms: Optional[float] = None,
+) -> None:
+    """Set the exporter (None disables tracing). fmt is "chrome" or "jsonl"; inferred from the suffix."""
+    if path is None:
+        TRACER.exporter = None
+        return
+    fmt = fmt or ("jsonl" if str(path).endswith(".jsonl") else "chrome")
+    TRACER.exporter = JsonlExporter(path) if fmt == "jsonl" else ChromeTraceExporter(path)
+    TRACER.sample_rate = sample_rate
+    TRACER.slow_ms = slow_ms
+
+
+def configure_from_env() -> None:
+    path = os.environ.get("FACTUALITY_TRACE")
+    if not path:
+        return
+    slow = os.environ.get("FACTUALITY_TRACE_SLOW_MS")
+    configure(
+        Path(path),
+        sample_rate=float(os.environ.get("FACTUALITY_TRACE_SAMPLE", "1.0")),
+        slow_ms=float(slow) if slow else None,
+    )
+
+
+@contextmanager
+def span(name: str, lane: bool = False, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record the block as a child of the current span (or a new trace). Yields None when disabled."""
+    s = TRACER.start_span(name, lane=lane, **attributes)
+    if s is None:
+        yield None
+        return
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        TRACER.end_span(s, e)
+        raise
+    finally:
+        TRACER.end_span(s)
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Closed from another context (e.g. an abandoned async generator).
+            pass
+
+
+def annotate(**attributes: Any) -> None:
+    """Set attributes on the current span, if any."""
+    s = _current.get()
+    if s is not None:
+        s.set(**attributes)
+
+
+class TraceHook:
+    """
+    ADK callback hook (see app._hook_callbacks) that opens a span per agent,
+    model call and tool call. A span started in a before_* callback becomes
+    the current span for the rest of that agent's execution context and is
+    closed by the matching after_* callback, or with error status by
+    on_model_error/on_tool_error. A failed model or tool call also ends its
+    agent's span, since the error propagates out of the agent.
+    """
+
+    def __init__(self):
+        self._open: Dict[tuple, Span] = {}
+        _HOOKS.add(self)
+
+    def _discard(self, trace: "_Trace") -> None:
+        """Forget spans of a finished trace that no callback closed."""
+        for key in [k for k, s in list(self._open.items()) if s.trace is trace]:
+            del self._open[key]
+
+    @staticmethod
+    def _key(ctx: Any, *extra: Any) -> tuple:
+        return (getattr(ctx, "invocation_id", ""), getattr(ctx, "agent_name", ""), *extra)
+
+    def _start(self, key: tuple, name: str, lane: bool = False, **attributes: Any) -> None:
+        s = TRACER.start_span(name, lane=lane, **attributes)
+        if s is not None:
+            self._open[key] = s
+            _current.set(s)
+
+    def _end(self, key: tuple, error: Optional[BaseException] = None, **attributes: Any) -> None:
+        s = self._open.pop(key, None)
+        if s is None:
+            return
+        s.set(**attributes)
+        TRACER.end_span(s, error)
+        if _current.get() is s:
+            _current.set(s.parent)
+
+    def before_agent(self, callback_context: Any) -> None:
+        if TRACER.enabled:
+            agent = getattr(callback_context, "agent_name", "")
+            self._start(self._key(callback_context, "agent"), "agent", lane=True, agent=agent)
+
+    def after_agent(self, callback_context: Any) -> None:
+        if TRACER.enabled:
+            self._end(self._key(callback_context, "agent"))
+
+    def before_model(self, callback_context: Any, llm_request: Any) -> None:
+        if TRACER.enabled:
+            self._start(
+                self._key(callback_context, "model"),
+                "llm",
+                agent=getattr(callback_context, "agent_name", ""),
+                model=str(getattr(llm_request, "model", "") or ""),
+            )
+
+    def after_model(self, callback_context: Any, llm_response: Any) -> None:
+        if not TRACER.enabled:
+            return
+        usage = getattr(llm_response, "usage_metadata", None)
+        grounding = getattr(llm_response, "grounding_metadata", None)
+        self._end(
+            self._key(callback_context, "model"),
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            output_tokens=getattr(usage, "candidates_token_count", None),
+            total_tokens=getattr(usage, "total_token_count", None),
+            search_queries=len(getattr(grounding, "web_search_queries", None) or []),
+        )
+
+    def on_model_error(self, callback_context: Any, llm_request: Any, error: BaseException) -> None:
+        if TRACER.enabled:
+            self._end(self._key(callback_context, "model"), error)
+            self._end(self._key(callback_context, "agent"), error)
+
+    def before_tool(self, tool: Any, args: Dict[str, Any], tool_context: Any) -> None:
+        if TRACER.enabled:
+            name = getattr(tool, "name", type(tool).__name__)
+            self._start(self._key(tool_context, "tool", name), "tool", tool=name)
+
+    def after_tool(self, tool: Any, args: Dict[str, Any], tool_context: Any, tool_response: Any) -> None:
+        if TRACER.enabled:
+            self._end(self._key(tool_context, "tool", getattr(tool, "name", type(tool).__name__)))
+
+    def on_tool_error(self, tool: Any, args: Dict[str, Any], tool_context: Any, error: BaseException) -> None:
+        if TRACER.enabled:
+            self._end(self._key(tool_context, "tool", getattr(tool, "name", type(tool).__name__)), error)
+            self._end(self._key(tool_context, "agent"), error)
+
+
+TRACE_HOOK = TraceHook()
+configure_from_env()